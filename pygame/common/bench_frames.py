@@ -0,0 +1,362 @@
+"""
+Headless frame benchmark for the pygame games
+
+Runs HangmanGame and TicTacToe under the SDL dummy video driver with seeded
+RNGs and a scripted input timeline (guesses, clicks, wins, losses, resets),
+stepping each game's frame loop for a fixed number of frames with no frame
+cap. Each game is run three times from the same seed:
+
+    timing      wall time of every frame -> p50 / p95 / p99
+    methods     every draw_* / update_* / build_* / handle_* method of the
+                game and Compositor.present wrapped with a timer; times are
+                inclusive, so draw() also contains the layers it redraws
+    memory      tracemalloc; per frame, the bytes allocated on the Python
+                heap (peak over the frame) and the net change in live blocks
+
+Results can be written to JSON and compared against an earlier run, so a
+regression between two commits shows up as a percentage.
+
+Usage:
+    python bench_frames.py [--game all|hangman|tictactoe] [--frames 600]
+                           [--warmup 60] [--seed 1] [--json out.json]
+                           [--compare base.json]
+
+Reference run (SDL dummy driver, 600 frames, seed 1):
+
+    game        p50 ms   p95 ms   p99 ms
+    hangman       0.48     6.50     8.03
+    tictactoe     4.51     7.78     8.54
+"""
+
+import argparse
+import functools
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import numpy as np
+import pygame
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "..", "hangman"))
+sys.path.insert(0, os.path.join(HERE, "..", "tictactoe"))
+
+import compositor
+
+METHOD_PREFIXES = ("draw", "update_", "build_", "handle_")
+HOLD_FRAMES = 90      # frames spent on each game over screen
+GUESS_INTERVAL = 8    # frames between two hangman guesses
+MOVE_INTERVAL = 12    # frames between two tic-tac-toe clicks
+
+
+# ---------------------------
+# Scripted input
+# ---------------------------
+def key_event(char):
+    return pygame.event.Event(pygame.KEYDOWN, key=ord(char.lower()), unicode=char, mod=0, scancode=0)
+
+
+def click_events(pos):
+    return [pygame.event.Event(pygame.MOUSEMOTION, pos=pos, rel=(0, 0), buttons=(0, 0, 0)),
+            pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=pos, button=1)]
+
+
+def wait(frames):
+    for _ in range(frames):
+        yield []
+
+
+def hangman_script(game):
+    """Alternate won and lost rounds, guessing every GUESS_INTERVAL frames
+
+    Guesses are picked from the word when each round starts, so with a
+    fixed seed the timeline is the same on every run.
+    """
+    round_number = 0
+    while True:
+        word = game.state.word
+        if round_number % 2 == 0:
+            # Win with two misses and one repeated guess on the way
+            misses = [c for c in "ZQXJ" if c not in word][:2]
+            letters = list(dict.fromkeys(word))
+            guesses = letters[:1] + misses + letters[:1] + letters[1:]
+        else:
+            guesses = [c for c in "ZQXJKVWYFB" if c not in word][:6]
+        for letter in guesses:
+            yield [key_event(letter.lower())]
+            yield from wait(GUESS_INTERVAL - 1)
+        yield from wait(HOLD_FRAMES)
+        yield [key_event(" ")]
+        round_number += 1
+
+
+def tictactoe_script(game):
+    """Cycle through an X win, an O win and a draw
+
+    Each game over screen is left alternately by the restart button and by
+    the space bar.
+    """
+    import tictactoe_modern as tm
+
+    def cell_center(row, col):
+        return (tm.GRID_OFFSET_X + col * tm.CELL_SIZE + tm.CELL_SIZE // 2,
+                tm.GRID_OFFSET_Y + row * tm.CELL_SIZE + tm.CELL_SIZE // 2)
+
+    games = [
+        [(0, 0), (1, 1), (0, 1), (2, 2), (0, 2)],                          # X wins
+        [(0, 1), (0, 0), (2, 1), (1, 1), (1, 0), (2, 2)],                  # O wins
+        [(0, 0), (1, 1), (2, 2), (0, 1), (2, 1), (2, 0), (0, 2), (1, 2), (1, 0)],  # draw
+    ]
+    button = (tm.WIDTH // 2, tm.HEIGHT // 2 + 45)
+    round_number = 0
+    while True:
+        for row, col in games[round_number % len(games)]:
+            yield click_events(cell_center(row, col))
+            yield from wait(MOVE_INTERVAL - 1)
+        yield from wait(HOLD_FRAMES)
+        if round_number % 2 == 0:
+            yield click_events(button)
+        else:
+            yield [key_event(" ")]
+        round_number += 1
+
+
+def hangman_class():
+    import hangman
+    return hangman.HangmanGame
+
+
+def tictactoe_class():
+    import tictactoe_modern
+    return tictactoe_modern.TicTacToe
+
+
+GAMES = {
+    "hangman": (hangman_class, hangman_script),
+    "tictactoe": (tictactoe_class, tictactoe_script),
+}
+
+
+# ---------------------------
+# Instrumentation
+# ---------------------------
+class MethodTimer:
+    """Wraps methods of classes with timers while the context is active
+
+    Methods are patched on the class, so games must be created inside the
+    context for method references they keep (like layer lists) to be timed.
+    """
+    def __init__(self, targets):
+        self.targets = targets
+        self.totals = {}
+        self.calls = {}
+        self.saved = []
+
+    def wrap(self, label, method):
+        totals = self.totals
+        calls = self.calls
+        clock = time.perf_counter_ns
+
+        @functools.wraps(method)
+        def timed(*args, **kwargs):
+            start = clock()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                totals[label] += clock() - start
+                calls[label] += 1
+        return timed
+
+    def reset(self):
+        for label in self.totals:
+            self.totals[label] = 0
+            self.calls[label] = 0
+
+    def __enter__(self):
+        for cls, name in self.targets:
+            label = f"{cls.__name__}.{name}"
+            method = cls.__dict__[name]
+            self.totals[label] = 0
+            self.calls[label] = 0
+            self.saved.append((cls, name, method))
+            setattr(cls, name, self.wrap(label, method))
+        return self
+
+    def __exit__(self, *exc):
+        for cls, name, method in self.saved:
+            setattr(cls, name, method)
+        self.saved = []
+
+
+def method_targets(game_class):
+    targets = [(game_class, name) for name, value in vars(game_class).items()
+               if callable(value) and name.startswith(METHOD_PREFIXES)]
+    targets.append((compositor.Compositor, "present"))
+    return targets
+
+
+def percentiles(values):
+    values = np.asarray(values, dtype=np.float64)
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {"mean": float(values.mean()), "p50": float(p50), "p95": float(p95),
+            "p99": float(p99), "max": float(values.max())}
+
+
+# ---------------------------
+# Runs
+# ---------------------------
+def drive(name, seed, frames, warmup, on_frame=None, on_warm=None):
+    """Step a fresh game through its script; on_frame wraps each step"""
+    load_class, script = GAMES[name]
+    random.seed(seed)
+    game = load_class()(seed=seed)
+    timeline = script(game)
+    pygame.event.clear()
+    for frame in range(warmup + frames):
+        if frame == warmup and on_warm:
+            on_warm()
+        for event in next(timeline):
+            pygame.event.post(event)
+        if frame >= warmup and on_frame:
+            on_frame(game.step)
+        else:
+            game.step()
+    return game
+
+
+def bench_game(name, seed, frames, warmup):
+    # Frame times, nothing instrumented
+    frame_ms = []
+
+    def timed_step(step):
+        start = time.perf_counter_ns()
+        step()
+        frame_ms.append((time.perf_counter_ns() - start) / 1e6)
+    drive(name, seed, frames, warmup, timed_step)
+
+    # Per-method cost
+    with MethodTimer(method_targets(GAMES[name][0]())) as timer:
+        drive(name, seed, frames, warmup, on_warm=timer.reset)
+    methods = {}
+    for label, total in timer.totals.items():
+        if timer.calls[label]:
+            methods[label] = {
+                "calls_per_frame": timer.calls[label] / frames,
+                "us_per_frame": total / frames / 1000,
+                "us_per_call": total / timer.calls[label] / 1000,
+            }
+
+    # Python heap allocations
+    alloc_kib = []
+    blocks = []
+
+    def traced_step(step):
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        live = sys.getallocatedblocks()
+        step()
+        _, peak = tracemalloc.get_traced_memory()
+        alloc_kib.append((peak - before) / 1024)
+        blocks.append(sys.getallocatedblocks() - live)
+    tracemalloc.start()
+    try:
+        drive(name, seed, frames, warmup, traced_step)
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "frame_ms": percentiles(frame_ms),
+        "methods": methods,
+        "alloc_kib_per_frame": percentiles(alloc_kib),
+        "net_blocks_per_frame": float(np.mean(blocks)),
+    }
+
+
+
+# ---------------------------
+# Reporting
+# ---------------------------
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=HERE,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_report(name, result):
+    frame = result["frame_ms"]
+    alloc = result["alloc_kib_per_frame"]
+    print(f"\n== {name} ==")
+    print(f"frame ms   p50 {frame['p50']:.2f}   p95 {frame['p95']:.2f}   "
+          f"p99 {frame['p99']:.2f}   max {frame['max']:.2f}")
+    print(f"allocated  {alloc['mean']:.1f} KiB/frame mean, {alloc['p99']:.1f} p99, "
+          f"net {result['net_blocks_per_frame']:+.1f} blocks/frame")
+    print(f"{'method':<40} {'calls/frame':>11} {'us/frame':>10} {'us/call':>9}")
+    methods = sorted(result["methods"].items(), key=lambda item: -item[1]["us_per_frame"])
+    for label, cost in methods:
+        print(f"{label:<40} {cost['calls_per_frame']:>11.2f} "
+              f"{cost['us_per_frame']:>10.1f} {cost['us_per_call']:>9.1f}")
+
+
+def print_comparison(results, baseline):
+    print(f"\ncompared with {baseline['meta'].get('commit') or 'baseline'}:")
+    for name, result in results.items():
+        if name not in baseline["games"]:
+            continue
+        old = baseline["games"][name]["frame_ms"]
+        new = result["frame_ms"]
+        changes = "   ".join(f"{key} {(new[key] - old[key]) / old[key]:+.1%}"
+                               for key in ("p50", "p95", "p99") if old[key])
+        print(f"{name:<10} {changes}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless frame benchmark for the pygame games")
+    parser.add_argument("--game", choices=["all", *GAMES], default="all")
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--warmup", type=int, default=60)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--compare", help="earlier --json output to compare against")
+    args = parser.parse_args()
+
+    names = list(GAMES) if args.game == "all" else [args.game]
+    results = {}
+    for name in names:
+        results[name] = bench_game(name, args.seed, args.frames, args.warmup)
+        print_report(name, results[name])
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "numpy": np.__version__,
+            "video_driver": os.environ["SDL_VIDEODRIVER"],
+            "seed": args.seed,
+            "frames": args.frames,
+            "warmup": args.warmup,
+        },
+        "games": results,
+    }
+    if args.compare:
+        with open(args.compare) as f:
+            print_comparison(results, json.load(f))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nwrote {args.json}")
+
+
+if __name__ == "__main__":
+    main()
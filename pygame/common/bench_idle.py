@@ -0,0 +1,91 @@
+"""
+Idle CPU benchmark for the pygame games
+
+Runs each game's real loop (GameLoop.run with its frame cap) for a few
+seconds of wall time after a single input, the way a display sits while
+the player thinks: once with idle detection off, redrawing at the full
+frame rate, and once with it on, sleeping in pygame.event.wait after
+IDLE_DELAY seconds of stillness. Reports the process CPU time as a share
+of one core, and how the loop split its time between active and idle.
+
+Usage:
+    python bench_idle.py [--game all|hangman|tictactoe] [--seconds 10]
+
+Reference run (SDL dummy driver, 1 CPU core, 10 s):
+
+    game        always on     idle-aware   asleep
+    hangman        1.9% CPU      2.3% CPU   7.3 s of 10
+    tictactoe     17.3% CPU      7.0% CPU   6.7 s of 10
+
+The dummy driver has no window system to block on, so SDL polls about
+every millisecond inside event.wait, which costs about 2% of a core while
+asleep. Real video drivers block. Hangman's dirty-rect frames already cost
+about as little as that, so it gains only on real displays. Tic-tac-toe
+redraws the whole screen every frame, and sleeping cuts its CPU by more
+than half even with the polling.
+"""
+
+import argparse
+import os
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+from bench_frames import GAMES, click_events, key_event
+
+
+def first_input(name):
+    """One guess or one move, so the game has something to animate first"""
+    if name == "hangman":
+        return [key_event("e")]
+    import tictactoe_modern as tm
+    return click_events((tm.GRID_OFFSET_X + tm.CELL_SIZE * 3 // 2, tm.GRID_OFFSET_Y + tm.CELL_SIZE * 3 // 2))
+
+
+def run(name, seconds, idle):
+    """(CPU share of one core, CPU share while asleep, the game's GameLoop)"""
+    game = GAMES[name][0]()(seed=1)
+    loop = game.loop
+    if not idle:
+        loop.idle = None
+    asleep_cpu = [0.0]
+
+    def wait(timeout_ms, wait=loop.wait):
+        start = time.process_time()
+        woke = wait(timeout_ms)
+        asleep_cpu[0] += time.process_time() - start
+        return woke
+    loop.wait = wait
+    pygame.event.clear()
+    for event in first_input(name):
+        pygame.event.post(event)
+    pygame.time.set_timer(pygame.QUIT, int(seconds * 1000), loops=1)
+
+    wall = time.perf_counter()
+    cpu = time.process_time()
+    loop.run()
+    share = (time.process_time() - cpu) / (time.perf_counter() - wall)
+    if hasattr(game, "ai_service"):
+        game.ai_service.close()
+    return share, asleep_cpu[0] / loop.idle_time if loop.idle_time else 0.0, loop
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Idle CPU benchmark for the pygame games")
+    parser.add_argument("--game", choices=["all", *GAMES], default="all")
+    parser.add_argument("--seconds", type=float, default=10.0)
+    args = parser.parse_args()
+
+    for name in GAMES if args.game == "all" else [args.game]:
+        for idle in (False, True):
+            share, asleep, loop = run(name, args.seconds, idle)
+            mode = "idle-aware" if idle else "always on"
+            print(f"{name:<10} {mode:<11} {share:6.1%} CPU ({asleep:.1%} while asleep)  {loop}")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Fixed-timestep loop benchmark for the pygame games
+
+Two checks of GameLoop on both games, headless:
+
+    pacing      GameLoop drives the game frame by frame on a virtual clock
+                at 30, 60 and 144 frames per second, with extra load per
+                frame.
+                Game time must advance at TICK_RATE whatever the frame rate;
+                under heavy load frames run several ticks (frame skip) and
+                only past MAX_UPDATES ticks per frame does the game slow down.
+    simulate    bench_frames.py's scripted timeline is played through
+                GameLoop.simulate (no drawing) and through step() (update and
+                render). Reports ticks per second of both, and the state
+                digests must be the same: drawing never touches game state.
+
+Usage:
+    python bench_loop.py [--game all|hangman|tictactoe] [--seconds 10]
+                         [--ticks 3000] [--seed 1]
+
+Reference run (SDL dummy driver, 1 CPU core, 3000 ticks, seed 1):
+
+    game        step() ticks/s   simulate ticks/s
+    hangman              920            83,000
+    tictactoe            260            24,000
+
+Pacing holds 60 ticks per second at every frame rate with up to 50 ms of
+load per frame (up to 5 ticks per frame). With 100 ms of load the frames
+need more than MAX_UPDATES ticks and the game slows to 37-47 ticks/s.
+"""
+
+import argparse
+import os
+import random
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+from bench_frames import GAMES
+from game_loop import GameLoop
+
+FRAME_RATES = [30, 60, 144]
+LOADS_MS = [0, 20, 50, 100]
+
+
+class VirtualClock:
+    """Time that only moves when a frame says so"""
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def new_game(name, seed):
+    load_class, script = GAMES[name]
+    random.seed(seed)
+    game = load_class()(seed=seed)
+    pygame.event.clear()
+    return game, script(game)
+
+
+def scripted(update, timeline):
+    """update() with the script's input for that tick posted first"""
+    def tick():
+        for event in next(timeline):
+            pygame.event.post(event)
+        return update()
+    return tick
+
+
+def pacing(name, seed, seconds):
+    """Ticks per virtual second at each frame rate and load"""
+    game, timeline = new_game(name, seed)
+    rows = []
+    for fps in FRAME_RATES:
+        for load_ms in LOADS_MS:
+            clock = VirtualClock()
+
+            def pace(frame_time=1 / fps + load_ms / 1000):
+                clock.now += frame_time
+            loop = GameLoop(scripted(game.update, timeline), game.render, round(1 / game.loop.dt),
+                            pace=pace, clock=clock)
+            frames = int(seconds / (1 / fps + load_ms / 1000))
+            previous = clock()
+            for _ in range(frames):
+                pace()
+                loop.frame(clock() - previous)
+                previous = clock()
+            rows.append((fps, load_ms, loop.ticks / clock.now, loop.ticks / loop.frames, loop.dropped))
+    return rows
+
+
+def simulate(name, seed, ticks):
+    """(step ticks/s, simulate ticks/s, states match)"""
+    results = []
+    rates = []
+    for mode in ("step", "simulate"):
+        game, timeline = new_game(name, seed)
+        start = time.perf_counter()
+        if mode == "step":
+            tick = scripted(game.step, timeline)
+            for _ in range(ticks):
+                tick()
+        else:
+            GameLoop(scripted(game.update, timeline), game.render).simulate(ticks)
+        rates.append(ticks / (time.perf_counter() - start))
+        results.append(game.state_digest())
+    return rates[0], rates[1], results[0] == results[1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fixed-timestep loop benchmark for the pygame games")
+    parser.add_argument("--game", choices=["all", *GAMES], default="all")
+    parser.add_argument("--seconds", type=float, default=10.0, help="virtual seconds per pacing run")
+    parser.add_argument("--ticks", type=int, default=3000, help="ticks per simulate run")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    failed = False
+    for name in GAMES if args.game == "all" else [args.game]:
+        print(f"{name}: fps  load ms  ticks/game s  ticks/frame  dropped")
+        for fps, load_ms, rate, per_frame, dropped in pacing(name, args.seed, args.seconds):
+            print(f"{'':<10}{fps:>4}  {load_ms:>7}  {rate:>12.1f}  {per_frame:>11.2f}  {dropped:>7}")
+        step_rate, simulate_rate, same = simulate(name, args.seed, args.ticks)
+        print(f"{name}: step() {step_rate:,.0f} ticks/s, simulate {simulate_rate:,.0f} ticks/s, "
+              f"states {'match' if same else 'DIFFER'}")
+        failed |= not same
+    pygame.quit()
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Frame profiler overhead benchmark for the pygame games
+
+Plays bench_frames.py's scripted timeline through each game's GameLoop,
+one tick per frame, four times: unprofiled, with FrameProfiler's timers
+installed and the overlay hidden, with the overlay shown, and with timers
+plus tracemalloc. Reports milliseconds per frame and the overhead
+of each mode, writes a Chrome trace of the timed run and loads it back,
+and checks that uninstall() left every class exactly as it was (profiling
+off runs the original methods, so it costs nothing).
+
+Usage:
+    python bench_profiler.py [--game all|hangman|tictactoe] [--frames 1200]
+                             [--seed 1] [--trace-dir /tmp]
+
+Reference run (SDL dummy driver, 1 CPU core, 1200 frames, seed 1):
+
+    game        off ms/frame   timers        overlay        tracemalloc
+    hangman         1.34       1.43 (+7%)    1.88 (+41%)    2.22 (+66%)
+    tictactoe       4.58       4.47 (noise)  5.58 (+22%)    7.48 (+63%)
+
+Timers cost about a microsecond per wrapped call. The overlay costs about
+0.4 ms a frame, mostly blitting it translucent over the display, and shows
+that cost as its own profiler.overlay row. tracemalloc slows every
+allocation, so leave --profile-alloc off when the times matter.
+"""
+
+import argparse
+import json
+import os
+import random
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+from bench_frames import GAMES
+from compositor import Compositor
+from game_loop import GameLoop
+from profiler import FrameProfiler
+
+MODES = ["off", "timers", "overlay", "tracemalloc"]
+
+
+def helper_classes(name):
+    """Classes instrumented besides the game, as the game's main() does"""
+    if name == "hangman":
+        from particles import ParticleSystem
+        return [ParticleSystem, Compositor, GameLoop]
+    return [Compositor, GameLoop]
+
+
+def snapshot(classes):
+    """Every attribute the profiler may replace"""
+    state = {(cls, name): value for cls in classes for name, value in vars(cls).items()}
+    state["flip"], state["update"] = pygame.display.flip, pygame.display.update
+    return state
+
+
+def run(name, mode, frames, seed, trace_path):
+    """(ms per frame, spans written, classes restored)"""
+    load_class, script = GAMES[name]
+    game_class = load_class()
+    classes = [game_class, *helper_classes(name)]
+    before = snapshot(classes)
+    profiler = None
+    if mode != "off":
+        profiler = FrameProfiler(allocations=mode == "tracemalloc").install(*classes)
+        profiler.visible = mode == "overlay"
+    random.seed(seed)
+    game = game_class(seed=seed)
+    pygame.event.clear()
+    timeline = script(game)
+    if profiler:
+        profiler.attach(game.compositor)
+
+    start = time.perf_counter()
+    for _ in range(frames):
+        for event in next(timeline):
+            pygame.event.post(event)
+        game.loop.frame(game.loop.dt)
+    elapsed = time.perf_counter() - start
+
+    spans = 0
+    if profiler:
+        profiler.uninstall()
+        if mode == "timers":
+            profiler.export_trace(trace_path)
+            with open(trace_path) as f:
+                spans = len(json.load(f)["traceEvents"])
+    if hasattr(game, "ai_service"):
+        game.ai_service.close()
+    return elapsed / frames * 1000, spans, snapshot(classes) == before
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Frame profiler overhead benchmark")
+    parser.add_argument("--game", choices=["all", *GAMES], default="all")
+    parser.add_argument("--frames", type=int, default=1200)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--trace-dir", default="/tmp")
+    args = parser.parse_args()
+
+    failed = False
+    for name in GAMES if args.game == "all" else [args.game]:
+        trace_path = os.path.join(args.trace_dir, f"{name}_trace.json")
+        results = {mode: run(name, mode, args.frames, args.seed, trace_path) for mode in MODES}
+        base = results["off"][0]
+        cells = [f"{mode} {ms:.2f} ms/frame" + (f" ({ms / base - 1:+.0%})" if mode != "off" else "")
+                 for mode, (ms, _, _) in results.items()]
+        restored = all(result[2] for result in results.values())
+        print(f"{name:<10} " + ", ".join(cells))
+        print(f"{'':<10} {results['timers'][1]:,} spans in {trace_path}; "
+              f"classes {'restored' if restored else 'NOT restored'}")
+        failed |= not restored or not results["timers"][1]
+    pygame.quit()
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
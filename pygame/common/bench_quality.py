@@ -0,0 +1,99 @@
+"""
+Quality tier benchmark for the pygame games
+
+Runs each game headless through bench_frames.py's scripted timeline once per
+quality tier (pinned, no frame cap) and reports the frame work time of each
+tier. Then replays those measured frame times through QualityGovernor as if
+the machine were N times slower: each frame costs the time measured for the
+tier the governor is on, times N. Reports where the governor settled, how
+often it changed tier, and the share of frames that ran over budget.
+
+Usage:
+    python bench_quality.py [--game all|hangman|tictactoe] [--frames 600]
+                            [--seconds 120] [--seed 1]
+
+Reference run (SDL dummy driver, 1 CPU core, 600 frames per tier, seed 1):
+
+    game        low      medium   high     (mean frame work)
+    hangman     1.1 ms   1.0 ms   1.3 ms
+    tictactoe   2.6 ms   2.9 ms   3.8 ms
+
+Up to x2 both games stay on high. At x3 they settle on medium and at x6 on
+low. Particle bursts push a few windows over budget, so the governor keeps
+retrying the tier above, but the doubling wait holds that to about ten
+changes in two minutes.
+"""
+
+import argparse
+import os
+import random
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import numpy as np
+import pygame
+
+from bench_frames import GAMES
+from quality import QualityGovernor
+
+SLOWDOWNS = [1, 2, 3, 4, 6, 8]
+FPS = 60
+
+
+def measure(name, quality, seed, frames, warmup=60):
+    """Frame work times in ms of one game pinned to a quality tier"""
+    load_class, script = GAMES[name]
+    random.seed(seed)
+    game = load_class()(seed=seed, quality=quality)
+    timeline = script(game)
+    pygame.event.clear()
+    times = []
+    for frame in range(warmup + frames):
+        for event in next(timeline):
+            pygame.event.post(event)
+        start = time.perf_counter_ns()
+        game.step()
+        if frame >= warmup:
+            times.append((time.perf_counter_ns() - start) / 1e6)
+    return game.governor.tiers, np.array(times)
+
+
+def replay(tiers, traces, slowdown, seconds):
+    """Run the governor over the measured traces on a machine `slowdown` times slower"""
+    governor = QualityGovernor(tiers, FPS, log=lambda message: None)
+    over = 0
+    for frame in range(seconds * FPS):
+        trace = traces[governor.tier]
+        frame_ms = trace[frame % len(trace)] * slowdown
+        over += frame_ms > governor.budget_ms
+        governor.update(frame_ms)
+    return governor, over / (seconds * FPS)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Quality tier benchmark for the pygame games")
+    parser.add_argument("--game", choices=["all", *GAMES], default="all")
+    parser.add_argument("--frames", type=int, default=600, help="measured frames per tier")
+    parser.add_argument("--seconds", type=int, default=120, help="simulated play time per slowdown")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    for name in GAMES if args.game == "all" else [args.game]:
+        traces = []
+        tiers = None
+        for quality in ("low", "medium", "high"):
+            tiers, times = measure(name, quality, args.seed, args.frames)
+            traces.append(times)
+            print(f"{name:<10} {quality:<7} mean {times.mean():6.2f} ms  "
+                  f"p95 {np.percentile(times, 95):6.2f} ms")
+        for slowdown in SLOWDOWNS:
+            governor, over = replay(tiers, traces, slowdown, args.seconds)
+            print(f"{name:<10} x{slowdown:<6} settles on {governor.tier_name(governor.tier):<7} "
+                  f"{len(governor.history):3d} changes, {over:6.1%} of frames over budget")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
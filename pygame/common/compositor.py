@@ -0,0 +1,89 @@
+"""
+Compositor
+Offscreen compositing stage shared by the pygame games.
+
+The scene is drawn into a persistent canvas surface instead of the display.
+At present time the canvas is run through a chain of in-place post effects
+and copied to the display at a camera offset, so screen shake costs one blit
+instead of a full-frame copy and re-fill.
+"""
+
+import pygame
+
+
+class Compositor:
+    """Persistent offscreen canvas presented to the display"""
+    def __init__(self, display, background=(0, 0, 0)):
+        self.display = display
+        self.background = background
+        self.canvas = pygame.Surface(display.get_size(), 0, display)
+        self.rect = self.canvas.get_rect()
+        self.effects = []
+
+    def add_effect(self, effect):
+        """Add a post effect; effect(canvas) is called before every present"""
+        self.effects.append(effect)
+
+    def remove_effect(self, effect):
+        if effect in self.effects:
+            self.effects.remove(effect)
+
+    def present(self, offset=(0, 0), rects=None):
+        """Apply post effects and show the canvas at a camera offset
+
+        With rects, only those canvas regions are copied and updated.
+        """
+        for effect in self.effects:
+            effect(self.canvas)
+
+        offset_x, offset_y = offset
+        if rects is None:
+            if offset_x or offset_y:
+                for border in exposed_borders(self.rect, offset_x, offset_y):
+                    self.display.fill(self.background, border)
+            self.display.blit(self.canvas, offset)
+            pygame.display.flip()
+            return
+
+        updated = []
+        for rect in rects:
+            target = rect.move(offset_x, offset_y)
+            self.display.blit(self.canvas, target, rect)
+            updated.append(target)
+        pygame.display.update(updated)
+
+
+def exposed_borders(rect, offset_x, offset_y):
+    """Display strips left uncovered when the canvas is moved by an offset"""
+    borders = []
+    if offset_x > 0:
+        borders.append(pygame.Rect(0, 0, offset_x, rect.height))
+    elif offset_x < 0:
+        borders.append(pygame.Rect(rect.width + offset_x, 0, -offset_x, rect.height))
+    if offset_y > 0:
+        borders.append(pygame.Rect(0, 0, rect.width, offset_y))
+    elif offset_y < 0:
+        borders.append(pygame.Rect(0, rect.height + offset_y, rect.width, -offset_y))
+    return borders
+
+
+def shift_rows(surface, y, height, offset):
+    """Shift a horizontal band of pixels sideways, in place
+
+    Matches blitting a copy of the band at (offset, y): the columns the band
+    moves away from keep their old pixels.
+    """
+    y = max(0, y)
+    height = min(height, surface.get_height() - y)
+    offset = max(-surface.get_width(), min(surface.get_width(), offset))
+    if height <= 0 or offset == 0:
+        return
+
+    pixels = pygame.surfarray.pixels3d(surface)
+    band = pixels[:, y:y + height]
+    if offset > 0:
+        band[offset:] = band[:-offset]
+    else:
+        band[:offset] = band[-offset:]
+    del band, pixels  # release the surface lock
+
@@ -0,0 +1,127 @@
+"""
+Fixed-timestep game loop
+Runs a game's simulation at a fixed tick rate, independent of how often it
+is drawn.
+
+Every rendered frame adds the wall time since the last frame to a lag and
+runs update() once per whole tick in it, so the game moves at the same
+speed at 30, 60 or 144 frames per second. What is left of the lag, as a
+fraction of a tick, is passed to render(blend) so moving things can be
+drawn between their last two simulated positions.
+
+Under load the loop runs several ticks per frame (frame skip), up to
+MAX_UPDATES. A frame that falls further behind than that drops the rest of
+its lag, so the game slows down for a moment instead of spending ever more
+time catching up.
+
+When the game says nothing on screen is changing (idle() is true) for
+IDLE_DELAY seconds, the loop stops drawing and blocks in wait() until input
+arrives, waking every IDLE_TIMEOUT_MS to ask idle() again. Game time does
+not run while it sleeps. Time spent awake and asleep is counted.
+
+simulate(ticks) runs update() alone, with no clock and no drawing, for
+headless tests and tools.
+
+Usage:
+    loop = GameLoop(game.update, game.render, TICK_RATE, pace=game.pace,
+                    idle=game.is_idle, wait=game.wait_for_input)
+    loop.run()          # until update() returns False
+    loop.simulate(600)  # ten seconds of game time, as fast as possible
+"""
+
+import time
+
+MAX_UPDATES = 5        # ticks run per rendered frame before lag is dropped
+MAX_FRAME_TIME = 0.25  # longer gaps (a dragged window, a debugger) count as this
+IDLE_DELAY = 2.0       # seconds of stillness before the loop sleeps
+IDLE_TIMEOUT_MS = 500  # longest single wait for input
+
+
+class GameLoop:
+    """Drives update() at a fixed tick rate and render(blend) once per frame"""
+    def __init__(self, update, render, tick_rate=60, pace=None, max_updates=MAX_UPDATES,
+                 clock=time.perf_counter, idle=None, wait=None):
+        self.update = update
+        self.render = render
+        self.dt = 1 / tick_rate
+        self.pace = pace  # called at the start of every frame, e.g. Clock.tick
+        self.max_updates = max_updates
+        self.clock = clock
+        self.idle = idle  # True when nothing on screen is changing
+        self.wait = wait  # wait(timeout_ms) blocks for input; True if some arrived
+        self.lag = 0.0
+        self.ticks = 0
+        self.frames = 0
+        self.dropped = 0  # ticks of lag thrown away while behind
+        self.active_time = 0.0
+        self.idle_time = 0.0
+        self.waits = 0
+
+    def frame(self, elapsed):
+        """Run the ticks owed for `elapsed` seconds, then render; False to stop"""
+        dt = self.dt
+        self.lag += min(elapsed, MAX_FRAME_TIME)
+        updates = 0
+        while self.lag >= dt:
+            if updates == self.max_updates:
+                # Too far behind: keep the fraction, drop the whole ticks
+                behind = int(self.lag / dt)
+                self.dropped += behind
+                self.lag -= behind * dt
+                break
+            if not self.update():
+                return False
+            self.lag -= dt
+            self.ticks += 1
+            updates += 1
+        self.render(self.lag / dt)
+        self.frames += 1
+        return True
+
+    def run(self):
+        """Run frames until update() returns False"""
+        started = previous = self.clock()
+        slept = self.idle_time
+        still_since = None
+        try:
+            while True:
+                if self.idle and self.wait and self.idle():
+                    if still_since is None:
+                        still_since = previous
+                    if previous - still_since >= IDLE_DELAY:
+                        woke = self.sleep()
+                        previous = self.clock()  # no catching up on time spent asleep
+                        if not woke:
+                            continue
+                        still_since = None
+                else:
+                    still_since = None
+
+                if self.pace:
+                    self.pace()
+                now = self.clock()
+                if not self.frame(now - previous):
+                    return
+                previous = now
+        finally:
+            self.active_time += self.clock() - started - (self.idle_time - slept)
+
+    def sleep(self):
+        """Block for input up to IDLE_TIMEOUT_MS; True if input arrived"""
+        start = self.clock()
+        woke = self.wait(IDLE_TIMEOUT_MS)
+        self.idle_time += self.clock() - start
+        self.waits += 1
+        return woke
+
+    def simulate(self, ticks):
+        """Run up to `ticks` updates with no drawing; returns how many ran"""
+        for done in range(ticks):
+            if not self.update():
+                return done
+            self.ticks += 1
+        return ticks
+
+    def __str__(self):
+        return (f"{self.ticks} ticks, {self.frames} frames, {self.dropped} ticks dropped; "
+                f"active {self.active_time:.1f} s, idle {self.idle_time:.1f} s in {self.waits} waits")
@@ -0,0 +1,294 @@
+"""
+Frame profiler
+Opt-in instrumentation showing where each frame's time goes.
+
+install() wraps the frame phases of the given classes (handle_events,
+update_particles, every draw_* method, render, Compositor.present, ...)
+with perf_counter_ns timers, plus GameLoop.frame as the frame boundary and
+pygame.display.flip / update. The classes are patched before the game is
+created, so bound methods the game keeps (layer lists, the loop's update
+and render) are timed too. With profiling off nothing is patched and the
+games run their original code.
+
+Times are inclusive: render contains the draw_* calls made under it. Per
+frame each phase's calls are added up and the last WINDOW frames are kept.
+With allocations on, tracemalloc runs and every phase also records the net
+bytes it left allocated; the frame records its peak.
+
+F3 toggles an overlay drawn straight onto the display after the canvas is
+copied, showing each phase's mean and p95 over the window and a histogram
+of its frame times. export_trace() writes every span as Chrome trace JSON
+(chrome://tracing or ui.perfetto.dev).
+
+Usage:
+    python tictactoe_modern.py --profile [--profile-alloc] [--trace out.json]
+"""
+
+import json
+import time
+import tracemalloc
+from collections import deque
+
+import numpy as np
+import pygame
+
+WINDOW = 120             # frames kept for the overlay statistics
+MAX_SPANS = 500_000      # spans kept for the trace; the oldest are dropped
+PHASE_PREFIXES = ("handle_", "input_events", "update", "animate", "play_ai", "poll_network",
+                  "draw", "render", "present")
+TOGGLE_KEY = pygame.K_F3
+HISTOGRAM_EDGES_MS = [0.05, 0.1, 0.25, 0.5, 1, 2, 4, 8, 16]
+OVERLAY_ROWS = 14        # slowest phases shown
+OVERLAY_REFRESH = 30     # frames between overlay redraws
+OVERLAY_POS = (8, 8)
+
+
+class FrameProfiler:
+    """Times frame phases; draws an overlay and exports Chrome traces"""
+    def __init__(self, allocations=False):
+        self.allocations = allocations
+        self.visible = True
+        self.spans = deque(maxlen=MAX_SPANS)  # (label, start ns, duration ns, net bytes)
+        self.totals = {}       # label -> ns spent this frame
+        self.alloc_totals = {}  # label -> net bytes this frame
+        self.history = {}      # label -> the last WINDOW frame totals, ns
+        self.alloc_history = {}
+        self.peaks = deque(maxlen=WINDOW)  # tracemalloc peak bytes per frame
+        self.frames = 0
+        self.originals = []
+        self.origin = time.perf_counter_ns()
+        self.display = None
+        self.canvas = None
+        self.overlay = None
+        self.overlay_rect = None  # display area the overlay covered last frame
+        self.font = None
+
+    # ---------------------------
+    # Instrumentation
+    # ---------------------------
+    def install(self, game_class, *classes, prefixes=PHASE_PREFIXES):
+        """Wrap the frame phases of the game and helper classes, GameLoop.frame
+        and the display calls; helper phases are labelled Class.method"""
+        for cls in (game_class, *classes):
+            for name, value in list(vars(cls).items()):
+                label = name if cls is game_class else f"{cls.__name__}.{name}"
+                if name == "frame":
+                    self.wrap(cls, name, "frame", self.end_frame)
+                elif name == "input_events":
+                    self.wrap(cls, name, label, self.take_toggle)
+                elif callable(value) and name.startswith(prefixes):
+                    self.wrap(cls, name, label)
+
+        flip = self.timed("display.flip", pygame.display.flip)
+        update = self.timed("display.update", pygame.display.update)
+        draw_overlay = self.timed("profiler.overlay", self.draw_overlay)
+
+        def flip_with_overlay():
+            draw_overlay()
+            flip()
+
+        def update_with_overlay(rects=None):
+            rect = draw_overlay()
+            if rects is None or rect is None:
+                return update() if rects is None else update(rects)
+            rects = [rects] if isinstance(rects, pygame.Rect) else list(rects)
+            return update(rects + [rect])
+        self.replace(pygame.display, "flip", flip_with_overlay)
+        self.replace(pygame.display, "update", update_with_overlay)
+        if self.allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        return self
+
+    def uninstall(self):
+        """Put every wrapped function back"""
+        for owner, name, original in reversed(self.originals):
+            setattr(owner, name, original)
+        self.originals = []
+        if self.allocations:
+            tracemalloc.stop()
+
+    def replace(self, owner, name, function):
+        self.originals.append((owner, name, getattr(owner, name)))
+        setattr(owner, name, function)
+
+    def wrap(self, owner, name, label, after=None):
+        timed = self.timed(label, getattr(owner, name), after)
+        self.replace(owner, name, timed)
+
+    def timed(self, label, original, after=None):
+        """original with its calls recorded as label spans; after(result) may replace the result"""
+        record = self.record
+        clock = time.perf_counter_ns
+        if self.allocations:
+            traced = tracemalloc.get_traced_memory
+
+            def timed(*args, **kwargs):
+                before = traced()[0]
+                start = clock()
+                result = original(*args, **kwargs)
+                record(label, start, clock() - start, traced()[0] - before)
+                return after(result) if after else result
+        else:
+            def timed(*args, **kwargs):
+                start = clock()
+                result = original(*args, **kwargs)
+                record(label, start, clock() - start, 0)
+                return after(result) if after else result
+        return timed
+
+    def record(self, label, start, duration, allocated):
+        self.spans.append((label, start, duration, allocated))
+        self.totals[label] = self.totals.get(label, 0) + duration
+        if allocated:
+            self.alloc_totals[label] = self.alloc_totals.get(label, 0) + allocated
+
+    def end_frame(self, result):
+        """Close the frame: move its totals into the window"""
+        for label in self.history.keys() | self.totals.keys():
+            if label not in self.history:
+                self.history[label] = deque(maxlen=WINDOW)
+                self.alloc_history[label] = deque(maxlen=WINDOW)
+            self.history[label].append(self.totals.get(label, 0))
+            self.alloc_history[label].append(self.alloc_totals.get(label, 0))
+        self.totals = {}
+        self.alloc_totals = {}
+        if self.allocations:
+            current, peak = tracemalloc.get_traced_memory()
+            self.peaks.append(peak - current)
+            tracemalloc.reset_peak()
+        self.frames += 1
+        return result
+
+    def take_toggle(self, events):
+        """Remove the overlay toggle key from a tick's input and act on it"""
+        kept = []
+        for event in events:
+            if event.type == pygame.KEYDOWN and event.key == TOGGLE_KEY:
+                self.visible = not self.visible
+            else:
+                kept.append(event)
+        return kept
+
+    # ---------------------------
+    # Statistics and overlay
+    # ---------------------------
+    def attach(self, compositor):
+        """Draw the overlay over this compositor's display"""
+        self.display = compositor.display
+        self.canvas = compositor.canvas
+
+    def stats(self):
+        """(label, mean ms, p95 ms, mean net KiB, frame times ms) per phase, slowest first"""
+        rows = []
+        for label, values in self.history.items():
+            ms = np.array(values) / 1e6
+            kib = sum(self.alloc_history[label]) / len(values) / 1024
+            rows.append((label, ms.mean(), np.percentile(ms, 95), kib, ms))
+        rows.sort(key=lambda row: row[1], reverse=True)
+        return rows
+
+    def build_overlay(self):
+        """Render the statistics table and histograms to self.overlay"""
+        if self.font is None:
+            self.font = pygame.font.Font(None, 18)
+        rows = self.stats()[:OVERLAY_ROWS]
+        columns = [4, 190, 250, 310][:4 if self.allocations else 3]
+        histogram_x = columns[-1] + 60
+        bins = len(HISTOGRAM_EDGES_MS) + 1
+        line = 16
+        footer = f"{self.frames} frames, stats over the last {WINDOW}; " \
+                 f"histograms {HISTOGRAM_EDGES_MS[0]}-{HISTOGRAM_EDGES_MS[-1]} ms; F3 hides"
+        if self.allocations and self.peaks:
+            footer += f"; peak {np.mean(self.peaks) / 1024:.0f} KiB/frame"
+        footer = self.font.render(footer, True, (160, 160, 160))
+        width = max(histogram_x + bins * 4 + 4, footer.get_width() + 8)
+        surface = pygame.Surface((width, line * (len(rows) + 2) + 4), pygame.SRCALPHA)
+        surface.fill((0, 0, 0, 190))
+
+        def text(values, y, color):
+            for x, value in zip(columns, values):
+                surface.blit(self.font.render(value, True, color), (x, y))
+        text(["phase", "mean ms", "p95 ms", "net KiB"], 4, (255, 255, 255))
+        for i, (label, mean, p95, kib, ms) in enumerate(rows):
+            y = 4 + line * (i + 1)
+            text([label[:28], f"{mean:.3f}", f"{p95:.3f}", f"{kib:.1f}"], y, (200, 255, 200))
+            # Histogram of this phase's frame times over the window
+            counts = np.bincount(np.searchsorted(HISTOGRAM_EDGES_MS, ms), minlength=bins)
+            top = counts.max()
+            for b, count in enumerate(counts):
+                height = round(12 * count / top)
+                if height:
+                    surface.fill((0, 200, 255, 255), (histogram_x + b * 4, y + 12 - height, 3, height))
+        surface.blit(footer, (4, 4 + line * (len(rows) + 1)))
+        self.overlay = surface
+
+    def draw_overlay(self):
+        """Blit the overlay to the display; returns the display area to update"""
+        if self.display is None:
+            return None
+        if not self.visible:
+            # Restore what the overlay covered, once
+            rect, self.overlay_rect = self.overlay_rect, None
+            if rect is not None:
+                self.display.blit(self.canvas, rect, rect)
+            return rect
+        if self.overlay is None or self.frames % OVERLAY_REFRESH == 0:
+            self.build_overlay()
+        # Dirty-rect frames leave last frame's overlay on the display: repaint
+        # its area from the canvas so the translucent overlay does not build up
+        rect = pygame.Rect(OVERLAY_POS, self.overlay.get_size())
+        if self.overlay_rect is not None:
+            self.display.blit(self.canvas, self.overlay_rect, self.overlay_rect)
+            rect.union_ip(self.overlay_rect)
+        self.display.blit(self.overlay, OVERLAY_POS)
+        self.overlay_rect = pygame.Rect(OVERLAY_POS, self.overlay.get_size())
+        return rect
+
+    # ---------------------------
+    # Output
+    # ---------------------------
+    def summary(self):
+        """Text table of the window's phases"""
+        lines = [f"profile: {self.frames} frames, phase times over the last {WINDOW} (inclusive)"]
+        for label, mean, p95, kib, _ in self.stats():
+            alloc = f"  {kib:8.1f} KiB net" if self.allocations else ""
+            lines.append(f"  {label:<28} mean {mean:8.3f} ms  p95 {p95:8.3f} ms{alloc}")
+        return "\n".join(lines)
+
+    def export_trace(self, path):
+        """Write the recorded spans as Chrome trace JSON"""
+        events = [{"name": label, "cat": "frame" if label == "frame" else "phase", "ph": "X",
+                   "ts": (start - self.origin) / 1000, "dur": duration / 1000, "pid": 1, "tid": 1,
+                   "args": {"net_bytes": allocated} if self.allocations else {}}
+                  for label, start, duration, allocated in self.spans]
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        return len(events)
+
+
+# ---------------------------
+# Command line
+# ---------------------------
+def add_arguments(parser):
+    parser.add_argument("--profile", action="store_true",
+                        help="time every frame phase and show the overlay (F3 toggles it)")
+    parser.add_argument("--profile-alloc", action="store_true",
+                        help="also count allocations with tracemalloc (slow)")
+    parser.add_argument("--trace", metavar="PATH", help="write a Chrome trace of the frames on exit")
+
+
+def from_args(args, game_class, *classes):
+    """An installed FrameProfiler if profiling was asked for, else None"""
+    if not (args.profile or args.profile_alloc or args.trace):
+        return None
+    return FrameProfiler(allocations=args.profile_alloc).install(game_class, *classes)
+
+
+def finish(profiler, args):
+    """Print the summary and write the trace, if profiling"""
+    if profiler is None:
+        return
+    print(profiler.summary())
+    if args.trace:
+        count = profiler.export_trace(args.trace)
+        print(f"wrote {count} spans to {args.trace}")
@@ -0,0 +1,104 @@
+"""
+Quality governor
+Moves a game between visual quality tiers to hold its frame budget.
+
+Each frame the game reports how long its work took (Clock.get_rawtime(),
+which leaves out the time tick() sleeps). The governor averages a window
+of those times against the budget of the target frame rate:
+
+    downgrade  the window average is over DOWNGRADE_AT of the budget
+    upgrade    the average is under UPGRADE_AT of the budget and the
+               current tier has held for upgrade_wait frames
+
+The gap between the two thresholds and the wait before an upgrade are the
+hysteresis: a machine near a boundary does not flip between tiers every
+second. An upgrade that is followed straight away by a downgrade doubles
+the wait before that upgrade is tried again. The window is cleared after
+every change so each tier is judged on its own frames.
+
+Tiers are dicts of settings, lowest quality first; the game applies them
+in its apply callback. Every decision is passed to log and kept in
+history, and summary() tells which tier the machine settled on.
+"""
+
+import sys
+from collections import deque
+
+WINDOW = 60              # frames averaged per decision
+WARMUP_FRAMES = 30       # startup frames ignored (loading, first sprite bakes)
+DOWNGRADE_AT = 0.9       # fraction of the budget
+UPGRADE_AT = 0.5
+UPGRADE_WAIT = 300       # frames a tier must hold before trying the next one up
+MAX_UPGRADE_WAIT = 7200
+
+
+def log_to_stderr(message):
+    print(f"[quality] {message}", file=sys.stderr, flush=True)
+
+
+class QualityGovernor:
+    """Picks the quality tier a game can hold at its frame rate"""
+    def __init__(self, tiers, fps, name="game", tier=None, apply=None, log=log_to_stderr, adaptive=True):
+        self.tiers = tiers
+        self.budget_ms = 1000 / fps
+        self.name = name
+        self.tier = len(tiers) - 1 if tier is None else tier
+        self.apply = apply
+        self.log = log
+        self.adaptive = adaptive
+        self.window = deque(maxlen=WINDOW)
+        self.frames = 0
+        self.changed_at = 0
+        self.upgrade_wait = UPGRADE_WAIT
+        self.last_upgrade = None  # frame of the last upgrade
+        self.history = []  # (frame, from tier, to tier, average ms)
+        if apply:
+            apply(self.settings)
+
+    @property
+    def settings(self):
+        return self.tiers[self.tier]
+
+    def tier_name(self, tier):
+        return self.tiers[tier].get("name", str(tier))
+
+    def update(self, frame_ms):
+        """Record one frame's work time; returns True if the tier changed"""
+        self.frames += 1
+        if not self.adaptive or self.frames <= WARMUP_FRAMES:
+            return False
+        window = self.window
+        window.append(frame_ms)
+        if len(window) < WINDOW:
+            return False
+
+        average = sum(window) / WINDOW
+        if average > self.budget_ms * DOWNGRADE_AT and self.tier > 0:
+            if self.last_upgrade is not None and self.last_upgrade == self.changed_at:
+                # The last upgrade did not hold: wait longer before retrying it
+                self.upgrade_wait = min(self.upgrade_wait * 2, MAX_UPGRADE_WAIT)
+            self.change(self.tier - 1, average)
+            return True
+        if (average < self.budget_ms * UPGRADE_AT and self.tier < len(self.tiers) - 1
+                and self.frames - self.changed_at >= self.upgrade_wait):
+            self.change(self.tier + 1, average)
+            self.last_upgrade = self.frames
+            return True
+        return False
+
+    def change(self, tier, average):
+        old = self.tier
+        self.tier = tier
+        self.history.append((self.frames, old, tier, average))
+        self.changed_at = self.frames
+        self.window.clear()
+        if self.apply:
+            self.apply(self.settings)
+        self.log(f"{self.name}: {self.tier_name(old)} -> {self.tier_name(tier)} at frame {self.frames} "
+                 f"(average {average:.1f} ms of a {self.budget_ms:.1f} ms budget)")
+
+    def summary(self):
+        """One line saying where the governor settled"""
+        held = self.frames - self.changed_at
+        return (f"{self.name}: settled on {self.tier_name(self.tier)} for the last {held} of "
+                f"{self.frames} frames, {len(self.history)} tier changes")
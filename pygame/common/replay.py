@@ -0,0 +1,196 @@
+"""
+Input recording and replay for the pygame games
+
+A recording holds everything a game's simulation reads from outside: the
+seed of its RNGs, the input events each tick consumed, and the outcome of
+anything that depends on timing (computer moves, quality tier changes).
+Replaying it runs the same ticks on the same inputs, so the game ends in a
+byte-identical state whether it is replayed at the recorded cadence, as
+fast as possible, or with no drawing at all.
+
+File format, little-endian; one session per file, records appended as it runs:
+
+    header   b"GREC", version u16, seed u64, tick rate u16,
+             options length u16, options (UTF-8 JSON: game, pack, ...)
+    records  tick u32, kind u8, a i32, b i32, c i32
+
+KEY records are KEYDOWN (key, unicode code point), MOTION and CLICK are
+mouse positions (CLICK also the button), QUIT ends the session. AI and
+QUALITY record a computer move (row, col) and a quality tier. The END
+record carries the first 12 bytes of the final state digest. Records are
+flushed as they are written; a truncated last record (a crash) is ignored
+on reading, and a recording with no END record replays up to its last
+input.
+
+Usage:
+    python replay.py session.rec [--speed recorded|max] [--no-render]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import struct
+import sys
+import time
+from collections import defaultdict
+
+import pygame
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+MAGIC = b"GREC"
+VERSION = 1
+HEADER = struct.Struct("<4sHQHH")
+RECORD = struct.Struct("<IBiii")
+
+KEY, MOTION, CLICK, QUIT, AI, QUALITY, END = range(1, 8)
+
+
+def digest(*parts):
+    """sha256 over the bytes of each part; the games hash their state with it"""
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(part if isinstance(part, bytes) else repr(part).encode())
+    return h.digest()
+
+
+def digest_words(value):
+    """The first 12 bytes of a digest as three i32, for an END record"""
+    return struct.unpack("<iii", value[:12])
+
+
+class Recorder:
+    """Appends one session's seed, inputs and notes to a file"""
+    def __init__(self, path, seed, tick_rate, options):
+        self.kinds = {pygame.KEYDOWN: KEY, pygame.MOUSEMOTION: MOTION,
+                      pygame.MOUSEBUTTONDOWN: CLICK, pygame.QUIT: QUIT}
+        self.file = open(path, "wb")
+        payload = json.dumps(options, sort_keys=True).encode()
+        self.file.write(HEADER.pack(MAGIC, VERSION, seed, tick_rate, len(payload)) + payload)
+        self.file.flush()
+        self.records = 0
+
+    def events(self, tick, events):
+        """Record the events a tick consumed; others are not read by the games"""
+        for event in events:
+            kind = self.kinds.get(event.type)
+            if kind == KEY:
+                self.note(tick, KEY, event.key, ord(event.unicode) if len(event.unicode) == 1 else 0)
+            elif kind in (MOTION, CLICK):
+                self.note(tick, kind, event.pos[0], event.pos[1], getattr(event, "button", 0))
+            elif kind == QUIT:
+                self.note(tick, QUIT)
+
+    def note(self, tick, kind, a=0, b=0, c=0):
+        self.file.write(RECORD.pack(tick, kind, a, b, c))
+        self.file.flush()
+        self.records += 1
+
+    def close(self, tick, state_digest):
+        self.note(tick, END, *digest_words(state_digest))
+        self.file.close()
+
+
+class Replay:
+    """A recording loaded back; hands each tick its events and notes"""
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            data = f.read()
+        magic, version, self.seed, self.tick_rate, length = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path}: not a version {VERSION} game recording")
+        start = HEADER.size + length
+        self.options = json.loads(data[HEADER.size:start])
+
+        self.by_tick = defaultdict(list)
+        self.end_tick = 0
+        self.end_digest = None
+        usable = (len(data) - start) // RECORD.size * RECORD.size
+        for tick, kind, a, b, c in RECORD.iter_unpack(data[start:start + usable]):
+            if kind == END:
+                self.end_tick, self.end_digest = tick, (a, b, c)
+                break
+            self.by_tick[tick].append((kind, a, b, c))
+            self.end_tick = tick + 1
+        self.records = sum(map(len, self.by_tick.values()))
+
+    def events(self, tick):
+        """The pygame events consumed on this tick, rebuilt"""
+        events = []
+        for kind, a, b, c in self.by_tick.get(tick, ()):
+            if kind == KEY:
+                events.append(pygame.event.Event(pygame.KEYDOWN, key=a, unicode=chr(b) if b else "",
+                                                 mod=0, scancode=0))
+            elif kind == MOTION:
+                events.append(pygame.event.Event(pygame.MOUSEMOTION, pos=(a, b), rel=(0, 0),
+                                                 buttons=(0, 0, 0)))
+            elif kind == CLICK:
+                events.append(pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=(a, b), button=c))
+            elif kind == QUIT:
+                events.append(pygame.event.Event(pygame.QUIT))
+        return events
+
+    def notes(self, tick, kind):
+        """(a, b, c) of this tick's records of one kind"""
+        return [(a, b, c) for k, a, b, c in self.by_tick.get(tick, ()) if k == kind]
+
+
+# ---------------------------
+# Replay tool
+# ---------------------------
+def load_game(replay, render):
+    """Build the recorded game; with render off it never opens a real window"""
+    if not render:
+        os.environ["SDL_VIDEODRIVER"] = "dummy"
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    options = dict(replay.options)
+    name = options.pop("game")
+    sys.path.insert(0, os.path.join(HERE, "..", name))
+    if name == "hangman":
+        from hangman import HangmanGame as game_class
+    else:
+        from tictactoe_modern import TicTacToe as game_class
+    return game_class(seed=replay.seed, replay=replay, **options)
+
+
+def run(game, replay, speed, render):
+    """Run the recorded ticks, one update per tick; returns the number run"""
+    clock = pygame.time.Clock()
+    ticks = replay.end_tick - game.ticks
+    for _ in range(ticks):
+        if speed == "recorded":
+            clock.tick(replay.tick_rate)
+        game.update()
+        if render:
+            game.render()
+    return ticks
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded game session")
+    parser.add_argument("recording")
+    parser.add_argument("--speed", choices=["recorded", "max"], default="max",
+                        help="tick at the recorded rate or as fast as possible")
+    parser.add_argument("--no-render", dest="render", action="store_false", help="simulate only")
+    args = parser.parse_args()
+
+    replay = Replay(args.recording)
+    game = load_game(replay, args.render)
+    start = time.perf_counter()
+    ticks = run(game, replay, args.speed, args.render)
+    elapsed = time.perf_counter() - start
+    state = game.state_digest()
+    print(f"{replay.options['game']}: {ticks:,} ticks, {replay.records:,} records in {elapsed:.2f} s "
+          f"({ticks / elapsed:,.0f} ticks/s), state {state.hex()[:24]}")
+    if replay.end_digest is None:
+        print("no END record (session did not close cleanly); nothing to compare")
+    elif digest_words(state) == replay.end_digest:
+        print("state matches the recording")
+    else:
+        print("state DIFFERS from the recording")
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
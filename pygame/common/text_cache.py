@@ -0,0 +1,120 @@
+"""
+Text Cache
+Bounded LRU cache of rendered text surfaces shared by the pygame games.
+
+Font rasterization is one of the most expensive calls in a frame, and most
+labels (titles, hints, scores) are the same string frame after frame. The
+cache keys each rendered surface by (font, text, antialias, color) and only
+calls font.render on a miss. Single glyphs can also be packed into a
+GlyphAtlas so drawing a letter is one area blit from a shared surface.
+"""
+
+from collections import OrderedDict
+import string
+
+import pygame
+
+ALPHABET = string.ascii_uppercase
+
+
+class GlyphAtlas:
+    """A set of glyphs rendered once and packed side by side in one surface"""
+    def __init__(self, font, chars, antialias, color):
+        glyphs = [font.render(char, antialias, color) for char in chars]
+        width = sum(glyph.get_width() for glyph in glyphs)
+        height = max(glyph.get_height() for glyph in glyphs)
+
+        self.surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        self.rects = {}
+        x = 0
+        for char, glyph in zip(chars, glyphs):
+            # RGBA_MAX onto a cleared surface copies the glyph pixels exactly,
+            # where a normal alpha blit would darken the antialiased edges.
+            self.surface.blit(glyph, (x, 0), special_flags=pygame.BLEND_RGBA_MAX)
+            self.rects[char] = pygame.Rect(x, 0, glyph.get_width(), glyph.get_height())
+            x += glyph.get_width()
+
+    def __contains__(self, char):
+        return char in self.rects
+
+    def get_rect(self, char, **kwargs):
+        """Return the glyph rect positioned like Surface.get_rect(**kwargs)"""
+        return _place(self.rects[char], **kwargs)
+
+    def blit(self, screen, char, **kwargs):
+        """Blit a glyph positioned with Rect keywords (center=, topleft=...)"""
+        area = self.rects[char]
+        dest = _place(area, **kwargs)
+        screen.blit(self.surface, dest, area)
+        return dest
+
+
+def _place(area, **kwargs):
+    """Return a rect the size of `area` moved to the given Rect keywords"""
+    rect = pygame.Rect(0, 0, area.width, area.height)
+    for name, value in kwargs.items():
+        setattr(rect, name, value)
+    return rect
+
+
+class TextCache:
+    """Least-recently-used cache of rendered text surfaces"""
+    def __init__(self, capacity=256):
+        self.capacity = capacity
+        self.entries = OrderedDict()
+        self.atlases = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def render(self, font, text, antialias, color, alpha=None):
+        """Return font.render(text, antialias, color), cached.
+
+        Surfaces handed out are shared, so callers must not modify them.
+        Pass `alpha` instead of calling set_alpha on the result; each alpha
+        value is cached as its own entry.
+        """
+        key = (font, text, antialias, tuple(color), alpha)
+        surface = self.entries.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        if alpha is not None:
+            surface.set_alpha(alpha)
+        self.entries[key] = surface
+        if len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+        return surface
+
+    def glyph_atlas(self, font, antialias, color, chars=ALPHABET):
+        """Return the (lazily built) glyph atlas for a font and color"""
+        key = (font, antialias, tuple(color), chars)
+        atlas = self.atlases.get(key)
+        if atlas is None:
+            self.misses += 1
+            atlas = GlyphAtlas(font, chars, antialias, color)
+            self.atlases[key] = atlas
+        else:
+            self.hits += 1
+        return atlas
+
+    def stats(self):
+        """Return the hit/miss/eviction counters"""
+        return {
+            "size": len(self.entries),
+            "capacity": self.capacity,
+            "atlases": len(self.atlases),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def clear(self):
+        """Drop every cached surface"""
+        self.entries.clear()
+        self.atlases.clear()
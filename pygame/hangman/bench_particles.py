@@ -0,0 +1,141 @@
+"""
+Particle frame-time benchmark
+
+Compares the old per-particle path (one Particle object per particle, a fresh
+SRCALPHA Surface per draw, list.remove for dead particles) against the
+vectorized ParticleSystem, holding about 10k particles alive at 1400x900.
+
+Usage:
+    python bench_particles.py [--particles 10000] [--frames 300]
+
+Reference run (SDL dummy driver, software surfaces, 10k live particles):
+
+    path       update ms   draw ms   frame ms
+    legacy          4.5      41.7       46.2
+    vectorized      0.5       7.2        7.7
+"""
+
+import argparse
+import math
+import os
+import random
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from particles import LIFETIME, ParticleSystem
+
+WIDTH = 1400
+HEIGHT = 900
+COLORS = [(52, 199, 89), (255, 69, 58)]
+
+
+# ---------------------------
+# Legacy path (previous hangman.py implementation)
+# ---------------------------
+class LegacyParticle:
+    def __init__(self, x, y, color, velocity):
+        self.x = x
+        self.y = y
+        self.color = color
+        self.velocity = velocity
+        self.lifetime = 40
+        self.max_lifetime = 40
+        self.size = random.randint(3, 7)
+
+    def update(self):
+        self.x += self.velocity[0]
+        self.y += self.velocity[1]
+        self.velocity = (self.velocity[0] * 0.96, self.velocity[1] + 0.15)
+        self.lifetime -= 1
+
+    def draw(self, screen):
+        alpha = int(255 * (self.lifetime / self.max_lifetime))
+        size = max(1, int(self.size * (self.lifetime / self.max_lifetime)))
+
+        s = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
+        pygame.draw.circle(s, (*self.color, alpha), (size, size), size)
+        screen.blit(s, (int(self.x - size), int(self.y - size)))
+
+    def is_dead(self):
+        return self.lifetime <= 0
+
+
+class LegacySystem:
+    def __init__(self):
+        self.particles = []
+
+    def emit(self, x, y, color, count):
+        for _ in range(count):
+            angle = random.uniform(0, 2 * math.pi)
+            speed = random.uniform(2, 6)
+            velocity = (math.cos(angle) * speed, math.sin(angle) * speed)
+            self.particles.append(LegacyParticle(x, y, color, velocity))
+
+    def update(self):
+        for particle in self.particles[:]:
+            particle.update()
+            if particle.is_dead():
+                self.particles.remove(particle)
+
+    def draw(self, screen):
+        for particle in self.particles:
+            particle.draw(screen)
+
+    def __len__(self):
+        return len(self.particles)
+
+
+# ---------------------------
+# Benchmark
+# ---------------------------
+def run(system, screen, target, frames):
+    """Return mean (update, draw) milliseconds at a steady particle count."""
+    rng = random.Random(1234)
+    per_frame = max(1, target // LIFETIME)
+
+    # Fill up to the steady state before measuring
+    for _ in range(LIFETIME):
+        system.emit(rng.randint(0, WIDTH), rng.randint(0, HEIGHT), rng.choice(COLORS), per_frame)
+        system.update()
+
+    update_time = 0.0
+    draw_time = 0.0
+    for _ in range(frames):
+        system.emit(rng.randint(0, WIDTH), rng.randint(0, HEIGHT), rng.choice(COLORS), per_frame)
+
+        start = time.perf_counter()
+        system.update()
+        mid = time.perf_counter()
+        screen.fill((18, 18, 20))
+        system.draw(screen)
+        end = time.perf_counter()
+
+        update_time += mid - start
+        draw_time += end - mid
+
+    return update_time * 1000 / frames, draw_time * 1000 / frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Particle frame-time benchmark")
+    parser.add_argument("--particles", type=int, default=10000)
+    parser.add_argument("--frames", type=int, default=300)
+    args = parser.parse_args()
+
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+
+    print(f"{args.particles} live particles, {args.frames} frames")
+    print(f"{'path':<10} {'update ms':>10} {'draw ms':>9} {'frame ms':>10}")
+    for name, system in (("legacy", LegacySystem()), ("vectorized", ParticleSystem())):
+        update_ms, draw_ms = run(system, screen, args.particles, args.frames)
+        print(f"{name:<10} {update_ms:>10.1f} {draw_ms:>9.1f} {update_ms + draw_ms:>10.1f}")
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Hangman solver microbenchmark
+
+Builds a synthetic word pack (300k words by default), then lets the solver
+play random words from it. Every guess is timed end to end: narrowing the
+candidates with update() and picking the next letter with best_letter().
+Starting a game (reset(), which builds the inverted index the first time a
+length is seen) is reported separately. Exits non-zero if the p99 guess
+time is over the 1 ms budget.
+
+Usage:
+    python bench_solver.py [--words 300000] [--games 2000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from bench_word_store import write_pack
+from solver import HangmanSolver, MAX_MISSES
+from word_store import WordStore
+
+BUDGET_MS = 1.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hangman solver microbenchmark")
+    parser.add_argument("--words", type=int, default=300000)
+    parser.add_argument("--games", type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "pack.txt")
+        write_pack(path, args.words)
+        store = WordStore.open(path)
+        solver = HangmanSolver(store)
+        rng = random.Random(11)
+
+        guess_ms = []
+        reset_ms = []
+        wins = 0
+        for _ in range(args.games):
+            word = store.sample(rng, min_length=4, max_length=12)
+            start = time.perf_counter()
+            solver.reset(len(word))
+            reset_ms.append((time.perf_counter() - start) * 1000)
+
+            pattern = ["_"] * len(word)
+            guessed = set()
+            misses = 0
+            while "_" in pattern and misses < MAX_MISSES:
+                start = time.perf_counter()
+                letter = solver.best_letter()
+                elapsed = time.perf_counter() - start
+
+                guessed.add(letter)
+                hits = [i for i, char in enumerate(word) if char == letter]
+                for i in hits:
+                    pattern[i] = letter
+                misses += not hits
+
+                start = time.perf_counter()
+                solver.update(pattern, guessed)
+                guess_ms.append((elapsed + time.perf_counter() - start) * 1000)
+            wins += "_" not in pattern
+        store.close()
+
+    guess = np.percentile(guess_ms, [50, 95, 99])
+    reset = np.percentile(reset_ms, [50, 99])
+    print(f"{args.words:,} words, {args.games} games, {len(guess_ms)} guesses, "
+          f"solver won {wins / args.games:.0%}")
+    print(f"per guess   p50 {guess[0]:.3f} ms   p95 {guess[1]:.3f} ms   "
+          f"p99 {guess[2]:.3f} ms   max {max(guess_ms):.3f} ms")
+    print(f"new game    p50 {reset[0]:.3f} ms   p99 {reset[1]:.3f} ms   max {max(reset_ms):.1f} ms")
+    if guess[2] > BUDGET_MS:
+        print(f"p99 guess time is over the {BUDGET_MS} ms budget")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
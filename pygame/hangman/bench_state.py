@@ -0,0 +1,65 @@
+"""
+Hangman session memory and throughput benchmark
+
+Holds many HangmanState sessions at once, the way a game server would, and
+reports memory per session (tracemalloc), guesses per second across all of
+them, and the snapshot size and snapshot/restore cost.
+
+Usage:
+    python bench_state.py [--sessions 100000] [--pack islamic]
+"""
+
+import argparse
+import random
+import time
+import tracemalloc
+
+from hangman_state import HangmanState
+from word_store import WordStore, pack_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hangman session memory and throughput benchmark")
+    parser.add_argument("--sessions", type=int, default=100000)
+    parser.add_argument("--pack", default="islamic")
+    args = parser.parse_args()
+
+    store = WordStore.open(pack_path(args.pack))
+    rng = random.Random(5)
+    words = [store.sample(rng, min_length=4, max_length=9) for _ in range(args.sessions)]
+    letters = [rng.choice("etaoinshrdlucmfwypvbgkqjxz") for _ in range(args.sessions * 4)]
+
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    sessions = [HangmanState(word) for word in words]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    per_session = (after - before) / args.sessions
+
+    start = time.perf_counter()
+    for round_number in range(4):
+        offset = round_number * args.sessions
+        for i, state in enumerate(sessions):
+            state.guess(letters[offset + i])
+    guesses_per_second = 4 * args.sessions / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    snapshots = [state.snapshot() for state in sessions]
+    snapshot_us = (time.perf_counter() - start) / args.sessions * 1e6
+    start = time.perf_counter()
+    restored = [HangmanState.restore(data) for data in snapshots]
+    restore_us = (time.perf_counter() - start) / args.sessions * 1e6
+    assert all(a.snapshot() == b.snapshot() and a.word_display == b.word_display
+               for a, b in zip(sessions, restored))
+
+    sizes = sorted(len(data) for data in snapshots)
+    print(f"{args.sessions:,} sessions, {per_session:.0f} bytes each "
+          f"({per_session * args.sessions / 2 ** 20:.1f} MiB total)")
+    print(f"guesses      {guesses_per_second:,.0f} /s")
+    print(f"snapshot     {sizes[len(sizes) // 2]} bytes median, {snapshot_us:.2f} us")
+    print(f"restore      {restore_us:.2f} us")
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Word store startup and sampling benchmark
+
+Writes a synthetic word pack (random a-z words, lengths 3-15), then times
+compiling its index on first open, re-opening it through the cached index
+the way a relaunch does, and sampling with length, letter and tier filters.
+
+Usage:
+    python bench_word_store.py [--words 500000] [--samples 2000]
+"""
+
+import argparse
+import os
+import random
+import string
+import tempfile
+import time
+
+from word_store import WordStore
+
+
+def write_pack(path, count, seed=3):
+    rng = random.Random(seed)
+    letters = string.ascii_lowercase
+    weights = [8.2, 1.5, 2.8, 4.3, 12.7, 2.2, 2.0, 6.1, 7.0, 0.15, 0.77, 4.0, 2.4,
+               6.7, 7.5, 1.9, 0.095, 6.0, 6.3, 9.1, 2.8, 0.98, 2.4, 0.15, 2.0, 0.074]
+    words = set()
+    while len(words) < count:
+        length = rng.randint(3, 15)
+        words.add("".join(rng.choices(letters, weights, k=length)))
+    with open(path, "w") as f:
+        f.write("\n".join(words))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Word store startup and sampling benchmark")
+    parser.add_argument("--words", type=int, default=500000)
+    parser.add_argument("--samples", type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "pack.txt")
+        write_pack(path, args.words)
+
+        start = time.perf_counter()
+        store = WordStore.open(path)
+        build_ms = (time.perf_counter() - start) * 1000
+        store.close()
+
+        opens = []
+        for _ in range(20):
+            start = time.perf_counter()
+            store = WordStore.open(path)
+            opens.append((time.perf_counter() - start) * 1000)
+            store.close()
+        opens.sort()
+
+        store = WordStore.open(path)
+        print(f"{len(store):,} words, index {os.path.getsize(path + '.idx') / 1e6:.1f} MB")
+        print(f"first open (build index)   {build_ms:9.1f} ms")
+        print(f"cached open, median        {opens[len(opens) // 2]:9.3f} ms")
+        print(f"cached open, worst         {opens[-1]:9.3f} ms")
+
+        filters = [
+            ("length 4-9", {"min_length": 4, "max_length": 9}),
+            ("length 6, has 'q'", {"min_length": 6, "max_length": 6, "include": "q"}),
+            ("no 'e', tier 2", {"exclude": "e", "tier": 2}),
+        ]
+        rng = random.Random(1)
+        for label, kwargs in filters:
+            start = time.perf_counter()
+            for _ in range(args.samples):
+                store.sample(rng, **kwargs)
+            per_sample = (time.perf_counter() - start) / args.samples * 1e6
+            print(f"sample {label:<19} {per_sample:9.1f} us")
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
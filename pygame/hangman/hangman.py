@@ -1,23 +1,30 @@
 import pygame
+import argparse
+import os
 import random
 import sys
 import math
 
+# Shared helpers live in pygame/common
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "common"))
+
+import profiler
+from compositor import Compositor
+from game_loop import GameLoop
+from hangman_state import HIT, MAX_TRIES, MISS, REPEAT, HangmanState
+from particles import ParticleSystem
+from quality import QualityGovernor
+from replay import QUALITY, Recorder, digest
+from solver import HangmanSolver
+from text_cache import TextCache
+from word_store import WordStore, pack_path
+
 # ---------------------------
 # Configuration
 # ---------------------------
-WORDS = [
-    # Basic Islamic terms
-    "islam", "quran", "muhammad", "prayer", "ramadan",
-    "mosque", "prophet", "ummah", "sunnah", "salah",
-    "deen", "iman", "hajj", "zakat", "sadaqah", "adhan", "taqwa", "jannah",
-    
-    # Historical Islamic terms
-    "andalus", "abbasid", "umayyad", "ottoman", "fatimid",
-    "cordoba", "baghdad", "damascus", "mecca", "medina",
-    "khilafah", "mamluk", "sultans", "granada", "caliphate",
-    "samarkand", "ayyubid", "seljuks", "almohad", "mughals"
-]
+WORD_PACK = "islamic"  # word list in words/<pack>.txt
+MIN_WORD_LENGTH = 4
+MAX_WORD_LENGTH = 9    # longest word the letter boxes fit across the panel
 
 # Modern Minimalist Color Palette - Iconic Design
 BG_DARK = (18, 18, 20)
@@ -37,45 +44,53 @@ GOLD = (255, 204, 0)
 WIDTH = 1400
 HEIGHT = 900
 FPS = 60
+TICK_RATE = 60  # fixed simulation ticks per second; animation steps are per tick
 
-# ---------------------------
-# Particle Class for Visual Effects
-# ---------------------------
-class Particle:
-    def __init__(self, x, y, color, velocity):
-        self.x = x
-        self.y = y
-        self.color = color
-        self.velocity = velocity
-        self.lifetime = 40
-        self.max_lifetime = 40
-        self.size = random.randint(3, 7)
-
-    def update(self):
-        self.x += self.velocity[0]
-        self.y += self.velocity[1]
-        self.velocity = (self.velocity[0] * 0.96, self.velocity[1] + 0.15)
-        self.lifetime -= 1
-
-    def draw(self, screen):
-        alpha = int(255 * (self.lifetime / self.max_lifetime))
-        size = max(1, int(self.size * (self.lifetime / self.max_lifetime)))
+# Effect quality tiers, lowest first; "high" is the full effect set
+QUALITY_TIERS = [
+    {"name": "low", "particle_scale": 0.3, "max_particles": 100, "victory_bursts": 10},
+    {"name": "medium", "particle_scale": 0.6, "max_particles": 300, "victory_bursts": 25},
+    {"name": "high", "particle_scale": 1.0, "max_particles": None, "victory_bursts": 50},
+]
 
-        s = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
-        pygame.draw.circle(s, (*self.color, alpha), (size, size), size)
-        screen.blit(s, (int(self.x - size), int(self.y - size)))
+# Layout - bounds of each layer that can change between frames
+SCREEN_RECT = pygame.Rect(0, 0, WIDTH, HEIGHT)
+STATS_RECT = pygame.Rect(30, 30, 450, 130)
+WORD_RECT = pygame.Rect(550, 200, 800, 160)
+LIVES_RECT = pygame.Rect(550, 390, 800, 110)
+GUESSED_RECT = pygame.Rect(550, 530, 800, 100)
+MESSAGE_RECT = pygame.Rect(550, 660, 800, 90)
+FIGURE_LAYER_RECT = pygame.Rect(352, 348, 116, 260)
+FIGURE_RECT = FIGURE_LAYER_RECT.inflate(16, 16)  # hangman plus max shake
 
-    def is_dead(self):
-        return self.lifetime <= 0
+# ---------------------------
+# Dirty Rect Helpers
+# ---------------------------
+def merge_rects(rects):
+    """Merge overlapping rects so no region is redrawn twice."""
+    merged = []
+    for rect in rects:
+        if rect.width <= 0 or rect.height <= 0:
+            continue
+        rect = rect.copy()
+        index = rect.collidelist(merged)
+        while index != -1:
+            rect.union_ip(merged.pop(index))
+            index = rect.collidelist(merged)
+        merged.append(rect)
+    return merged
 
 # ---------------------------
 # Game Class
 # ---------------------------
 class HangmanGame:
-    def __init__(self):
+    def __init__(self, seed=None, pack=WORD_PACK, tier=None, quality="auto", record=None, replay=None):
         pygame.init()
-        self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
+        self.display = pygame.display.set_mode((WIDTH, HEIGHT))
         pygame.display.set_caption("HANGMAN")
+        # Frames are composed offscreen and presented by dirty rect
+        self.compositor = Compositor(self.display, BG_DARK)
+        self.screen = self.compositor.canvas
         self.clock = pygame.time.Clock()
 
         # Fonts
@@ -86,35 +101,102 @@ class HangmanGame:
         self.font_small = pygame.font.Font(None, 32)
         self.font_tiny = pygame.font.Font(None, 24)
 
+        # Rendered text is cached; revealed letters come from a glyph atlas
+        self.text_cache = TextCache()
+        self.letter_atlas = self.text_cache.glyph_atlas(self.font_large, True, BG_DARK)
+
+        # Retained-mode rendering: static content is composited once into
+        # the background, and each dynamic layer is redrawn only when the
+        # state it depends on changes.
+        self.background = None
+        self.overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
+        self.overlay.fill((0, 0, 0, 220))
+        self.layers = [
+            ("stats", self.draw_stats_panel),
+            ("word", self.draw_word),
+            ("lives", self.draw_lives),
+            ("guessed", self.draw_guessed_letters),
+            ("message", self.draw_message),
+            ("hangman", self.draw_hangman),
+            ("game_over", self.draw_game_over),
+        ]
+        self.figure_layers = {}
+        self.layer_keys = {}
+        self.layer_bounds = {}
+        self.particle_bounds = None
+        self.blend = 1.0  # fraction of a tick the frame being drawn is past the last update
+
+        # Words are sampled from a memory-mapped pack instead of a list
+        self.words = WordStore.open(pack_path(pack))
+        first, end = self.words.id_range(MIN_WORD_LENGTH, MAX_WORD_LENGTH)
+        if end <= first:
+            raise ValueError(f"{pack_path(pack)}: word pack has no words of "
+                             f"{MIN_WORD_LENGTH}-{MAX_WORD_LENGTH} letters")
+        self.tier = tier  # difficulty tier to draw words from, None for any
+        self.solver = HangmanSolver(self.words)
+
+        # Everything random in the simulation comes from the seed, so a
+        # recording of the inputs replays to the same state
+        if seed is None and record:
+            seed = random.SystemRandom().getrandbits(63)
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.ticks = 0
+        self.replay = replay  # Replay feeding recorded input instead of the event queue
+        self.recorder = None
+        if record:
+            options = {"game": "hangman", "pack": pack, "tier": tier, "quality": quality}
+            self.recorder = Recorder(record, seed, TICK_RATE, options)
+
         # Game state
-        self.particles = []
+        self.particles = ParticleSystem(seed=seed)
         self.animation_timer = 0
         self.letter_reveal_timers = {}
-        self.score = 0
-        self.streak = 0
-        self.best_streak = 0
+        # Rules and score live in a pygame-free state object; this class
+        # only draws it and plays effects
+        self.state = HangmanState()
+
+        # "auto" starts at the top quality tier and steps down if frames run
+        # long; naming a tier pins it
+        names = [settings["name"] for settings in QUALITY_TIERS]
+        self.governor = QualityGovernor(QUALITY_TIERS, FPS, "hangman",
+                                        tier=None if quality == "auto" else names.index(quality),
+                                        apply=self.apply_quality,
+                                        adaptive=quality == "auto" and not replay)
+
+        # Game speed follows TICK_RATE, not the frame rate;
+        # loop.simulate(ticks) runs the game with no drawing. On a still
+        # screen the loop sleeps until input arrives.
+        self.woken_by = None  # event that ended an idle wait, handled first
+        self.loop = GameLoop(self.update, self.render, TICK_RATE, pace=self.pace,
+                             idle=self.is_idle, wait=self.wait_for_input)
 
         self.reset_game()
 
+    def apply_quality(self, settings):
+        """Switch the effects to a quality tier's settings."""
+        self.quality = settings
+        self.particles.max_count = settings["max_particles"]
+        if self.recorder:
+            self.recorder.note(self.ticks, QUALITY, QUALITY_TIERS.index(settings))
+
     def reset_game(self):
         """Reset game to initial state."""
-        self.word = random.choice(WORDS).upper()
-        self.guessed_letters = set()
-        self.tries = 6
-        self.word_display = ["_"] * len(self.word)
-        self.game_over = False
-        self.won = False
-        self.message = "Press any letter to guess"
+        # Without a word of the tier in range, any tier will do; the length
+        # range always holds, longer words do not fit the letter boxes
+        word = (self.words.sample(self.rng, min_length=MIN_WORD_LENGTH, max_length=MAX_WORD_LENGTH,
+                                  tier=self.tier)
+                or self.words.sample(self.rng, min_length=MIN_WORD_LENGTH, max_length=MAX_WORD_LENGTH))
+        self.state.new_word(word)
+        self.message = "Press any letter to guess, TAB for a hint"
         self.message_color = LIGHT_GRAY
         self.shake_intensity = 0
+        self.shake_offset = (0, 0)
+        self.solver.reset(len(self.state.word))
 
     def create_particles(self, x, y, color, count=15):
         """Create particle explosion effect."""
-        for _ in range(count):
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(2, 6)
-            velocity = (math.cos(angle) * speed, math.sin(angle) * speed)
-            self.particles.append(Particle(x, y, color, velocity))
+        self.particles.emit(x, y, color, max(1, round(count * self.quality["particle_scale"])))
 
     def draw_modern_panel(self, rect, bg_color=BG_MID, border_color=None, border_width=0):
         """Draw a clean modern panel."""
@@ -127,7 +209,7 @@ class HangmanGame:
 
     def draw_text(self, text, font, color, x, y, center=True):
         """Draw text with optional shadow."""
-        text_surf = font.render(text, True, color)
+        text_surf = self.text_cache.render(font, text, True, color)
         if center:
             text_rect = text_surf.get_rect(center=(x, y))
         else:
@@ -135,8 +217,8 @@ class HangmanGame:
         self.screen.blit(text_surf, text_rect)
         return text_rect
 
-    def draw_hangman(self):
-        """Draw minimalist hangman."""
+    def draw_gallows(self):
+        """Draw the gallows (static, part of the background)."""
         base_x = 250
         base_y = 700
 
@@ -159,69 +241,72 @@ class HangmanGame:
             pygame.draw.line(self.screen, LIGHT_GRAY,
                            (base_x + 160, y_pos), (base_x + 160, y_pos + 10), 4)
 
-        wrong_guesses = 6 - self.tries
-        hang_x = base_x + 160
-        head_y = base_y - 310
-
-        # Apply shake
-        shake_x = random.randint(-self.shake_intensity, self.shake_intensity)
-        shake_y = random.randint(-self.shake_intensity, self.shake_intensity)
+    def build_figure_layer(self, wrong_guesses):
+        """Render the hangman for a number of wrong guesses into a layer."""
+        layer = pygame.Surface(FIGURE_LAYER_RECT.size, pygame.SRCALPHA)
+        hang_x = 410 - FIGURE_LAYER_RECT.x
+        head_y = 390 - FIGURE_LAYER_RECT.y
 
         if wrong_guesses >= 1:  # Head
-            pygame.draw.circle(self.screen, BG_LIGHT, (hang_x + shake_x, head_y + shake_y), 38)
-            pygame.draw.circle(self.screen, ACCENT_DANGER, (hang_x + shake_x, head_y + shake_y), 38, 4)
+            pygame.draw.circle(layer, BG_LIGHT, (hang_x, head_y), 38)
+            pygame.draw.circle(layer, ACCENT_DANGER, (hang_x, head_y), 38, 4)
 
             # Minimal face
-            pygame.draw.circle(self.screen, LIGHT_GRAY, (hang_x - 12 + shake_x, head_y - 8 + shake_y), 4)
-            pygame.draw.circle(self.screen, LIGHT_GRAY, (hang_x + 12 + shake_x, head_y - 8 + shake_y), 4)
-            pygame.draw.arc(self.screen, LIGHT_GRAY,
-                          pygame.Rect(hang_x - 16 + shake_x, head_y + 8 + shake_y, 32, 20),
+            pygame.draw.circle(layer, LIGHT_GRAY, (hang_x - 12, head_y - 8), 4)
+            pygame.draw.circle(layer, LIGHT_GRAY, (hang_x + 12, head_y - 8), 4)
+            pygame.draw.arc(layer, LIGHT_GRAY,
+                          pygame.Rect(hang_x - 16, head_y + 8, 32, 20),
                           math.pi, 2 * math.pi, 3)
 
         if wrong_guesses >= 2:  # Body
-            pygame.draw.line(self.screen, ACCENT_DANGER,
-                           (hang_x + shake_x, head_y + 38 + shake_y),
-                           (hang_x + shake_x, head_y + 140 + shake_y), 6)
+            pygame.draw.line(layer, ACCENT_DANGER,
+                           (hang_x, head_y + 38), (hang_x, head_y + 140), 6)
 
         if wrong_guesses >= 3:  # Left arm
-            pygame.draw.line(self.screen, ACCENT_DANGER,
-                           (hang_x + shake_x, head_y + 60 + shake_y),
-                           (hang_x - 50 + shake_x, head_y + 110 + shake_y), 6)
+            pygame.draw.line(layer, ACCENT_DANGER,
+                           (hang_x, head_y + 60), (hang_x - 50, head_y + 110), 6)
 
         if wrong_guesses >= 4:  # Right arm
-            pygame.draw.line(self.screen, ACCENT_DANGER,
-                           (hang_x + shake_x, head_y + 60 + shake_y),
-                           (hang_x + 50 + shake_x, head_y + 110 + shake_y), 6)
+            pygame.draw.line(layer, ACCENT_DANGER,
+                           (hang_x, head_y + 60), (hang_x + 50, head_y + 110), 6)
 
         if wrong_guesses >= 5:  # Left leg
-            pygame.draw.line(self.screen, ACCENT_DANGER,
-                           (hang_x + shake_x, head_y + 140 + shake_y),
-                           (hang_x - 45 + shake_x, head_y + 210 + shake_y), 6)
+            pygame.draw.line(layer, ACCENT_DANGER,
+                           (hang_x, head_y + 140), (hang_x - 45, head_y + 210), 6)
 
         if wrong_guesses >= 6:  # Right leg
-            pygame.draw.line(self.screen, ACCENT_DANGER,
-                           (hang_x + shake_x, head_y + 140 + shake_y),
-                           (hang_x + 45 + shake_x, head_y + 210 + shake_y), 6)
+            pygame.draw.line(layer, ACCENT_DANGER,
+                           (hang_x, head_y + 140), (hang_x + 45, head_y + 210), 6)
 
-        if self.shake_intensity > 0:
-            self.shake_intensity -= 1
+        return layer
+
+    def draw_hangman(self):
+        """Draw minimalist hangman - shake is an offset on the cached figure."""
+        wrong_guesses = MAX_TRIES - self.state.tries
+        if wrong_guesses <= 0:
+            return
+
+        layer = self.figure_layers.get(wrong_guesses)
+        if layer is None:
+            layer = self.build_figure_layer(wrong_guesses)
+            self.figure_layers[wrong_guesses] = layer
+        self.screen.blit(layer, FIGURE_LAYER_RECT.move(self.shake_offset))
 
     def draw_word(self):
         """Draw word with clean letter boxes."""
-        panel_rect = pygame.Rect(550, 200, 800, 160)
-        self.draw_modern_panel(panel_rect, BG_MID)
+        self.draw_modern_panel(WORD_RECT, BG_MID)
 
         # Title
         self.draw_text("WORD", self.font_medium, LIGHT_GRAY, 590, 240, center=False)
 
         # Letter boxes
-        total_letters = len(self.word_display)
+        total_letters = len(self.state.word_display)
         box_size = 65
         spacing = 18
         total_width = (box_size + spacing) * total_letters - spacing
         start_x = 550 + (800 - total_width) // 2
 
-        for i, letter in enumerate(self.word_display):
+        for i, letter in enumerate(self.state.word_display):
             x = start_x + i * (box_size + spacing)
             y = 275
 
@@ -246,49 +331,38 @@ class HangmanGame:
                 pygame.draw.rect(self.screen, ACCENT_PRIMARY, box_rect, 3, border_radius=12)
 
                 # Letter in dark color for perfect readability
-                letter_surf = self.font_large.render(letter, True, BG_DARK)
-                letter_rect = letter_surf.get_rect(center=box_rect.center)
-                self.screen.blit(letter_surf, letter_rect)
-
-        # Update timers
-        for key in list(self.letter_reveal_timers.keys()):
-            self.letter_reveal_timers[key] += 1
-            if self.letter_reveal_timers[key] > 15:
-                del self.letter_reveal_timers[key]
+                self.letter_atlas.blit(self.screen, letter, center=box_rect.center)
 
     def draw_stats_panel(self):
         """Draw stats in top left."""
-        panel_rect = pygame.Rect(30, 30, 450, 130)
-        self.draw_modern_panel(panel_rect, BG_MID)
+        self.draw_modern_panel(STATS_RECT, BG_MID)
 
         # Streak
-        streak_icon = "🔥" if self.streak > 0 else "—"
-        self.draw_text(f"{streak_icon} Streak: {self.streak}", self.font_small,
-                      ACCENT_WARNING if self.streak > 0 else LIGHT_GRAY, 60, 65, center=False)
+        streak_icon = "🔥" if self.state.streak > 0 else "—"
+        self.draw_text(f"{streak_icon} Streak: {self.state.streak}", self.font_small,
+                      ACCENT_WARNING if self.state.streak > 0 else LIGHT_GRAY, 60, 65, center=False)
 
         # Best
-        self.draw_text(f"Best: {self.best_streak}", self.font_tiny, LIGHT_GRAY, 60, 100, center=False)
+        self.draw_text(f"Best: {self.state.best_streak}", self.font_tiny, LIGHT_GRAY, 60, 100, center=False)
 
         # Score
-        score_color = ACCENT_PRIMARY if self.score > 0 else LIGHT_GRAY
-        self.draw_text(f"Score: {self.score}", self.font_medium, score_color, 360, 80, center=False)
+        score_color = ACCENT_PRIMARY if self.state.score > 0 else LIGHT_GRAY
+        self.draw_text(f"Score: {self.state.score}", self.font_medium, score_color, 360, 80, center=False)
 
     def draw_lives(self):
         """Draw lives with clean indicators."""
-        panel_rect = pygame.Rect(550, 390, 800, 110)
-
-        color = ACCENT_SUCCESS if self.tries > 2 else ACCENT_DANGER
-        self.draw_modern_panel(panel_rect, BG_MID, color, 2)
+        color = ACCENT_SUCCESS if self.state.tries > 2 else ACCENT_DANGER
+        self.draw_modern_panel(LIVES_RECT, BG_MID, color, 2)
 
         self.draw_text("LIVES", self.font_medium, color, 590, 430, center=False)
 
         # Simple circle indicators
         start_x = 730
-        for i in range(6):
+        for i in range(MAX_TRIES):
             x = start_x + i * 70
             y = 445
 
-            if i < self.tries:
+            if i < self.state.tries:
                 # Filled circle
                 pygame.draw.circle(self.screen, color, (x, y), 16)
             else:
@@ -298,22 +372,20 @@ class HangmanGame:
 
     def draw_guessed_letters(self):
         """Draw guessed letters panel."""
-        panel_rect = pygame.Rect(550, 530, 800, 100)
-        self.draw_modern_panel(panel_rect, BG_MID)
+        self.draw_modern_panel(GUESSED_RECT, BG_MID)
 
         self.draw_text("GUESSED", self.font_medium, LIGHT_GRAY, 590, 565, center=False)
+        self.draw_text(self.guessed_text(), self.font_small, WHITE, 950, 580)
 
-        if self.guessed_letters:
-            letters = "  ".join(sorted(self.guessed_letters))
-        else:
-            letters = "None"
-
-        self.draw_text(letters, self.font_small, WHITE, 950, 580)
+    def guessed_text(self):
+        """Return the guessed letters line."""
+        if self.state.guessed_letters:
+            return "  ".join(self.state.guessed_letters)
+        return "None"
 
     def draw_message(self):
         """Draw message."""
-        panel_rect = pygame.Rect(550, 660, 800, 90)
-        self.draw_modern_panel(panel_rect, BG_MID)
+        self.draw_modern_panel(MESSAGE_RECT, BG_MID)
 
         self.draw_text(self.message, self.font_small, self.message_color, 950, 705)
 
@@ -330,133 +402,177 @@ class HangmanGame:
     def draw_game_over(self):
         """Draw clean game over screen."""
         # Overlay
-        overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 220))
-        self.screen.blit(overlay, (0, 0))
+        self.screen.blit(self.overlay, (0, 0))
 
         # Panel
         panel_rect = pygame.Rect(350, 280, 700, 380)
         self.draw_modern_panel(panel_rect, BG_DARK,
-                             ACCENT_SUCCESS if self.won else ACCENT_DANGER, 3)
+                             ACCENT_SUCCESS if self.state.won else ACCENT_DANGER, 3)
 
-        if self.won:
+        if self.state.won:
             # Victory
             self.draw_text("VICTORY!", self.font_massive, ACCENT_SUCCESS, WIDTH // 2, 370)
 
-            message = f"Word: {self.word}"
+            message = f"Word: {self.state.word}"
             self.draw_text(message, self.font_medium, WHITE, WIDTH // 2, 470)
 
-            bonus = self.tries * 100
+            bonus = self.state.bonus
             bonus_text = f"+{bonus} Points"
             self.draw_text(bonus_text, self.font_small, GOLD, WIDTH // 2, 530)
         else:
             # Defeat
             self.draw_text("GAME OVER", self.font_massive, ACCENT_DANGER, WIDTH // 2, 370)
 
-            message = f"Word was: {self.word}"
+            message = f"Word was: {self.state.word}"
             self.draw_text(message, self.font_medium, WHITE, WIDTH // 2, 480)
 
         # Instructions
         self.draw_text("Press SPACE to play again", self.font_small, LIGHT_GRAY, WIDTH // 2, 600)
 
     def handle_guess(self, letter):
-        """Handle letter guess."""
-        if self.game_over:
-            return
+        """Apply a guess to the state and play its effects."""
+        outcome, positions = self.state.guess(letter)
 
-        letter = letter.upper()
-
-        if not letter.isalpha() or len(letter) != 1:
-            return
-
-        if letter in self.guessed_letters:
+        if outcome == REPEAT:
             self.message = "Already guessed!"
             self.message_color = ACCENT_WARNING
             self.shake_intensity = 5
             return
 
-        self.guessed_letters.add(letter)
-
-        if letter in self.word:
+        if outcome == HIT:
             # Correct
             self.message = "Good guess!"
             self.message_color = ACCENT_SUCCESS
 
-            for i, char in enumerate(self.word):
-                if char == letter:
-                    self.word_display[i] = letter
-                    self.letter_reveal_timers[i] = 0
+            for i in positions:
+                self.letter_reveal_timers[i] = 0
 
-                    # Subtle particles
-                    x = 550 + (800 // 2) + (i - len(self.word) // 2) * 83
-                    y = 305
-                    self.create_particles(x, y, ACCENT_SUCCESS, 10)
-
-            if "_" not in self.word_display:
-                self.game_over = True
-                self.won = True
-                self.streak += 1
-                self.best_streak = max(self.best_streak, self.streak)
-
-                bonus = self.tries * 100
-                self.score += bonus
+                # Subtle particles
+                x = 550 + (800 // 2) + (i - len(self.state.word) // 2) * 83
+                y = 305
+                self.create_particles(x, y, ACCENT_SUCCESS, 10)
 
+            if self.state.won:
                 # Victory particles
-                for _ in range(50):
-                    x = random.randint(0, WIDTH)
-                    y = random.randint(0, HEIGHT)
+                for _ in range(self.quality["victory_bursts"]):
+                    x = self.rng.randint(0, WIDTH)
+                    y = self.rng.randint(0, HEIGHT)
                     self.create_particles(x, y, ACCENT_SUCCESS, 3)
-        else:
+        elif outcome == MISS:
             # Wrong
             self.message = "Wrong guess!"
             self.message_color = ACCENT_DANGER
-            self.tries -= 1
             self.shake_intensity = 8
 
             # Red particles
             self.create_particles(250, 400, ACCENT_DANGER, 15)
+        else:
+            return
+
+        # Narrow the hint candidates by this guess only
+        self.solver.update(self.state.word_display, self.state.guessed_letters)
 
-            if self.tries <= 0:
-                self.game_over = True
-                self.won = False
-                self.word_display = list(self.word)
-                self.streak = 0
+    def show_hint(self):
+        """Suggest the letter found in the most words that still fit."""
+        if self.state.game_over:
+            return
+        letter = self.solver.best_letter()
+        if letter is None:
+            return
+        left = len(self.solver)
+        self.message = f"Hint: try {letter.upper()} ({left} {'word fits' if left == 1 else 'words fit'})"
+        self.message_color = ACCENT_PURPLE
 
     def update_particles(self):
         """Update particles."""
-        for particle in self.particles[:]:
-            particle.update()
-            if particle.is_dead():
-                self.particles.remove(particle)
+        self.particles.update()
 
     def draw_particles(self):
         """Draw all particles."""
-        for particle in self.particles:
-            particle.draw(self.screen)
-
-    def draw(self):
-        """Main draw function."""
-        self.screen.fill(BG_DARK)
-
-        self.draw_title()
-        self.draw_stats_panel()
-        self.draw_word()
-        self.draw_lives()
-        self.draw_guessed_letters()
-        self.draw_message()
-        self.draw_hangman()
-
-        self.draw_particles()
+        self.particles.draw(self.screen, self.blend)
 
-        if self.game_over:
-            self.draw_game_over()
+    def update_animations(self):
+        """Advance letter reveal and shake animations by one tick."""
+        for key in list(self.letter_reveal_timers.keys()):
+            self.letter_reveal_timers[key] += 1
+            if self.letter_reveal_timers[key] > 15:
+                del self.letter_reveal_timers[key]
 
-        pygame.display.flip()
+        if self.shake_intensity > 0:
+            self.shake_offset = (self.rng.randint(-self.shake_intensity, self.shake_intensity),
+                                 self.rng.randint(-self.shake_intensity, self.shake_intensity))
+            self.shake_intensity -= 1
+        else:
+            self.shake_offset = (0, 0)
         self.animation_timer += 1
 
+    def build_background(self):
+        """Composite the static layer (title, gallows) once."""
+        self.screen.fill(BG_DARK)
+        self.draw_title()
+        self.draw_gallows()
+        self.background = self.screen.copy()
+
+    def layer_state(self):
+        """Return (state key, bounds) for every dynamic layer."""
+        guessed_rect = self.text_cache.render(self.font_small, self.guessed_text(), True, WHITE).get_rect(
+            center=(950, 580))
+        return {
+            "stats": ((self.state.score, self.state.streak, self.state.best_streak), STATS_RECT),
+            "word": ((tuple(self.state.word_display), tuple(self.letter_reveal_timers.items())), WORD_RECT),
+            "lives": (self.state.tries, LIVES_RECT),
+            "guessed": (self.guessed_text(), GUESSED_RECT.union(guessed_rect)),
+            "message": ((self.message, self.message_color), MESSAGE_RECT),
+            "hangman": ((self.state.tries, self.shake_offset), FIGURE_RECT),
+            "game_over": ((self.state.game_over, self.state.won, self.state.word),
+                          SCREEN_RECT if self.state.game_over else None),
+        }
+
+    def redraw_region(self, rect):
+        """Restore the background in rect and redraw everything over it."""
+        self.screen.set_clip(rect)
+        self.screen.blit(self.background, rect, rect)
+        for name, draw_layer in self.layers:
+            bounds = self.layer_bounds.get(name)
+            if bounds is not None and bounds.colliderect(rect):
+                draw_layer()
+            if name == "hangman":
+                # Particles sit above the board but under the game over overlay
+                self.draw_particles()
+        self.screen.set_clip(None)
+
+    def draw(self, blend=1.0):
+        """Main draw function - redraws and presents only what changed."""
+        self.blend = blend
+        dirty = []
+        if self.background is None:
+            self.build_background()
+            dirty.append(SCREEN_RECT)
+
+        for name, (key, bounds) in self.layer_state().items():
+            if name in self.layer_keys and self.layer_keys[name] == key:
+                continue
+            for rect in (self.layer_bounds.get(name), bounds):
+                if rect is not None:
+                    dirty.append(rect)
+            self.layer_keys[name] = key
+            self.layer_bounds[name] = bounds
+
+        particle_bounds = self.particles.bounds(blend)
+        for rect in (self.particle_bounds, particle_bounds):
+            if rect is not None:
+                dirty.append(rect)
+        self.particle_bounds = particle_bounds
+
+        if dirty:
+            dirty = merge_rects([rect.clip(SCREEN_RECT) for rect in dirty])
+            for rect in dirty:
+                self.redraw_region(rect)
+            self.compositor.present(rects=dirty)
+
     def handle_events(self):
         """Handle events."""
-        for event in pygame.event.get():
+        for event in self.input_events():
             if event.type == pygame.QUIT:
                 return False
 
@@ -464,24 +580,96 @@ class HangmanGame:
                 if event.key == pygame.K_ESCAPE:
                     return False
 
-                if self.game_over:
+                if self.state.game_over:
                     if event.key == pygame.K_SPACE:
                         self.reset_game()
+                elif event.key == pygame.K_TAB:
+                    self.show_hint()
                 else:
                     if event.unicode.isalpha():
                         self.handle_guess(event.unicode)
 
         return True
 
-    def run(self):
-        """Main game loop."""
-        running = True
-        while running:
-            self.clock.tick(FPS)
-            running = self.handle_events()
-            self.update_particles()
-            self.draw()
+    def input_events(self):
+        """This tick's input: from the replay, or the event queue (recorded if recording)."""
+        if self.replay:
+            return self.replay.events(self.ticks)
+        events = pygame.event.get()
+        if self.woken_by:
+            events.insert(0, self.woken_by)
+            self.woken_by = None
+        if self.recorder:
+            self.recorder.events(self.ticks, events)
+        return events
+
+    def update(self):
+        """Run one simulation tick; returns False once the player quits."""
+        if self.replay:
+            for tier, _, _ in self.replay.notes(self.ticks, QUALITY):
+                self.apply_quality(QUALITY_TIERS[tier])
+        running = self.handle_events()
+        self.update_particles()
+        self.update_animations()
+        self.ticks += 1
+        return running
+
+    def state_digest(self):
+        """Hash of the whole simulation state; equal after a faithful replay."""
+        state = self.state
+        particles = self.particles
+        n = particles.count
+        return digest(
+            self.ticks, state.word, state.word_display, state.guessed_letters, state.tries,
+            state.score, state.streak, state.best_streak, state.game_over, state.won,
+            self.message, self.message_color, self.letter_reveal_timers, self.shake_intensity,
+            self.shake_offset, self.animation_timer, self.quality["name"], self.rng.getstate(),
+            *(getattr(particles, name)[:n].tobytes() for name in ("pos", "vel", "life", "size", "color")),
+            particles.rng.bit_generator.state,
+        )
+
+    def render(self, blend=1.0):
+        """Draw the frame, blend of a tick past the last update."""
+        self.draw(blend)
+
+    def step(self):
+        """Run one tick and draw it; returns False once the player quits."""
+        running = self.update()
+        self.render()
+        return running
+
+    def is_idle(self):
+        """True when nothing on screen is moving: no particles, reveals or shake."""
+        return (not len(self.particles) and not self.letter_reveal_timers
+                and not self.shake_intensity and self.shake_offset == (0, 0))
+
+    def wait_for_input(self, timeout_ms):
+        """Block until an event arrives or timeout_ms passes; True for an event."""
+        event = pygame.event.wait(timeout_ms)
+        # Restart the frame clock so the sleep is not counted as frame work
+        self.clock.tick()
+        if event.type == pygame.NOEVENT:
+            return False
+        self.woken_by = event
+        return True
 
+    def pace(self):
+        """Cap the frame rate and feed the quality governor."""
+        self.clock.tick(FPS)
+        self.governor.update(self.clock.get_rawtime())
+
+    def run(self, stats=False):
+        """Main game loop; stats prints the session's diagnostics to stderr."""
+        self.loop.run()
+
+        if self.recorder:
+            self.recorder.close(self.ticks, self.state_digest())
+        if stats:
+            print(self.governor.summary(), file=sys.stderr)
+            print(f"loop: {self.loop}", file=sys.stderr)
+            if self.recorder:
+                print(f"recorded {self.recorder.records} records over {self.ticks} ticks, seed {self.seed}",
+                      file=sys.stderr)
         pygame.quit()
         sys.exit()
 
@@ -489,5 +677,28 @@ class HangmanGame:
 # Run Game
 # ---------------------------
 if __name__ == "__main__":
-    game = HangmanGame()
-    game.run()
+    parser = argparse.ArgumentParser(description="Hangman")
+    parser.add_argument("pack", nargs="?", default=WORD_PACK, help="word list in words/<pack>.txt")
+    parser.add_argument("--quality", default="auto",
+                        choices=["auto"] + [settings["name"] for settings in QUALITY_TIERS],
+                        help="effects tier; auto adapts to the frame rate")
+    parser.add_argument("--seed", type=int, help="seed for words and effects (random if omitted)")
+    parser.add_argument("--record", metavar="PATH", help="record the session for common/replay.py")
+    parser.add_argument("--stats", action="store_true",
+                        help="print frame, quality and loop diagnostics to stderr on exit")
+    profiler.add_arguments(parser)
+    args = parser.parse_args()
+    # Instrument the classes before the game binds their methods
+    frame_profiler = profiler.from_args(args, HangmanGame, ParticleSystem, Compositor, GameLoop)
+    try:
+        game = HangmanGame(seed=args.seed, pack=args.pack, quality=args.quality, record=args.record)
+    except FileNotFoundError as exc:
+        parser.error(f"no word pack {args.pack!r}: {exc.filename} does not exist")
+    except ValueError as exc:
+        parser.error(str(exc))
+    if frame_profiler:
+        frame_profiler.attach(game.compositor)
+    try:
+        game.run(stats=args.stats)
+    finally:
+        profiler.finish(frame_profiler, args)
@@ -0,0 +1,150 @@
+"""
+Hangman game state.
+
+The rules and score keeping of one Hangman session, with no pygame: the
+word, the guesses, tries left, streaks and score. HangmanGame is a view
+over one of these; a server can hold many of them in one process.
+
+A session is kept small: __slots__, guesses as a 26-bit mask, and the
+letter -> positions map of each word built once and shared by every session
+playing that word, so a guess costs O(occurrences of the letter). A
+session round-trips through snapshot()/restore() as about 16 bytes plus
+the word.
+"""
+
+import string
+import struct
+import sys
+from functools import lru_cache
+
+MAX_TRIES = 6
+WIN_BONUS = 100  # points per try left when the word is solved
+
+# Outcomes of HangmanState.guess
+HIT = "hit"
+MISS = "miss"
+REPEAT = "repeat"
+INVALID = "invalid"
+OVER = "over"
+
+# version, tries, flags, guessed mask, score, streak, best streak, word length
+SNAPSHOT = struct.Struct("<BBBIIHHB")
+SNAPSHOT_VERSION = 1
+GAME_OVER_FLAG = 1
+WON_FLAG = 2
+
+# Either case of a letter -> (uppercase letter, its bit in the guessed mask)
+LETTER_BITS = {}
+for i, char in enumerate(string.ascii_uppercase):
+    LETTER_BITS[char] = LETTER_BITS[char.lower()] = (char, 1 << i)
+
+
+@lru_cache(maxsize=65536)
+def letter_positions(word):
+    """Map each letter of word to the tuple of positions it occupies."""
+    positions = {}
+    for i, char in enumerate(word):
+        positions.setdefault(char, []).append(i)
+    return {char: tuple(found) for char, found in positions.items()}
+
+
+class HangmanState:
+    """One Hangman session: the current word plus the running score."""
+
+    __slots__ = ("word", "positions", "word_display", "hidden", "guessed", "guessed_letters",
+                 "tries", "game_over", "won", "score", "streak", "best_streak")
+
+    def __init__(self, word=""):
+        self.score = 0
+        self.streak = 0
+        self.best_streak = 0
+        self.new_word(word)
+
+    def new_word(self, word):
+        """Start a round on word, keeping score and streaks."""
+        self.word = sys.intern(word.upper())
+        self.positions = letter_positions(self.word)
+        self.word_display = ["_"] * len(self.word)
+        self.hidden = len(self.word)
+        self.guessed = 0            # bit i set once letter i has been guessed
+        self.guessed_letters = ""   # the same letters, alphabetical
+        self.tries = MAX_TRIES
+        self.game_over = False
+        self.won = False
+
+    @property
+    def bonus(self):
+        """Points a win with the tries left is worth."""
+        return self.tries * WIN_BONUS
+
+    def guess(self, letter):
+        """Apply one guess; returns (outcome, positions revealed)."""
+        if self.game_over:
+            return OVER, ()
+        entry = LETTER_BITS.get(letter)
+        if entry is None:
+            return INVALID, ()
+        letter, bit = entry
+        if self.guessed & bit:
+            return REPEAT, ()
+        self.guessed |= bit
+        self.guessed_letters = "".join(sorted(self.guessed_letters + letter))
+
+        found = self.positions.get(letter)
+        if found:
+            display = self.word_display
+            for i in found:
+                display[i] = letter
+            self.hidden -= len(found)
+            if self.hidden == 0:
+                self.game_over = True
+                self.won = True
+                self.streak += 1
+                self.best_streak = max(self.best_streak, self.streak)
+                self.score += self.bonus
+            return HIT, found
+
+        self.tries -= 1
+        if self.tries <= 0:
+            self.game_over = True
+            self.won = False
+            self.word_display = list(self.word)
+            self.streak = 0
+        return MISS, ()
+
+    # ---------------------------
+    # Snapshots
+    # ---------------------------
+    def snapshot(self):
+        """Compact bytes from which restore() rebuilds this session."""
+        flags = (GAME_OVER_FLAG if self.game_over else 0) | (WON_FLAG if self.won else 0)
+        return SNAPSHOT.pack(SNAPSHOT_VERSION, self.tries, flags, self.guessed, self.score,
+                             min(self.streak, 0xFFFF), min(self.best_streak, 0xFFFF),
+                             len(self.word)) + self.word.encode("ascii")
+
+    @classmethod
+    def restore(cls, data):
+        """Rebuild a session from snapshot() bytes."""
+        version, tries, flags, guessed, score, streak, best_streak, length = SNAPSHOT.unpack_from(data)
+        if version != SNAPSHOT_VERSION:
+            raise ValueError(f"unsupported snapshot version {version}")
+        word = bytes(data[SNAPSHOT.size:SNAPSHOT.size + length]).decode("ascii")
+
+        state = cls.__new__(cls)
+        state.new_word(word)
+        state.score = score
+        state.streak = streak
+        state.best_streak = best_streak
+        state.guessed = guessed
+        state.guessed_letters = "".join(chr(65 + i) for i in range(26) if guessed >> i & 1)
+        state.tries = tries
+        state.game_over = bool(flags & GAME_OVER_FLAG)
+        state.won = bool(flags & WON_FLAG)
+        for char, found in state.positions.items():
+            if guessed >> (ord(char) - 65) & 1:
+                for i in found:
+                    state.word_display[i] = char
+                state.hidden -= len(found)
+        if state.game_over and not state.won:
+            state.word_display = list(state.word)
+        return state
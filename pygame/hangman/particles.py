@@ -0,0 +1,168 @@
+"""
+Particle system for Hangman visual effects.
+
+Particles live in structure-of-arrays NumPy buffers (position, velocity,
+lifetime, size, color) and the whole set is advanced in one vectorized step
+per tick. Dead particles are dropped by compacting the live ones to the
+front of the buffers, and drawing reuses pre-rendered circle sprites instead
+of allocating a Surface per particle.
+"""
+
+import math
+
+import numpy as np
+import pygame
+
+# ---------------------------
+# Configuration
+# ---------------------------
+LIFETIME = 40
+DRAG = 0.96
+GRAVITY = 0.15
+MIN_SIZE = 3
+MAX_SIZE = 7
+
+
+class ParticleSystem:
+    """Vectorized pool of fading circle particles."""
+
+    def __init__(self, capacity=1024, seed=None):
+        self.capacity = capacity
+        self.count = 0
+        self.pos = np.zeros((capacity, 2), dtype=np.float64)
+        self.vel = np.zeros((capacity, 2), dtype=np.float64)
+        self.life = np.zeros(capacity, dtype=np.int32)
+        self.size = np.zeros(capacity, dtype=np.int32)
+        self.color = np.zeros(capacity, dtype=np.int32)
+        self.rng = np.random.default_rng(seed)
+        self.max_count = None  # live particle cap set by the quality tier, None for none
+
+        # Sprites are indexed by (color, size, lifetime) so every frame of a
+        # particle's fade is a plain blit of a surface built once.
+        self.palette = []
+        self.palette_index = {}
+        self.sprites = []
+        self.radius = np.zeros(0, dtype=np.int32)
+
+    def __len__(self):
+        return self.count
+
+    def _grow(self, needed):
+        """Grow the buffers to hold at least `needed` particles."""
+        capacity = self.capacity
+        while capacity < needed:
+            capacity *= 2
+        for name in ("pos", "vel", "life", "size", "color"):
+            old = getattr(self, name)
+            new = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+        self.capacity = capacity
+
+    def _color_id(self, color):
+        """Return the palette index for a color, pre-rendering its sprites."""
+        color = tuple(color)
+        index = self.palette_index.get(color)
+        if index is not None:
+            return index
+
+        index = len(self.palette)
+        self.palette.append(color)
+        self.palette_index[color] = index
+
+        radius = []
+        for base_size in range(MAX_SIZE + 1):
+            for life in range(LIFETIME + 1):
+                alpha = int(255 * (life / LIFETIME))
+                size = max(1, int(base_size * (life / LIFETIME)))
+                sprite = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
+                pygame.draw.circle(sprite, (*color, alpha), (size, size), size)
+                self.sprites.append(sprite)
+                radius.append(size)
+        self.radius = np.concatenate([self.radius, np.array(radius, dtype=np.int32)])
+        return index
+
+    def emit(self, x, y, color, count=15):
+        """Spawn `count` particles bursting out of (x, y)."""
+        if self.max_count is not None:
+            count = min(count, self.max_count - self.count)
+        if count <= 0:
+            return
+        start = self.count
+        end = start + count
+        if end > self.capacity:
+            self._grow(end)
+
+        angle = self.rng.uniform(0, 2 * math.pi, count)
+        speed = self.rng.uniform(2, 6, count)
+
+        self.pos[start:end] = (x, y)
+        self.vel[start:end, 0] = np.cos(angle) * speed
+        self.vel[start:end, 1] = np.sin(angle) * speed
+        self.life[start:end] = LIFETIME
+        self.size[start:end] = self.rng.integers(MIN_SIZE, MAX_SIZE + 1, count)
+        self.color[start:end] = self._color_id(color)
+        self.count = end
+
+    def update(self):
+        """Advance every particle one tick and compact out the dead ones."""
+        n = self.count
+        if n == 0:
+            return
+
+        self.pos[:n] += self.vel[:n]
+        self.vel[:n, 0] *= DRAG
+        self.vel[:n, 1] += GRAVITY
+        self.life[:n] -= 1
+
+        alive = self.life[:n] > 0
+        live = int(np.count_nonzero(alive))
+        if live != n:
+            for arr in (self.pos, self.vel, self.life, self.size, self.color):
+                arr[:live] = arr[:n][alive]
+            self.count = live
+
+    def positions(self, blend=1.0):
+        """Live particle positions, blend of the way from the last update to this one."""
+        n = self.count
+        if blend >= 1:
+            return self.pos[:n]
+        # The step that led here moved each particle by its velocity before
+        # drag and gravity were applied, so the previous position is exact
+        step = self.vel[:n].copy()
+        step[:, 0] /= DRAG
+        step[:, 1] -= GRAVITY
+        return self.pos[:n] - step * (1 - blend)
+
+    def draw(self, screen, blend=1.0):
+        """Blit all live particles in a single batched call."""
+        n = self.count
+        if n == 0:
+            return
+
+        keys = (self.color[:n] * (MAX_SIZE + 1) + self.size[:n]) * (LIFETIME + 1) + self.life[:n]
+        radius = self.radius[keys]
+        pos = self.positions(blend)
+        xs = (pos[:, 0] - radius).astype(np.int32).tolist()
+        ys = (pos[:, 1] - radius).astype(np.int32).tolist()
+        sprites = map(self.sprites.__getitem__, keys.tolist())
+        screen.blits(zip(sprites, zip(xs, ys)), doreturn=False)
+
+    def bounds(self, blend=1.0):
+        """Return a Rect covering every live particle as drawn at blend, or None."""
+        n = self.count
+        if n == 0:
+            return None
+
+        pos = self.positions(blend)
+        x = pos[:, 0]
+        y = pos[:, 1]
+        left = int(x.min()) - MAX_SIZE - 1
+        top = int(y.min()) - MAX_SIZE - 1
+        right = int(x.max()) + MAX_SIZE + 1
+        bottom = int(y.max()) + MAX_SIZE + 1
+        return pygame.Rect(left, top, right - left, bottom - top)
+
+    def clear(self):
+        """Remove all particles."""
+        self.count = 0
@@ -0,0 +1,241 @@
+"""
+Hangman self-play simulator
+
+Plays every word of a pack many times with a guessing strategy, headless,
+under the same HangmanState rules the game uses: 6 tries, a repeated guess
+costs nothing, a win scores tries * 100. Words are split into chunks of ids that a
+multiprocessing pool plays in parallel; each chunk returns per-word win and
+wrong-guess counts which are merged into a results file next to the pack
+(``<pack>.stats``). WordStore.open loads that file and its tiers, ranked by
+measured win rate, drive the difficulty filter of word sampling.
+
+Strategies are pluggable: one of the built-in names below, or any
+``module:Class`` whose class takes the WordStore and has new_game(length)
+and guess(pattern, guessed, rng) methods; pattern and guessed are the
+state's uppercase word_display and guessed_letters. Deterministic strategies play a
+word the same way every time, so --games-per-word only matters for random
+ones. The solver strategy knows the whole pack, so it measures how
+ambiguous a word is among its neighbours rather than how hard it is for a
+person; frequency is the default.
+
+Usage:
+    python simulate.py [--pack islamic | --words-file PATH] [--strategy frequency]
+                       [--games-per-word 10] [--workers N] [--chunk 512]
+                       [--seed 1] [--output PATH]
+"""
+
+import argparse
+import importlib
+import multiprocessing
+import os
+import random
+import string
+import time
+
+import numpy as np
+
+from hangman_state import MAX_TRIES, HangmanState
+from solver import HangmanSolver
+from word_store import LETTER_FREQUENCY, TIERS, WordStore, pack_path, write_stats
+
+ALPHABET = string.ascii_uppercase
+MAX_GUESSES = 200  # safety net for strategies that keep repeating themselves
+
+
+# ---------------------------
+# Strategies
+# ---------------------------
+class FrequencyStrategy:
+    """Guess letters in English frequency order, ignoring the word."""
+
+    def __init__(self, store):
+        self.order = sorted(ALPHABET, key=lambda char: -LETTER_FREQUENCY[char.lower()])
+
+    def new_game(self, length):
+        pass
+
+    def guess(self, pattern, guessed, rng):
+        for letter in self.order:
+            if letter not in guessed:
+                return letter
+        return None
+
+
+class RandomStrategy:
+    """Guess uniformly at random, repeats included, like a careless player."""
+
+    def __init__(self, store):
+        pass
+
+    def new_game(self, length):
+        pass
+
+    def guess(self, pattern, guessed, rng):
+        return rng.choice(ALPHABET)
+
+
+class SolverStrategy:
+    """Guess the letter in the most dictionary words still consistent."""
+
+    def __init__(self, store):
+        self.solver = HangmanSolver(store)
+
+    def new_game(self, length):
+        self.solver.reset(length)
+
+    def guess(self, pattern, guessed, rng):
+        self.solver.update(pattern, guessed)
+        letter = self.solver.best_letter()
+        return letter and letter.upper()
+
+
+STRATEGIES = {
+    "frequency": FrequencyStrategy,
+    "random": RandomStrategy,
+    "solver": SolverStrategy,
+}
+
+
+def load_strategy(spec):
+    """Strategy class from a built-in name or a module:Class path."""
+    if spec in STRATEGIES:
+        return STRATEGIES[spec]
+    module, _, name = spec.partition(":")
+    if not name:
+        raise ValueError(f"unknown strategy {spec!r}; use one of {sorted(STRATEGIES)} or module:Class")
+    return getattr(importlib.import_module(module), name)
+
+
+# ---------------------------
+# Game Rules
+# ---------------------------
+def play_game(state, word, strategy, rng):
+    """Play one round of word on state; returns (won, wrong guesses, score)."""
+    score = state.score
+    state.new_word(word)
+    strategy.new_game(len(word))
+    for _ in range(MAX_GUESSES):
+        letter = strategy.guess(state.word_display, state.guessed_letters, rng)
+        if letter is None:
+            break
+        state.guess(letter)
+        if state.game_over:
+            break
+    return state.won, MAX_TRIES - state.tries, state.score - score
+
+
+# ---------------------------
+# Workers
+# ---------------------------
+worker = {}
+
+
+def init_worker(path, strategy_spec):
+    """Open the pack (a cheap memory map) and the strategy once per process."""
+    store = WordStore.open(path)
+    worker["store"] = store
+    worker["strategy"] = load_strategy(strategy_spec)(store)
+
+
+def run_chunk(chunk):
+    """Play every word with an id in [first, end); returns per-word counts."""
+    first, end, games_per_word, seed = chunk
+    store = worker["store"]
+    strategy = worker["strategy"]
+    rng = random.Random(seed)
+    state = HangmanState()
+    wins = np.zeros(end - first, dtype=np.uint32)
+    wrong = np.zeros(end - first, dtype=np.uint32)
+    score = 0
+    for offset in range(end - first):
+        word = store[first + offset]
+        for _ in range(games_per_word):
+            won, misses, points = play_game(state, word, strategy, rng)
+            wins[offset] += won
+            wrong[offset] += misses
+            score += points
+    return first, wins, wrong, score
+
+
+def simulate(path, strategy_spec="frequency", games_per_word=10, workers=None, chunk_size=512, seed=1):
+    """Play the pack; returns (games, wins, wrong, total score) per word id."""
+    store = WordStore.open(path)  # builds the index once, before the workers start
+    count = len(store)
+    store.close()
+    chunks = [(first, min(first + chunk_size, count), games_per_word, seed * 1000003 + first)
+              for first in range(0, count, chunk_size)]
+
+    games = np.full(count, games_per_word, dtype=np.uint32)
+    wins = np.zeros(count, dtype=np.uint32)
+    wrong = np.zeros(count, dtype=np.uint32)
+    score = 0
+
+    def merge(result):
+        nonlocal score
+        first, chunk_wins, chunk_wrong, chunk_score = result
+        wins[first:first + len(chunk_wins)] = chunk_wins
+        wrong[first:first + len(chunk_wrong)] = chunk_wrong
+        score += chunk_score
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        init_worker(path, strategy_spec)
+        for chunk in chunks:
+            merge(run_chunk(chunk))
+        # The strategy may hold views into the store; drop it before unmapping
+        store = worker["store"]
+        worker.clear()
+        store.close()
+    else:
+        with multiprocessing.Pool(workers, init_worker, (path, strategy_spec)) as pool:
+            for result in pool.imap_unordered(run_chunk, chunks):
+                merge(result)
+    return games, wins, wrong, score
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hangman self-play simulator")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--pack", default="islamic", help="bundled word pack name")
+    source.add_argument("--words-file", help="path of a word pack text file")
+    parser.add_argument("--strategy", default="frequency",
+                        help=f"one of {', '.join(STRATEGIES)} or module:Class")
+    parser.add_argument("--games-per-word", type=int, default=10)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk", type=int, default=512, help="words per work unit")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="results file (default: <pack>.stats)")
+    args = parser.parse_args()
+
+    path = args.words_file or pack_path(args.pack)
+    load_strategy(args.strategy)  # fail early on a bad spec
+
+    start = time.perf_counter()
+    games, wins, wrong, score = simulate(path, args.strategy, args.games_per_word, args.workers,
+                                         args.chunk, args.seed)
+    elapsed = time.perf_counter() - start
+
+    output = args.output or path + ".stats"
+    store = WordStore.open(path)
+    write_stats(output, store, games, wins, wrong)
+    store.close()
+
+    total = int(games.sum(dtype=np.uint64))
+    print(f"{total:,} games of {len(games):,} words in {elapsed:.1f} s "
+          f"({total / elapsed:,.0f} games/s) with the {args.strategy} strategy")
+    print(f"won {wins.sum() / total:.1%}, {wrong.sum() / total:.2f} wrong guesses "
+          f"and {score / total:.0f} points per game")
+
+    # Reopen the way the game does, so the new tiers are what gets reported
+    store = WordStore.open(path, stats_path=output)
+    counts = np.bincount(store.tiers, minlength=TIERS)
+    print("tiers (easy to hard): " + ", ".join(f"{n:,}" for n in counts))
+    rates = wins / np.maximum(games, 1)
+    hardest = np.lexsort((-wrong.astype(np.int64), rates))[:5]
+    print("hardest: " + ", ".join(f"{store[int(i)]} ({rates[i]:.0%})" for i in hardest))
+    print(f"wrote {output}")
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
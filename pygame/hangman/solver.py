@@ -0,0 +1,179 @@
+"""
+Hangman solver and hint engine.
+
+Given the revealed pattern and the guessed letters, the best next guess is
+the unguessed letter found in the most dictionary words still consistent
+with what has been seen. The candidates are tracked per game and narrowed
+after every guess rather than rescanned:
+
+    hit   rows of the (length, position, letter) inverted index for the
+          first revealed position, intersected with the current candidates,
+          then checked for the letter at exactly the revealed positions
+    miss  one vectorized test of the candidates' 26-bit letter masks
+
+Letter counts come from byte histograms of the candidates' masks. The
+inverted index is built once per word length, when a game of that length
+starts, so each guess stays well under a millisecond on 300k-word packs
+(see bench_solver.py).
+"""
+
+import numpy as np
+
+from word_store import LETTER_FREQUENCY
+
+ALPHABET = "abcdefghijklmnopqrstuvwxyz"
+LETTERS = frozenset(ALPHABET)
+MAX_MISSES = 6
+
+# Tie-break between letters hitting as many candidates: the more common one
+TIE_BREAK = np.array([LETTER_FREQUENCY[char] / 1000 for char in ALPHABET])
+
+# BYTE_BITS[v, i] is bit i of the byte value v
+BYTE_BITS = (np.arange(256)[:, None] >> np.arange(8)) & 1
+
+
+def letter_counts(masks):
+    """How many of the masks contain each letter, as a length-26 array.
+
+    Each byte of the masks is histogrammed with bincount and the histograms
+    are turned into per-bit counts with a small table product, which is far
+    cheaper than unpacking every mask into bits.
+    """
+    counts = np.zeros(32, dtype=np.int64)
+    if len(masks) == 0:
+        return counts[:26]
+    masks = np.ascontiguousarray(masks, dtype=np.uint32).view(np.uint8).reshape(-1, 4)
+    for byte in range(4):
+        counts[byte * 8:byte * 8 + 8] = np.bincount(masks[:, byte], minlength=256) @ BYTE_BITS
+    return counts[:26]
+
+
+class HangmanSolver:
+    """Tracks the words still consistent with one game and picks guesses."""
+
+    def __init__(self, store):
+        self.store = store
+        self.indexes = {}
+        self.openings = {}
+        self.reset(0)
+
+    def reset(self, length):
+        """Start tracking a new word of the given length."""
+        self.length = length
+        self.letters = self.store.bucket_array(length)
+        first, end = self.store.id_range(length, length) if length else (0, 0)
+        self.first = first
+        self.masks = self.store.masks[first:end]
+        self.candidates = None  # None means the whole bucket
+        self.guessed = set()
+        if length and length not in self.indexes:
+            self.indexes[length] = self.build_index(self.letters)
+            self.openings[length] = letter_counts(self.masks)
+
+    def build_index(self, letters):
+        """Per position, bucket rows sorted by letter plus where each letter starts."""
+        index = []
+        codes = np.arange(ord("a"), ord("z") + 2)
+        for position in range(letters.shape[1]):
+            column = letters[:, position]
+            order = np.argsort(column, kind="stable").astype(np.int32)
+            starts = np.searchsorted(column[order], codes)
+            index.append((order, starts))
+        return index
+
+    def postings(self, position, letter):
+        """Sorted rows of the words with letter at position."""
+        order, starts = self.indexes[self.length][position]
+        i = ord(letter) - ord("a")
+        return order[starts[i]:starts[i + 1]]
+
+    def __len__(self):
+        return len(self.letters) if self.candidates is None else len(self.candidates)
+
+    # ---------------------------
+    # Narrowing
+    # ---------------------------
+    def update(self, pattern, guessed):
+        """Narrow the candidates by every guess not seen yet.
+
+        pattern is the revealed word ("_" for hidden letters) and guessed
+        the letters tried so far, in either case, as HangmanGame keeps them.
+        Guesses outside a-z are skipped: no word in a pack contains them.
+        """
+        pattern = [char.lower() for char in pattern]
+        guessed = {letter.lower() for letter in guessed} & LETTERS
+        if len(pattern) != self.length or not self.guessed <= guessed:
+            self.reset(len(pattern))
+        for letter in sorted(guessed - self.guessed):
+            self.apply(letter, [i for i, char in enumerate(pattern) if char == letter])
+        self.guessed = guessed
+
+    def apply(self, letter, positions):
+        """Keep the words with letter at exactly these positions (none = a miss)."""
+        if not self.length:
+            return
+        code = ord(letter)
+        candidates = self.candidates
+        if positions:
+            rows = self.postings(positions[0], letter)
+            if candidates is not None:
+                rows = np.intersect1d(rows, candidates, assume_unique=True)
+            if len(rows):
+                hits = self.letters[rows] == code
+                keep = hits.sum(axis=1) == len(positions)
+                for position in positions[1:]:
+                    keep &= hits[:, position]
+                rows = rows[keep]
+        else:
+            if candidates is None:
+                candidates = np.arange(len(self.masks), dtype=np.int32)
+            bit = np.uint32(1 << (code - ord("a")))
+            rows = candidates[(self.masks[candidates] & bit) == 0]
+        self.candidates = rows
+
+    # ---------------------------
+    # Answers
+    # ---------------------------
+    def best_letter(self):
+        """The unguessed letter in the most candidates, or None if all are used.
+
+        If no dictionary word fits (the secret is not in the pack) the most
+        common unguessed letter is returned.
+        """
+        if self.candidates is None:
+            counts = self.openings.get(self.length, np.zeros(26, dtype=np.int64))
+        else:
+            counts = letter_counts(self.masks[self.candidates])
+        scores = counts + TIE_BREAK
+        for letter in self.guessed:
+            scores[ord(letter) - ord("a")] = -1
+        best = int(np.argmax(scores))
+        if scores[best] < 0:
+            return None
+        return ALPHABET[best]
+
+    def candidate_words(self, limit=10):
+        """Up to limit of the words still consistent with the game."""
+        rows = range(len(self.letters)) if self.candidates is None else self.candidates
+        return [self.store[self.first + int(row)] for row in rows[:limit]]
+
+
+def solve(solver, word, max_misses=MAX_MISSES):
+    """Play word with the solver; returns (won, guesses, misses)."""
+    word = word.lower()
+    solver.reset(len(word))
+    pattern = ["_"] * len(word)
+    guessed = set()
+    misses = 0
+    while "_" in pattern and misses < max_misses:
+        letter = solver.best_letter()
+        if letter is None:
+            break
+        guessed.add(letter)
+        positions = [i for i, char in enumerate(word) if char == letter]
+        for i in positions:
+            pattern[i] = letter
+        if not positions:
+            misses += 1
+        solver.update(pattern, guessed)
+    return "_" not in pattern, len(guessed), misses
@@ -0,0 +1,402 @@
+"""
+File-backed word store for Hangman.
+
+A word pack is a plain text file with one word per line; lines starting with
+# are comments. On first use it is compiled into a binary index next to it
+(``<pack>.idx``) which later launches memory-map instead of re-reading the
+text, so opening even a 500k-word pack costs a header read and a few NumPy
+views.
+
+Index layout (little endian):
+
+    header      magic, version, source size, source mtime, word count,
+                longest word length
+    buckets     one (byte offset, first id, count) entry per word length
+    masks       uint32 per word, bit i set if the word contains letter i
+    tiers       uint8 per word, difficulty tier (0 easy .. TIERS - 1 hard)
+    words       for each length, its words as sorted fixed-width records
+
+Words are numbered in bucket order (by length, then alphabetically), so any
+length range is one contiguous id range and filtered sampling is a
+vectorized test over a slice of the mask and tier arrays.
+
+Tiers start out from a letter-frequency guess. Once simulate.py has played
+the pack, its results file (``<pack>.stats``: games, wins and wrong guesses
+per word id, plus tiers ranked by measured win rate) is memory-mapped as
+well and its tiers replace the guessed ones.
+"""
+
+import mmap
+import os
+import random
+import string
+import struct
+from bisect import bisect_left
+
+import numpy as np
+
+# ---------------------------
+# Configuration
+# ---------------------------
+WORDS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "words")
+MAGIC = b"HMWS"
+VERSION = 1
+HEADER = struct.Struct("<4sIQQII")
+BUCKET = struct.Struct("<QII")
+TIERS = 3
+STATS_MAGIC = b"HMSS"
+STATS_HEADER = struct.Struct("<4sIQQIQ")
+
+# Relative frequency of each letter in English text, used to rank how easy a
+# word is to guess before any play data exists
+LETTER_FREQUENCY = dict(zip(string.ascii_lowercase, (
+    8.2, 1.5, 2.8, 4.3, 12.7, 2.2, 2.0, 6.1, 7.0, 0.15, 0.77, 4.0, 2.4,
+    6.7, 7.5, 1.9, 0.095, 6.0, 6.3, 9.1, 2.8, 0.98, 2.4, 0.15, 2.0, 0.074)))
+
+
+def letter_mask(letters):
+    """26-bit mask with bit i set for every letter i (a = 0) in letters."""
+    mask = 0
+    for char in letters.lower():
+        if "a" <= char <= "z":
+            mask |= 1 << (ord(char) - 97)
+    return mask
+
+
+def pack_path(name):
+    """Path of a bundled word pack by name."""
+    return os.path.join(WORDS_DIR, f"{name}.txt")
+
+
+def available_packs():
+    """Names of the bundled word packs."""
+    return sorted(name[:-4] for name in os.listdir(WORDS_DIR) if name.endswith(".txt"))
+
+
+# ---------------------------
+# Index Building
+# ---------------------------
+def read_words(path):
+    """Unique lowercase a-z words from a text file, sorted by (length, word)."""
+    words = set()
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            word = line.strip().lower()
+            if word and not word.startswith("#") and word.isascii() and word.isalpha():
+                words.add(word)
+    return sorted(words, key=lambda word: (len(word), word))
+
+
+def difficulty_scores(words):
+    """Higher is harder: few distinct letters, and rare ones, are hard to hit."""
+    scores = np.empty(len(words), dtype=np.float64)
+    for i, word in enumerate(words):
+        distinct = set(word)
+        scores[i] = -sum(LETTER_FREQUENCY[char] for char in distinct) / len(word)
+    return scores
+
+
+def assign_tiers(scores):
+    """Split scores into TIERS equally sized difficulty tiers."""
+    if len(scores) == 0:
+        return np.zeros(0, dtype=np.uint8)
+    order = np.argsort(scores, kind="stable")
+    tiers = np.empty(len(scores), dtype=np.uint8)
+    tiers[order] = np.arange(len(scores)) * TIERS // len(scores)
+    return tiers
+
+
+def build_index(words, source_size=0, source_mtime=0, tiers=None):
+    """Serialize sorted words into the binary index format."""
+    max_length = len(words[-1]) if words else 0
+    counts = [0] * (max_length + 1)
+    for word in words:
+        counts[len(word)] += 1
+
+    masks = np.array([letter_mask(word) for word in words], dtype=np.uint32)
+    if tiers is None:
+        tiers = assign_tiers(difficulty_scores(words))
+
+    buckets = []
+    offset = 0
+    first = 0
+    for length, count in enumerate(counts):
+        buckets.append(BUCKET.pack(offset, first, count))
+        offset += length * count
+        first += count
+
+    return b"".join([
+        HEADER.pack(MAGIC, VERSION, source_size, source_mtime, len(words), max_length),
+        *buckets,
+        masks.tobytes(),
+        np.asarray(tiers, dtype=np.uint8).tobytes(),
+        "".join(words).encode("ascii"),
+    ])
+
+
+# ---------------------------
+# Play Statistics
+# ---------------------------
+def tiers_from_stats(games, wins, wrong, fallback):
+    """Rank played words into TIERS by win rate, then by average wrong guesses,
+    then by fallback tier.
+
+    Words without games keep their fallback tier, and so do all words if
+    the results cannot tell any two played words apart.
+    """
+    tiers = np.array(fallback, dtype=np.uint8)
+    played = np.flatnonzero(games)
+    if len(played) == 0:
+        return tiers
+    win_rate = wins[played] / games[played]
+    average_wrong = wrong[played] / games[played]
+    if np.ptp(win_rate) == 0 and np.ptp(average_wrong) == 0:
+        return tiers
+    # lexsort sorts by the last key first: easiest (high win rate, few misses) first
+    order = np.lexsort((tiers[played], average_wrong, -win_rate))
+    tiers[played[order]] = np.arange(len(played)) * TIERS // len(played)
+    return tiers
+
+
+def write_stats(path, store, games, wins, wrong):
+    """Write per-word results for store, with tiers derived from them."""
+    games = np.asarray(games, dtype=np.uint32)
+    wins = np.asarray(wins, dtype=np.uint32)
+    wrong = np.asarray(wrong, dtype=np.uint32)
+    tiers = tiers_from_stats(games, wins, wrong, store.frequency_tiers)
+    # Written aside and renamed: the old file may be memory-mapped right now
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as f:
+        f.write(STATS_HEADER.pack(STATS_MAGIC, VERSION, store.source_size, store.source_mtime,
+                                  store.count, int(games.sum(dtype=np.uint64))))
+        for array in (games, wins, wrong, tiers):
+            f.write(array.tobytes())
+    os.replace(temp_path, path)
+
+
+# ---------------------------
+# Word Store
+# ---------------------------
+class FixedWidthWords:
+    """Sequence view over one length bucket, for bisecting without copies."""
+
+    def __init__(self, data, offset, length, count):
+        self.data = data
+        self.offset = offset
+        self.length = length
+        self.count = count
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i):
+        start = self.offset + i * self.length
+        return bytes(self.data[start:start + self.length])
+
+
+class WordStore:
+    """Memory-mapped, length-bucketed word pack."""
+
+    def __init__(self, data, mapping=None, source=None):
+        magic, version, source_size, source_mtime, count, max_length = HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("not a word store index")
+        self.data = data
+        self.mapping = mapping
+        self.source = source
+        self.source_size = source_size
+        self.source_mtime = source_mtime
+        self.count = count
+        self.max_length = max_length
+
+        table = HEADER.size
+        self.buckets = [BUCKET.unpack_from(data, table + length * BUCKET.size)
+                        for length in range(max_length + 1)]
+        masks_at = table + (max_length + 1) * BUCKET.size
+        tiers_at = masks_at + 4 * count
+        self.words_at = tiers_at + count
+        self.masks = np.frombuffer(data, dtype=np.uint32, count=count, offset=masks_at)
+        self.tiers = np.frombuffer(data, dtype=np.uint8, count=count, offset=tiers_at)
+        self.frequency_tiers = self.tiers  # the index's own, kept when stats replace them
+        self.first_ids = np.array([first for _, first, _ in self.buckets], dtype=np.int64)
+
+        # Per-word play results, once a stats file is loaded
+        self.stats_mapping = None
+        self.games = self.wins = self.wrong = None
+
+    @classmethod
+    def open(cls, path, index_path=None, stats_path=None):
+        """Open a text word pack through its cached index, rebuilding if stale.
+
+        Play results are loaded from stats_path, by default <pack>.stats.
+        """
+        index_path = index_path or path + ".idx"
+        stat = os.stat(path)
+        try:
+            with open(index_path, "rb") as f:
+                mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, size, mtime, _, _ = HEADER.unpack_from(mapping, 0)
+            if (magic, version, size, mtime) == (MAGIC, VERSION, stat.st_size, stat.st_mtime_ns):
+                store = cls(mapping, mapping, path)
+            else:
+                mapping.close()
+                store = None
+        except (OSError, ValueError, struct.error):
+            store = None
+
+        if store is None:
+            data = build_index(read_words(path), stat.st_size, stat.st_mtime_ns)
+            try:
+                with open(index_path, "wb") as f:
+                    f.write(data)
+            except OSError:
+                pass  # read-only location: keep the index in memory only
+            store = cls(data, source=path)
+        if not store.count:
+            store.close()
+            raise ValueError(f"{path}: word pack has no usable words (one word of ASCII letters per line)")
+        store.load_stats(stats_path or path + ".stats")
+        return store
+
+    @classmethod
+    def from_words(cls, words):
+        """In-memory store for a word list, for tests and small packs."""
+        words = sorted({word.lower() for word in words if word.isascii() and word.isalpha()},
+                       key=lambda word: (len(word), word))
+        return cls(build_index(words))
+
+    def load_stats(self, path):
+        """Use the results simulate.py wrote for this pack, if they match it.
+
+        Returns True if the stats were loaded; their tiers replace the
+        letter-frequency ones, and any stats loaded before are released.
+        """
+        try:
+            with open(path, "rb") as f:
+                mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return False
+        header = STATS_HEADER.unpack_from(mapping, 0) if len(mapping) >= STATS_HEADER.size else None
+        expected = (STATS_MAGIC, VERSION, self.source_size, self.source_mtime, self.count)
+        if header is None or header[:5] != expected or \
+                len(mapping) != STATS_HEADER.size + 13 * self.count:
+            mapping.close()
+            return False
+
+        count = self.count
+        at = STATS_HEADER.size
+        self.games = np.frombuffer(mapping, dtype=np.uint32, count=count, offset=at)
+        self.wins = np.frombuffer(mapping, dtype=np.uint32, count=count, offset=at + 4 * count)
+        self.wrong = np.frombuffer(mapping, dtype=np.uint32, count=count, offset=at + 8 * count)
+        self.tiers = np.frombuffer(mapping, dtype=np.uint8, count=count, offset=at + 12 * count)
+        # The old views were just replaced, so the old mapping can be unmapped
+        previous, self.stats_mapping = self.stats_mapping, mapping
+        if previous is not None:
+            previous.close()
+        return True
+
+    def win_rate(self, word_id):
+        """Share of simulated games won on a word, or None without stats."""
+        if self.games is None or not self.games[word_id]:
+            return None
+        return self.wins[word_id] / self.games[word_id]
+
+    def average_wrong(self, word_id):
+        """Mean wrong guesses per simulated game on a word, or None."""
+        if self.games is None or not self.games[word_id]:
+            return None
+        return self.wrong[word_id] / self.games[word_id]
+
+    def close(self):
+        # The NumPy views hold buffer exports; drop them before unmapping
+        if self.stats_mapping is not None:
+            self.games = self.wins = self.wrong = self.tiers = None
+            self.stats_mapping.close()
+            self.stats_mapping = None
+        if self.mapping is not None:
+            self.masks = self.tiers = self.frequency_tiers = None
+            self.mapping.close()
+            self.mapping = None
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, word_id):
+        if not 0 <= word_id < self.count:
+            raise IndexError("word id out of range")
+        # Empty buckets share their first id with the next bucket, so the
+        # last bucket starting at or before word_id is the one holding it
+        length = int(np.searchsorted(self.first_ids, word_id, side="right")) - 1
+        offset, first, _ = self.buckets[length]
+        start = self.words_at + offset + (word_id - first) * length
+        return bytes(self.data[start:start + length]).decode("ascii")
+
+    def __contains__(self, word):
+        if not word.isascii() or not 0 < len(word) <= self.max_length:
+            return False
+        key = word.lower().encode("ascii")
+        view = self.bucket_words(len(word))
+        i = bisect_left(view, key)
+        return i < len(view) and view[i] == key
+
+    def bucket_words(self, length):
+        """Sorted words of one length as a lazy sequence of bytes."""
+        offset, _, count = self.buckets[length]
+        return FixedWidthWords(self.data, self.words_at + offset, length, count)
+
+    def bucket_array(self, length):
+        """(count, length) uint8 array of the letters of every word of a length."""
+        if not 0 < length <= self.max_length:
+            return np.zeros((0, max(length, 0)), dtype=np.uint8)
+        offset, _, count = self.buckets[length]
+        return np.frombuffer(self.data, dtype=np.uint8, count=count * length,
+                             offset=self.words_at + offset).reshape(count, length)
+
+    def id_range(self, min_length=1, max_length=None):
+        """[first, end) ids of the words with min_length <= len <= max_length."""
+        max_length = self.max_length if max_length is None else min(max_length, self.max_length)
+        min_length = max(min_length, 0)
+        if min_length > max_length:
+            return 0, 0
+        first = self.buckets[min_length][1]
+        _, last, count = self.buckets[max_length]
+        return first, last + count
+
+    def candidates(self, min_length=1, max_length=None, include="", exclude="", tier=None):
+        """Ids of the words matching every filter, as a NumPy array."""
+        first, end = self.id_range(min_length, max_length)
+        selected = np.ones(end - first, dtype=bool)
+        masks = self.masks[first:end]
+        if include:
+            need = letter_mask(include)
+            selected &= (masks & need) == need
+        if exclude:
+            selected &= (masks & letter_mask(exclude)) == 0
+        if tier is not None:
+            selected &= self.tiers[first:end] == tier
+        return np.flatnonzero(selected) + first
+
+    def count_matching(self, **filters):
+        """Number of words matching the sample() filters."""
+        if not filters.get("include") and not filters.get("exclude") and filters.get("tier") is None:
+            first, end = self.id_range(filters.get("min_length", 1), filters.get("max_length"))
+            return end - first
+        return len(self.candidates(**filters))
+
+    def sample(self, rng=random, min_length=1, max_length=None, include="", exclude="", tier=None):
+        """A random word matching the filters, or None if nothing matches.
+
+        Length-only filters pick a random id inside the contiguous range
+        without scanning; letter and tier filters test the masks of that
+        range in one vectorized pass. Only the chosen word is decoded.
+        """
+        if not include and not exclude and tier is None:
+            first, end = self.id_range(min_length, max_length)
+            if end <= first:
+                return None
+            return self[first + rng.randrange(end - first)]
+
+        ids = self.candidates(min_length, max_length, include, exclude, tier)
+        if len(ids) == 0:
+            return None
+        return self[int(ids[rng.randrange(len(ids))])]
@@ -0,0 +1,338 @@
+"""
+Tic Tac Toe computer player
+Negamax search with alpha-beta pruning over the bitboard engine in board.py.
+
+Positions are cached in a transposition table keyed by Zobrist hashes. The
+eight rotations and reflections of a square board are equivalent, so eight
+hashes are kept up to date incrementally and the smallest one is used as the
+key; stored best moves are mapped through the matching symmetry. Moves are
+ordered table move first, then by how many neighbouring stones they touch
+and how central they are.
+
+3x3 is searched to the end and solved instantly. Larger boards use iterative
+deepening with a heuristic evaluation at the horizon and stop at a time
+budget, keeping the best move of the deepest completed iteration. Callers
+searching in the background can watch each completed iteration through a
+progress callback and stop the search early with an event.
+"""
+
+import random
+import time
+
+from board import winning_lines
+
+WIN_SCORE = 1000000
+MATE_RANGE = 1000   # scores this close to WIN_SCORE are forced wins
+EXACT, LOWER, UPPER = 0, 1, 2
+
+
+class SearchTimeout(Exception):
+    """Raised inside the search when the time budget runs out"""
+
+
+class SearchStats:
+    """Counters for one choose_move call"""
+    def __init__(self):
+        self.nodes = 0
+        self.tt_probes = 0
+        self.tt_hits = 0
+        self.depth = 0
+        self.score = 0
+        self.elapsed = 0.0
+
+    @property
+    def nodes_per_second(self):
+        return self.nodes / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def tt_hit_rate(self):
+        return self.tt_hits / self.tt_probes if self.tt_probes else 0.0
+
+    def as_dict(self):
+        return {
+            "nodes": self.nodes,
+            "depth": self.depth,
+            "score": self.score,
+            "elapsed": self.elapsed,
+            "nodes_per_second": self.nodes_per_second,
+            "tt_hit_rate": self.tt_hit_rate,
+        }
+
+    def __str__(self):
+        return (f"depth {self.depth}, {self.nodes} nodes in {self.elapsed * 1000:.1f} ms "
+                f"({self.nodes_per_second:,.0f} nodes/s), TT hit rate {self.tt_hit_rate:.0%}")
+
+
+def symmetries(size):
+    """The 8 symmetries of a square board as cell permutations"""
+    def transform(row, col, t):
+        if t & 4:
+            row, col = col, row
+        if t & 1:
+            row = size - 1 - row
+        if t & 2:
+            col = size - 1 - col
+        return row * size + col
+    return [[transform(row, col, t) for row in range(size) for col in range(size)]
+            for t in range(8)]
+
+
+class NegamaxAI:
+    """Alpha-beta negamax player for Board positions"""
+    def __init__(self, size=3, win_length=None, time_budget=1.0, max_depth=None,
+                 tt_limit=2000000, seed=0):
+        self.size = size
+        self.win_length = min(win_length or size, size)
+        self.time_budget = time_budget
+        self.max_depth = max_depth
+        self.tt_limit = tt_limit
+        self.table = {}
+        self.last_stats = SearchStats()
+
+        cells = size * size
+        rng = random.Random(seed)
+        keys = [[rng.getrandbits(64) for _ in range(cells)] for _ in range(2)]
+        self.perms = symmetries(size)
+        self.inverse = []
+        for perm in self.perms:
+            inverse = [0] * cells
+            for cell, image in enumerate(perm):
+                inverse[image] = cell
+            self.inverse.append(inverse)
+        # zobrist[player][cell] = the 8 keys that cell contributes under
+        # each symmetry
+        self.zobrist = [[tuple(keys[player][perm[cell]] for perm in self.perms)
+                         for cell in range(cells)] for player in range(2)]
+
+        center = (size - 1) / 2
+        self.centrality = [-(abs(row - center) + abs(col - center))
+                           for row in range(size) for col in range(size)]
+        self.neighbours = [[r * size + c
+                            for r in range(max(0, row - 1), min(size, row + 2))
+                            for c in range(max(0, col - 1), min(size, col + 2))
+                            if (r, c) != (row, col)]
+                           for row in range(size) for col in range(size)]
+        self.lines = None
+
+    # ---------------------------
+    # Public API
+    # ---------------------------
+    def choose_move(self, board, time_budget=None, progress=None, stop=None):
+        """Best (row, col) for the side to move; stats go to last_stats
+
+        progress(move, depth, score) is called after each completed
+        iteration; the search ends early once stop (a threading.Event) is set.
+        """
+        if board.size != self.size:
+            raise ValueError(f"AI is set up for {self.size}x{self.size}, board is {board.size}x{board.size}")
+        budget = self.time_budget if time_budget is None else time_budget
+        stats = SearchStats()
+        self.last_stats = stats
+        start = time.perf_counter()
+        self.deadline = start + budget if budget else None
+        self.stop = stop
+        self.stats = stats
+
+        self.board = board
+        self.cells = self.board_cells(board)
+        self.hashes = [0] * 8
+        for cell, player in enumerate(self.cells):
+            if player is not None:
+                self.toggle(cell, player)
+
+        empties = self.cells.count(None)
+        max_depth = min(empties, self.max_depth or empties)
+        best = None
+        for depth in range(1, max_depth + 1):
+            try:
+                score, move = self.search_root(depth)
+            except SearchTimeout:
+                break
+            best = move
+            stats.depth = depth
+            stats.score = score
+            if progress:
+                progress(divmod(best, self.size), depth, score)
+            if abs(score) >= WIN_SCORE - MATE_RANGE:
+                break  # forced result found
+        if best is None:
+            best = self.ordered_moves(None)[0]  # out of time before depth 1
+
+        stats.elapsed = time.perf_counter() - start
+        if len(self.table) > self.tt_limit:
+            self.table.clear()
+        return divmod(best, self.size)
+
+    def close(self):
+        """Nothing to release; MCTSAI shuts down its worker pool here"""
+
+    def board_cells(self, board):
+        """Flat list of 0, 1 or None per cell"""
+        cells = []
+        for row in range(board.size):
+            for col in range(board.size):
+                bit = 1 << board.index(row, col)
+                if board.bits[0] & bit:
+                    cells.append(0)
+                elif board.bits[1] & bit:
+                    cells.append(1)
+                else:
+                    cells.append(None)
+        return cells
+
+    # ---------------------------
+    # Search
+    # ---------------------------
+    def toggle(self, cell, player):
+        keys = self.zobrist[player][cell]
+        hashes = self.hashes
+        for t in range(8):
+            hashes[t] ^= keys[t]
+
+    def play(self, cell):
+        player = self.board.turn
+        won = self.board.play(*divmod(cell, self.size))
+        self.cells[cell] = player
+        self.toggle(cell, player)
+        return won
+
+    def undo(self, cell):
+        self.board.undo()
+        self.toggle(cell, self.board.turn)
+        self.cells[cell] = None
+
+    def canonical(self):
+        """(canonical hash, symmetry index) of the current position"""
+        hashes = self.hashes
+        key = min(hashes)
+        return key, hashes.index(key)
+
+    def ordered_moves(self, tt_move):
+        cells = self.cells
+        empties = [cell for cell, player in enumerate(cells) if player is None]
+        if self.size > 3 and len(empties) < len(cells):
+            # On big boards only cells next to existing stones are worth trying
+            near = [cell for cell in empties
+                    if any(cells[n] is not None for n in self.neighbours[cell])]
+            empties = near or empties
+
+        def priority(cell):
+            touching = sum(cells[n] is not None for n in self.neighbours[cell])
+            return (cell == tt_move, touching, self.centrality[cell])
+
+        empties.sort(key=priority, reverse=True)
+        return empties
+
+    def search_root(self, depth):
+        key, sym = self.canonical()
+        entry = self.table.get(key)
+        tt_move = self.inverse[sym][entry[3]] if entry and entry[3] is not None else None
+
+        alpha, beta = -WIN_SCORE - 1, WIN_SCORE + 1
+        best_score, best_move = -WIN_SCORE - 1, None
+        for cell in self.ordered_moves(tt_move):
+            score = self.score_move(cell, depth, -beta, -alpha)
+            if score > best_score:
+                best_score, best_move = score, cell
+            alpha = max(alpha, score)
+        self.table[key] = (depth, best_score, EXACT, self.perms[sym][best_move])
+        return best_score, best_move
+
+    def score_move(self, cell, depth, alpha, beta):
+        """Play cell, score it for the mover, and take it back"""
+        stats = self.stats
+        stats.nodes += 1
+        if stats.nodes & 1023 == 0 and (self.deadline and time.perf_counter() > self.deadline
+                                        or self.stop and self.stop.is_set()):
+            raise SearchTimeout()
+
+        won = self.play(cell)
+        try:
+            if won:
+                return WIN_SCORE
+            if self.board.is_full():
+                return 0
+            if depth <= 1:
+                return -self.evaluate()
+            score = -self.negamax(depth - 1, alpha, beta)
+        finally:
+            # Also runs on SearchTimeout so the caller's board is restored
+            self.undo(cell)
+
+        # Prefer faster wins and slower losses
+        if score >= WIN_SCORE - MATE_RANGE:
+            score -= 1
+        elif score <= -WIN_SCORE + MATE_RANGE:
+            score += 1
+        return score
+
+    def negamax(self, depth, alpha, beta):
+        stats = self.stats
+        original_alpha = alpha
+        key, sym = self.canonical()
+        stats.tt_probes += 1
+        entry = self.table.get(key)
+        tt_move = None
+        if entry is not None:
+            stats.tt_hits += 1
+            entry_depth, value, flag, move = entry
+            if move is not None:
+                tt_move = self.inverse[sym][move]
+            if entry_depth >= depth:
+                if flag == EXACT:
+                    return value
+                if flag == LOWER:
+                    alpha = max(alpha, value)
+                elif flag == UPPER:
+                    beta = min(beta, value)
+                if alpha >= beta:
+                    return value
+
+        best_score, best_move = -WIN_SCORE - 1, None
+        for cell in self.ordered_moves(tt_move):
+            score = self.score_move(cell, depth, -beta, -alpha)
+            if score > best_score:
+                best_score, best_move = score, cell
+            if score > alpha:
+                alpha = score
+            if alpha >= beta:
+                break
+
+        if best_score <= original_alpha:
+            flag = UPPER
+        elif best_score >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self.table[key] = (depth, best_score, flag, self.perms[sym][best_move])
+        return best_score
+
+    # ---------------------------
+    # Evaluation
+    # ---------------------------
+    def evaluate(self):
+        """Heuristic score for the side to move at the search horizon
+
+        Every line still open to only one player counts 4^(stones in it).
+        """
+        if self.lines is None:
+            board = self.board
+            self.lines = []
+            for line in winning_lines(self.size, self.win_length):
+                mask = 0
+                for cell in line:
+                    mask |= 1 << board.index(*divmod(cell, self.size))
+                self.lines.append(mask)
+
+        mine = self.board.bits[self.board.turn]
+        theirs = self.board.bits[self.board.turn ^ 1]
+        score = 0
+        for mask in self.lines:
+            a = mine & mask
+            b = theirs & mask
+            if a and not b:
+                score += 4 ** a.bit_count()
+            elif b and not a:
+                score -= 4 ** b.bit_count()
+        return max(-WIN_SCORE // 2, min(WIN_SCORE // 2, score))
+
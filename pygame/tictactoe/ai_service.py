@@ -0,0 +1,139 @@
+"""
+Tic Tac Toe background AI service
+Runs a computer player's search on a worker thread so the game keeps
+drawing at full frame rate while the computer thinks.
+
+The game asks for a move with request(), which snapshots the board, and
+calls poll() once a frame; poll() never blocks and returns the move when
+the search has finished. While the search runs, each completed
+iteration of the iterative deepening is published as best, and once the
+request's deadline has passed poll() plays that best-so-far move instead
+of waiting any longer. cancel() (the game calls it from reset_board)
+stops the search and drops its answer.
+
+Any player with choose_move(board, time_budget=..., progress=..., stop=...)
+works: NegamaxAI, MCTSAI and PerfectTable all do.
+"""
+
+import queue
+import threading
+import time
+
+DEADLINE_GRACE = 0.05  # seconds past the time budget before best-so-far is played
+
+
+class Job:
+    """One move request"""
+    __slots__ = ("board", "time_budget", "deadline", "stop", "best", "result", "error", "done")
+
+    def __init__(self, board, time_budget):
+        self.board = board
+        self.time_budget = time_budget
+        self.deadline = time.perf_counter() + time_budget + DEADLINE_GRACE if time_budget else None
+        self.stop = threading.Event()
+        self.best = None    # (move, depth, score) of the deepest finished iteration
+        self.result = None
+        self.error = None
+        self.done = False
+
+    def publish(self, move, depth, score):
+        self.best = (move, depth, score)
+
+
+class AIService:
+    """A computer player running on its own thread"""
+    def __init__(self, ai):
+        self.ai = ai
+        self.job = None
+        self.jobs = queue.Queue()
+        self.thread = threading.Thread(target=self.work, name="ai-service", daemon=True)
+        self.thread.start()
+
+    @property
+    def thinking(self):
+        """True while a request is waiting for its move"""
+        return self.job is not None
+
+    @property
+    def best(self):
+        """(move, depth, score) found so far for the current request, or None"""
+        job = self.job
+        return job.best if job else None
+
+    def request(self, board, time_budget=None):
+        """Start searching a snapshot of board, replacing any running request"""
+        self.cancel()
+        self.job = Job(board.copy(), time_budget)
+        self.jobs.put(self.job)
+
+    def cancel(self):
+        """Stop the current search; its move is never returned"""
+        if self.job is not None:
+            self.job.stop.set()
+            self.job = None
+
+    def poll(self):
+        """The requested (row, col) once it is ready, otherwise None"""
+        job = self.job
+        if job is None:
+            return None
+        if job.done:
+            self.job = None
+            if job.error is not None:
+                raise job.error
+            return job.result
+        if job.deadline and job.best and time.perf_counter() > job.deadline:
+            # Overran its budget: play the best move found and let it wind down
+            self.cancel()
+            return job.best[0]
+        return None
+
+    def work(self):
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                return
+            if not job.stop.is_set():
+                try:
+                    job.result = self.ai.choose_move(job.board, time_budget=job.time_budget,
+                                                     progress=job.publish, stop=job.stop)
+                except Exception as exc:
+                    job.error = exc
+            job.done = True
+
+    def close(self):
+        """Stop the worker thread and release the player"""
+        self.cancel()
+        self.jobs.put(None)
+        self.thread.join()
+        self.ai.close()
+
+
+class FrameWatch:
+    """Frame intervals seen while the computer was thinking"""
+    def __init__(self):
+        self.frames = 0
+        self.total = 0.0
+        self.longest = 0.0
+        self.last = None
+        self.was_thinking = False
+
+    def tick(self, thinking):
+        """Call once at the start of every frame
+
+        An interval counts if the computer was thinking at either end of it.
+        """
+        now = time.perf_counter()
+        if (thinking or self.was_thinking) and self.last is not None:
+            interval = now - self.last
+            self.frames += 1
+            self.total += interval
+            self.longest = max(self.longest, interval)
+        self.last = now
+        self.was_thinking = thinking
+
+    def __str__(self):
+        if not self.frames:
+            return "no frames while the AI was thinking"
+        return (f"{self.frames} frames while the AI was thinking: longest {self.longest * 1000:.1f} ms, "
+                f"mean {self.total / self.frames * 1000:.1f} ms")
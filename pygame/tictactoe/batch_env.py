@@ -0,0 +1,143 @@
+"""
+Tic Tac Toe batch environment
+B games stepped at once on NumPy arrays, for training agents by self-play.
+
+The boards are one int8 array of shape (B, N, N): 0 empty, 1 for X and -1
+for O. step() takes one flat cell index (row * N + col) per board, places
+the mark of each board's side to move, and checks for wins with line sums:
+for every cell the winning lines through it are precomputed as flat index
+rows, so a win check gathers at most a few dozen cells per board and sums
+them, never scanning lines away from the move. The rules match
+check_winner in tictactoe.py and the Board engine: K in a row on any row,
+column or diagonal wins, a full board is a draw. Playing an occupied cell
+ends the game as a loss for the mover.
+
+Finished boards are reset in the same step, so every step returns B live
+observations. Observations are from the point of view of the side to move
+(its own marks +1), which lets one policy play both sides.
+
+Usage:
+    env = BatchEnv(4096, size=3, seed=0)
+    obs = env.reset()
+    obs, reward, done = env.step(env.sample_actions())
+"""
+
+import numpy as np
+
+from board import winning_lines
+
+WIN_REWARD = 1.0
+DRAW_REWARD = 0.0
+ILLEGAL_REWARD = -1.0
+
+
+class BatchEnv:
+    """B tic-tac-toe games on one (B, N, N) int8 array"""
+    def __init__(self, batch, size=3, win_length=None, seed=None):
+        self.batch = batch
+        self.size = size
+        self.win_length = min(win_length or size, size)
+        self.cells = size * size
+        self.rng = np.random.default_rng(seed)
+
+        # The boards get one spare always-empty cell so line rows can be
+        # padded to the same length with a line that can never be won
+        self.flat = np.zeros((batch, self.cells + 1), dtype=np.int8)
+        self.boards = self.flat[:, :self.cells].reshape(batch, size, size)
+        self.turn = np.ones(batch, dtype=np.int8)     # 1 X to move, -1 O
+        self.moves = np.zeros(batch, dtype=np.int16)  # marks on each board
+        self.offsets = np.arange(batch, dtype=np.intp) * (self.cells + 1)  # row starts in flat
+
+        # lines_through[cell] = (M, K) flat indexes of the lines through cell
+        by_cell = [[] for _ in range(self.cells)]
+        for line in winning_lines(size, self.win_length):
+            for cell in line:
+                by_cell[cell].append(line)
+        width = max(len(lines) for lines in by_cell)
+        padding = [self.cells] * self.win_length
+        self.lines_through = np.array([lines + [padding] * (width - len(lines)) for lines in by_cell],
+                                      dtype=np.intp)
+
+        # Outputs of the last step, reused to avoid allocating every step
+        self.reward = np.zeros(batch, dtype=np.float32)
+        self.done = np.zeros(batch, dtype=bool)
+        self.winner = np.zeros(batch, dtype=np.int8)   # 1 X, -1 O, 0 draw, for finished games
+        self.illegal = np.zeros(batch, dtype=bool)
+
+    def reset(self):
+        """Clear every board; returns the observations"""
+        self.flat[:] = 0
+        self.turn[:] = 1
+        self.moves[:] = 0
+        return self.observe()
+
+    def observe(self):
+        """(B, N, N) int8 boards from the side to move's point of view"""
+        return self.boards * self.turn[:, None, None]
+
+    def legal_mask(self):
+        """(B, N*N) bool array of the empty cells"""
+        return self.flat[:, :self.cells] == 0
+
+    def sample_actions(self):
+        """A uniformly random empty cell of every board"""
+        scores = self.rng.random((self.batch, self.cells), dtype=np.float32)
+        scores[self.flat[:, :self.cells] != 0] = -1.0
+        return scores.argmax(axis=1)
+
+    def step(self, actions):
+        """Play one move on every board; returns (observations, rewards, dones)
+
+        rewards are for the side that just moved: WIN_REWARD for a win,
+        DRAW_REWARD for a draw or an unfinished game, ILLEGAL_REWARD for a
+        move onto an occupied cell. done marks the games that ended; they
+        are already reset in the returned observations, and winner holds
+        how each of them ended (1 X, -1 O, 0 draw).
+
+        Raises ValueError, before any board changes, unless actions holds
+        one cell index in [0, N*N) per board.
+        """
+        actions = np.asarray(actions, dtype=np.intp)
+        if actions.shape != (self.batch,):
+            raise ValueError(f"expected {self.batch} actions, got shape {actions.shape}")
+        if actions.min() < 0 or actions.max() >= self.cells:
+            raise ValueError(f"actions must be cell indexes in [0, {self.cells})")
+        flat, turn = self.flat.reshape(-1), self.turn
+        offsets = self.offsets
+
+        targets = offsets + actions
+        current = flat[targets]
+        illegal = current != 0
+        legal = ~illegal
+        flat[targets] = np.where(illegal, current, turn)
+        self.moves += legal
+
+        # Sum every line through the move; K * mark means the mover won.
+        # Adding the K columns one by one beats a sum() reduction over a
+        # short axis, and int8 is wide enough for K up to 127.
+        lines = self.lines_through[actions]                  # (B, M, K)
+        lines += offsets[:, None, None]
+        cells = np.take(flat, lines)
+        sums = cells[:, :, 0].copy()
+        for i in range(1, self.win_length):
+            sums += cells[:, :, i]
+        won = (sums == (turn * self.win_length)[:, None]).any(axis=1)
+        won &= legal
+
+        done = np.logical_or(won, illegal, out=self.done)
+        done |= self.moves == self.cells
+        # won and illegal never overlap: +1, -1 or 0 for the mover
+        outcome = np.subtract(won, illegal, dtype=np.int8)
+        reward = self.reward
+        np.copyto(reward, DRAW_REWARD)
+        reward[outcome > 0] = WIN_REWARD
+        reward[outcome < 0] = ILLEGAL_REWARD
+        self.illegal[:] = illegal
+        np.multiply(outcome, turn, out=self.winner)
+
+        turn *= -1
+        if done.any():
+            self.flat[done] = 0
+            turn[done] = 1
+            self.moves[done] = 0
+        return self.observe(), reward, done
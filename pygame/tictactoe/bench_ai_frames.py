@@ -0,0 +1,106 @@
+"""
+Frame pacing while the computer thinks
+
+Renders the game headless at its normal frame rate while a computer player
+searches a position that takes its whole time budget, first with the search
+called inline in the frame (as the game used to) and then through
+AIService on a worker thread. Reports the longest and mean frame interval
+seen during the searches, and how deep the search got in each mode.
+
+The search and the renderer share the GIL, so frames slow down a little
+while the worker runs but never wait for the whole search.
+
+Usage:
+    python bench_ai_frames.py [--size 7] [--win 4] [--budget 0.5] [--searches 3]
+
+Reference (1 CPU core, 7x7 four in a row, 0.5 s budget): inline, the
+longest frame is the whole search, about 530 ms; with the service it is
+about 26 ms (21 ms mean against 16.7 ms frames) and the search still
+reaches depth 6.
+"""
+
+import argparse
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+import tictactoe_modern as game_module
+from ai import NegamaxAI
+from ai_service import AIService, FrameWatch
+from board import Board
+
+
+def position(size, win_length):
+    """Two stones at the center, quiet enough to use the whole budget"""
+    board = Board(size, win_length)
+    center = size // 2
+    for d_row, d_col in ((0, 0), (1, 1)):
+        board.play(center + d_row, center + d_col)
+    return board
+
+
+def render(game):
+    game.animate()
+    game.draw_scene()
+    game.compositor.present((0, 0))
+
+
+def run_inline(game, ai, board, budget, searches):
+    watch = FrameWatch()
+    clock = pygame.time.Clock()
+    depths = []
+    for _ in range(searches):
+        for thinking in (False, True, False):
+            clock.tick(game_module.FPS)
+            watch.tick(thinking)
+            if thinking:
+                ai.choose_move(board, time_budget=budget)
+                depths.append(ai.last_stats.depth)
+            render(game)
+    return watch, depths
+
+
+def run_service(game, ai, board, budget, searches):
+    watch = FrameWatch()
+    clock = pygame.time.Clock()
+    service = AIService(ai)
+    depths = []
+    for _ in range(searches):
+        clock.tick(game_module.FPS)
+        watch.tick(False)
+        render(game)
+        service.request(board, budget)
+        while service.thinking:
+            clock.tick(game_module.FPS)
+            watch.tick(True)
+            if service.poll() is not None:
+                depths.append(service.ai.last_stats.depth)
+            render(game)
+    service.close()
+    return watch, depths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Frame pacing while the computer thinks")
+    parser.add_argument("--size", type=int, default=7)
+    parser.add_argument("--win", type=int, default=4)
+    parser.add_argument("--budget", type=float, default=0.5, help="seconds per search")
+    parser.add_argument("--searches", type=int, default=3)
+    args = parser.parse_args()
+
+    game = game_module.TicTacToe(seed=1)
+    board = position(args.size, args.win)
+    print(f"{args.size}x{args.size}, {args.win} in a row, {args.budget:g} s per search, "
+          f"{game_module.FPS} FPS target ({1000 / game_module.FPS:.1f} ms frames)")
+    for name, run in (("inline", run_inline), ("service", run_service)):
+        ai = NegamaxAI(args.size, args.win, time_budget=args.budget)
+        watch, depths = run(game, ai, board, args.budget, args.searches)
+        print(f"{name:>8}: {watch}; depth {', '.join(map(str, depths))}")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Batch environment throughput benchmark
+
+Steps BatchEnv with uniformly random legal moves at several batch sizes and
+reports env-steps per second (one step = one move on one board), next to
+the same random games played one move at a time on the Board engine. With
+--check every game is replayed on Board, and on 3x3 also through
+check_winner from tictactoe.py, and the wins, draws and rewards must agree.
+
+Usage:
+    python bench_batch_env.py [--size 3] [--win 3] [--seconds 1] [--check 2000]
+
+Reference (1 CPU core, 3x3): about 150,000 steps/s one board at a time on
+Board; with a batch of 4096, about 3.8 million steps/s including the random
+move sampling and 8 million in step() alone. On 15x15 five in a row step()
+alone runs about 1.3 million steps/s.
+"""
+
+import argparse
+import random
+import time
+
+import numpy as np
+
+from batch_env import ILLEGAL_REWARD, WIN_REWARD, BatchEnv
+from board import Board
+from tictactoe import check_winner
+
+BATCHES = [1, 64, 1024, 4096, 16384]
+
+
+def bench_env(batch, size, win_length, seconds):
+    """env-steps per second with random legal moves, and counting step() alone"""
+    env = BatchEnv(batch, size, win_length, seed=0)
+    env.reset()
+    steps = 0
+    stepping = 0.0
+    clock = time.perf_counter
+    start = clock()
+    deadline = start + seconds
+    while True:
+        for _ in range(16):
+            actions = env.sample_actions()
+            t = clock()
+            env.step(actions)
+            stepping += clock() - t
+        steps += 16 * batch
+        if clock() > deadline:
+            break
+    return steps / (clock() - start), steps / stepping
+
+
+def bench_board(size, win_length, seconds):
+    """Steps per second playing random games one move at a time on Board"""
+    rng = random.Random(0)
+    board = Board(size, win_length)
+    steps = 0
+    start = time.perf_counter()
+    deadline = start + seconds
+    while time.perf_counter() < deadline:
+        for _ in range(256):
+            row, col = rng.choice(board.legal_moves())
+            if board.play(row, col) or board.is_full():
+                board.reset()
+        steps += 256
+    return steps / (time.perf_counter() - start)
+
+
+def check(size, win_length, games, batch=256):
+    """Replay BatchEnv's games on Board; returns the number of disagreements"""
+    env = BatchEnv(batch, size, win_length, seed=1)
+    env.reset()
+    boards = [Board(size, win_length) for _ in range(batch)]
+    rng = np.random.default_rng(2)
+    finished = errors = 0
+    while finished < games:
+        actions = env.sample_actions()
+        # An occasional occupied cell exercises the illegal-move rule
+        occupied = np.flatnonzero(env.flat[:, :env.cells].any(axis=1))
+        if len(occupied) and rng.random() < 0.05:
+            b = int(rng.choice(occupied))
+            actions[b] = int(np.flatnonzero(env.flat[b, :env.cells])[0])
+        _, reward, done = env.step(actions)
+        for b in range(batch):
+            board = boards[b]
+            row, col = divmod(int(actions[b]), size)
+            if not board.is_empty(row, col):
+                expected = ILLEGAL_REWARD, True
+            else:
+                mover = board.to_move
+                won = board.play(row, col)
+                if won and size == 3:
+                    spaces = [board.get(r, c) or " " for r in range(3) for c in range(3)]
+                    won = check_winner(spaces, mover)
+                expected = (WIN_REWARD if won else 0.0), won or board.is_full()
+            if (float(reward[b]), bool(done[b])) != expected:
+                errors += 1
+            if done[b]:
+                finished += 1
+                board.reset()
+    return errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch environment throughput benchmark")
+    parser.add_argument("--size", type=int, default=3)
+    parser.add_argument("--win", type=int, default=None)
+    parser.add_argument("--seconds", type=float, default=1.0, help="per measurement")
+    parser.add_argument("--check", type=int, default=0, help="replay this many games on Board")
+    args = parser.parse_args()
+    win_length = min(args.win or args.size, args.size)
+
+    print(f"{args.size}x{args.size}, {win_length} in a row, steps/s with random moves and in step() alone")
+    print(f"{'Board, one at a time':<22} {bench_board(args.size, win_length, args.seconds):>14,.0f}")
+    for batch in BATCHES:
+        rate, step_rate = bench_env(batch, args.size, win_length, args.seconds)
+        print(f"{f'BatchEnv B={batch}':<22} {rate:>14,.0f} {step_rate:>14,.0f}")
+
+    if args.check:
+        errors = check(args.size, win_length, args.check)
+        print(f"checked {args.check:,} games against Board: {errors} disagreements")
+        if errors:
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
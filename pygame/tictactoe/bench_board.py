@@ -0,0 +1,92 @@
+"""
+Board engine throughput benchmark
+
+Plays random games on the bitboard engine and reports how many moves per
+second are placed and checked for a win, on 3x3 tic-tac-toe and on 15x15 and
+19x19 five-in-a-row boards. For comparison the 3x3 row also reports the old
+approach of scanning every winning line after each move.
+
+Usage:
+    python bench_board.py [--seconds 2]
+"""
+
+import argparse
+import random
+import time
+
+from board import Board, winning_lines
+
+CONFIGS = [(3, 3), (15, 5), (19, 5)]
+
+
+def random_orders(size, count, seed=7):
+    """Pre-shuffled move orders so the RNG stays out of the timed loop"""
+    rng = random.Random(seed)
+    cells = [(row, col) for row in range(size) for col in range(size)]
+    orders = []
+    for _ in range(count):
+        rng.shuffle(cells)
+        orders.append(list(cells))
+    return orders
+
+
+def bench_engine(size, win_length, seconds):
+    """Moves checked per second with incremental bitboard checks"""
+    board = Board(size, win_length)
+    orders = random_orders(size, 64)
+    moves = 0
+    games = 0
+    start = time.perf_counter()
+    deadline = start + seconds
+    while time.perf_counter() < deadline:
+        for order in orders:
+            board.reset()
+            for row, col in order:
+                moves += 1
+                if board.play(row, col) or board.is_full():
+                    break
+            games += 1
+    elapsed = time.perf_counter() - start
+    return moves / elapsed, games / elapsed
+
+
+def bench_full_scan(size, win_length, seconds):
+    """Moves checked per second when every line is scanned after each move"""
+    lines = winning_lines(size, win_length)
+    orders = random_orders(size, 64)
+    moves = 0
+    games = 0
+    start = time.perf_counter()
+    deadline = start + seconds
+    while time.perf_counter() < deadline:
+        for order in orders:
+            board = [" "] * (size * size)
+            player = "X"
+            for row, col in order:
+                moves += 1
+                board[row * size + col] = player
+                if any(all(board[i] == player for i in line) for line in lines):
+                    break
+                player = "O" if player == "X" else "X"
+            games += 1
+    elapsed = time.perf_counter() - start
+    return moves / elapsed, games / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Board engine throughput benchmark")
+    parser.add_argument("--seconds", type=float, default=2.0)
+    args = parser.parse_args()
+
+    print(f"{'board':<10} {'engine':<10} {'moves/s':>12} {'games/s':>10}")
+    for size, win_length in CONFIGS:
+        label = f"{size}x{size} k{win_length}"
+        moves, games = bench_engine(size, win_length, args.seconds)
+        print(f"{label:<10} {'bitboard':<10} {moves:>12,.0f} {games:>10,.0f}")
+        if size == 3:
+            moves, games = bench_full_scan(size, win_length, args.seconds)
+            print(f"{label:<10} {'full scan':<10} {moves:>12,.0f} {games:>10,.0f}")
+
+
+if __name__ == "__main__":
+    main()
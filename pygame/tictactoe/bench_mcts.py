@@ -0,0 +1,69 @@
+"""
+MCTS playout throughput and scaling benchmark
+
+Searches one mid-game position with MCTSAI for a fixed time with 1, 2, ...
+N root-parallel workers and reports total playouts per second, playouts
+per second of each worker, and the speedup and efficiency against one
+worker. Root parallelism shares nothing between workers, so on an idle
+machine the total should grow close to linearly up to the core count; past
+it the workers only split the same cores.
+
+Usage:
+    python bench_mcts.py [--size 15] [--win 5] [--seconds 2] [--workers N]
+
+Reference (1 CPU core, 15x15 five in a row): about 4,000 playouts/s with
+one worker; more workers share that core, so the total stays flat.
+"""
+
+import argparse
+import os
+import random
+
+from board import Board
+from mcts import MCTSAI, board_cells
+
+
+def opening(size, win_length, moves=8, seed=3):
+    """A board with a few random moves played around the center and no forced reply"""
+    rng = random.Random(seed)
+    checker = MCTSAI(size, win_length)
+    center = size // 2
+    while True:
+        board = Board(size, win_length)
+        while len(board.history) < moves:
+            row = min(size - 1, max(0, center + rng.randint(-2, 2)))
+            col = min(size - 1, max(0, center + rng.randint(-2, 2)))
+            if board.is_empty(row, col):
+                board.play(row, col)
+        if board.winner is None and checker.forced_move(board_cells(board), board.turn + 1) is None:
+            return board
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MCTS playout scaling benchmark")
+    parser.add_argument("--size", type=int, default=15)
+    parser.add_argument("--win", type=int, default=5)
+    parser.add_argument("--seconds", type=float, default=2.0, help="search time per run")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="largest worker count")
+    args = parser.parse_args()
+
+    board = opening(args.size, args.win, moves=min(8, args.size * args.size // 4))
+    print(f"{args.size}x{args.size}, {args.win} in a row, {len(board.history)} moves played, "
+          f"{args.seconds:g} s per run, {os.cpu_count()} CPU(s)")
+    print(f"{'workers':>7} {'playouts':>10} {'total/s':>10} {'per core/s':>11} {'speedup':>8} {'efficiency':>10}")
+
+    base = None
+    for workers in range(1, args.workers + 1):
+        ai = MCTSAI(args.size, args.win, time_budget=args.seconds, workers=workers)
+        ai.choose_move(board, time_budget=0.05)  # start the pool outside the timing
+        ai.choose_move(board)
+        stats = ai.last_stats
+        ai.close()
+        rate = stats.playouts_per_second
+        base = base or rate
+        print(f"{workers:>7} {stats.playouts:>10,} {rate:>10,.0f} {stats.per_core:>11,.0f} "
+              f"{rate / base:>7.2f}x {rate / base / workers:>10.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Streaming adjudication benchmark
+
+Writes a file of random recorded games (most of them legal, some with a
+taken square or moves after the end), streams it through tictactoe.py's
+adjudicator and reports games per minute. Then a sample of the games is
+replayed on the Board engine and every result must agree.
+
+Usage:
+    python bench_stream.py [--games 1000000] [--check 100000] [--seed 1]
+
+Reference (1 CPU core): about 12 million games per minute through
+run_stream, reading from and writing to files.
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from board import Board
+from tictactoe import adjudicate, read_games, run_stream
+
+
+def random_game(rng):
+    """A random move string; about one in ten is corrupted"""
+    squares = [str(i) for i in range(1, 10)]
+    rng.shuffle(squares)
+    length = rng.randint(5, 9)
+    moves = squares[:length]
+    if rng.random() < 0.1:
+        moves.insert(rng.randrange(len(moves) + 1), rng.choice(squares))
+    return "".join(moves)
+
+
+def oracle(moves):
+    """The same result as adjudicate, played out on Board"""
+    board = Board(3)
+    winner = "-"
+    for ply, square in enumerate(moves):
+        if not square.isdigit() or square == "0" or winner != "-":
+            return winner, ply, ply + 1
+        row, col = divmod(int(square) - 1, 3)
+        if not board.is_empty(row, col):
+            return winner, ply, ply + 1
+        mover = board.to_move
+        if board.play(row, col):
+            winner = mover
+        elif board.is_full():
+            winner = "D"
+    return winner, len(moves), 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Streaming adjudication benchmark")
+    parser.add_argument("--games", type=int, default=1000000)
+    parser.add_argument("--check", type=int, default=100000, help="games replayed on Board")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        games_path = os.path.join(tmp, "games.txt")
+        results_path = os.path.join(tmp, "results.txt")
+        with open(games_path, "w") as f:
+            f.writelines(random_game(rng) + "\n" for _ in range(args.games))
+
+        start = time.perf_counter()
+        with open(games_path) as source, open(results_path, "w") as output:
+            run_stream(source, output)
+        elapsed = time.perf_counter() - start
+        print(f"{args.games:,} games in {elapsed:.2f} s: {args.games / elapsed * 60:,.0f} games/min")
+
+        mismatches = 0
+        with open(games_path) as source:
+            for i, moves in enumerate(read_games(source)):
+                if i >= args.check:
+                    break
+                if adjudicate(moves) != oracle(moves):
+                    mismatches += 1
+        print(f"checked {min(args.check, args.games):,} games against Board: {mismatches} mismatches")
+    if mismatches:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
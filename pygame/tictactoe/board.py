@@ -0,0 +1,160 @@
+"""
+Tic Tac Toe board engine
+An N x N board with K-in-a-row wins, from 3x3 tic-tac-toe up to 19x19 gomoku.
+
+Each player's marks are stored as one integer bitboard. Rows are laid out
+with one spare padding column (stride N + 1), so a run of bits walking
+sideways or diagonally always hits an empty padding bit at the board edge
+instead of wrapping onto the next row. After every move only the four lines
+through that move are checked, at most K - 1 cells in each direction.
+"""
+
+PLAYERS = ('X', 'O')
+
+
+def winning_lines(size=3, win_length=None):
+    """Every K-in-a-row line as a list of flat cell indexes (row * size + col)"""
+    win_length = min(win_length or size, size)
+    lines = []
+    for row in range(size):
+        for col in range(size):
+            for d_row, d_col in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                end_row = row + d_row * (win_length - 1)
+                end_col = col + d_col * (win_length - 1)
+                if 0 <= end_row < size and 0 <= end_col < size:
+                    lines.append([(row + d_row * i) * size + col + d_col * i
+                                  for i in range(win_length)])
+    return lines
+
+
+class Board:
+    """N x N board with one integer bitboard per player"""
+    __slots__ = ("size", "win_length", "players", "stride", "directions", "full_mask",
+                 "bits", "occupied", "history", "turn", "winner", "winning_line")
+
+    def __init__(self, size=3, win_length=None, players=PLAYERS):
+        self.size = size
+        self.win_length = min(win_length or size, size)
+        self.players = players
+        self.stride = size + 1
+        # (bit step, (row step, col step)) for the four line directions
+        self.directions = (
+            (1, (0, 1)),                  # horizontal
+            (self.stride, (1, 0)),        # vertical
+            (self.stride + 1, (1, 1)),    # diagonal
+            (self.stride - 1, (1, -1)),   # anti-diagonal
+        )
+        self.full_mask = 0
+        for row in range(size):
+            self.full_mask |= ((1 << size) - 1) << (row * self.stride)
+        self.reset()
+
+    def reset(self):
+        """Clear the board"""
+        self.bits = [0, 0]
+        self.occupied = 0
+        self.history = []
+        self.turn = 0
+        self.winner = None
+        self.winning_line = None
+
+    def copy(self):
+        """An independent Board in the same position"""
+        other = Board.__new__(Board)
+        for name in Board.__slots__:
+            setattr(other, name, getattr(self, name))
+        other.bits = list(self.bits)
+        other.history = list(self.history)
+        return other
+
+    @property
+    def to_move(self):
+        """Mark of the player whose turn it is"""
+        return self.players[self.turn]
+
+    def index(self, row, col):
+        """Bit index of a cell"""
+        return row * self.stride + col
+
+    def cell(self, index):
+        """(row, col) of a bit index"""
+        return divmod(index, self.stride)
+
+    def get(self, row, col):
+        """Mark at a cell, or None if it is empty"""
+        bit = 1 << self.index(row, col)
+        if self.bits[0] & bit:
+            return self.players[0]
+        if self.bits[1] & bit:
+            return self.players[1]
+        return None
+
+    def is_empty(self, row, col):
+        return not self.occupied >> self.index(row, col) & 1
+
+    def is_full(self):
+        return self.occupied == self.full_mask
+
+    def legal_moves(self):
+        """Empty cells as (row, col) pairs"""
+        return [(row, col) for row in range(self.size) for col in range(self.size)
+                if not self.occupied >> (row * self.stride + col) & 1]
+
+    def play(self, row, col):
+        """Place the side to move's mark at (row, col); return True if it wins"""
+        if not (0 <= row < self.size and 0 <= col < self.size):
+            raise ValueError(f"cell ({row}, {col}) is off the board")
+        if self.winner is not None:
+            raise ValueError("the game is already won")
+        index = row * self.stride + col
+        bit = 1 << index
+        if self.occupied & bit:
+            raise ValueError(f"cell ({row}, {col}) is taken")
+
+        player = self.turn
+        self.bits[player] |= bit
+        self.occupied |= bit
+        self.history.append(index)
+        self.turn = player ^ 1
+
+        line = self.line_through(index, self.bits[player])
+        if line is not None:
+            self.winner = self.players[player]
+            self.winning_line = line
+            return True
+        return False
+
+    def undo(self):
+        """Take back the last move"""
+        index = self.history.pop()
+        self.turn ^= 1
+        bit = 1 << index
+        self.bits[self.turn] &= ~bit
+        self.occupied &= ~bit
+        self.winner = None
+        self.winning_line = None
+
+    def line_through(self, index, bits):
+        """The winning run through index as ((row, col), (row, col)), or None
+
+        Only the four lines through the cell are walked, at most K - 1 cells
+        each way, so the cost does not depend on the board size.
+        """
+        reach = self.win_length - 1
+        limit = self.stride * self.size
+        for step, _ in self.directions:
+            start = index
+            for _ in range(reach):
+                prev = start - step
+                if prev < 0 or not bits >> prev & 1:
+                    break
+                start = prev
+            end = index
+            for _ in range(reach):
+                nxt = end + step
+                if nxt >= limit or not bits >> nxt & 1:
+                    break
+                end = nxt
+            if (end - start) // step >= reach:
+                return self.cell(start), self.cell(end)
+        return None
@@ -0,0 +1,88 @@
+"""
+Glow sprite cache for the neon effects in tictactoe_modern.py
+
+Every neon shape is drawn as a few translucent copies of the same shape in
+the same color, stacked under an opaque core. Stacking layers of one color
+over a background is the same as a single blit with alpha
+1 - (1 - a1)(1 - a2)..., so each shape is baked once into one per-pixel
+alpha sprite and every later frame is a single blit.
+
+Sprites are kept in an LRU keyed by (kind, quantized scale, color, glow
+level) with a cap on the total pixel memory.
+"""
+
+from collections import OrderedDict
+
+import numpy as np
+import pygame
+
+
+def flatten_layers(size, color, layers):
+    """Bake same-colored layers into one SRCALPHA sprite.
+
+    `layers` is a list of (alpha, draw) pairs; draw(surface) paints the
+    layer's shape in white on a black surface of the given size.
+    """
+    transmit = np.ones(size, dtype=np.float64)
+    mask_surface = pygame.Surface(size)
+    for alpha, draw in layers:
+        mask_surface.fill((0, 0, 0))
+        draw(mask_surface)
+        mask = pygame.surfarray.array2d(mask_surface) != 0
+        transmit[mask] *= 1 - alpha / 255
+
+    sprite = pygame.Surface(size, pygame.SRCALPHA)
+    sprite.fill((*color, 0))
+    sprite_alpha = pygame.surfarray.pixels_alpha(sprite)
+    sprite_alpha[:] = np.rint(255 * (1 - transmit)).astype(np.uint8)
+    del sprite_alpha  # release the surface lock
+    return sprite
+
+
+class GlowCache:
+    """LRU of pre-rendered glow sprites with a memory cap"""
+    def __init__(self, max_bytes=16 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.bytes_used = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, build, *args):
+        """Return the (sprite, offset) for key, calling build(*args) on a miss"""
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return entry
+
+        self.misses += 1
+        entry = build(*args)
+        self.entries[key] = entry
+        self.bytes_used += _sprite_bytes(entry[0])
+        while self.bytes_used > self.max_bytes and len(self.entries) > 1:
+            _, (old_sprite, _) = self.entries.popitem(last=False)
+            self.bytes_used -= _sprite_bytes(old_sprite)
+            self.evictions += 1
+        return entry
+
+    def stats(self):
+        """Return cache counters"""
+        return {
+            "sprites": len(self.entries),
+            "bytes": self.bytes_used,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def clear(self):
+        """Drop every cached sprite"""
+        self.entries.clear()
+        self.bytes_used = 0
+
+
+def _sprite_bytes(sprite):
+    return sprite.get_width() * sprite.get_height() * sprite.get_bytesize()
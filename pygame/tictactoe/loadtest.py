@@ -0,0 +1,213 @@
+"""
+Tic Tac Toe server load generator
+
+Opens thousands of simulated matches against server.py on localhost. Each
+bot is one TCP connection that joins, plays random legal moves when it is
+its turn, and asks for a rematch until it has played --games games. Every
+move's round trip is timed from sending MOVE to receiving its MOVED echo.
+
+Unless --connect is given a server is started in a subprocess on a free
+port, so the bots and the server each get a process of their own.
+
+Usage:
+    python loadtest.py [--matches 1000] [--games 5] [--size 3] [--win 3]
+                       [--batch 250] [--connect HOST:PORT] [--seed 1]
+
+Reference (1 CPU core, 3x3, 1000 matches of 5 games, server in its own
+process): about 5,900 moves/s with a p50 round trip of 80 ms. Both
+processes share the one core, so the round trip is mostly queueing behind
+the other 1999 connections.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import time
+
+import protocol
+from board import Board
+from protocol import encode
+
+
+class Stats:
+    """Counters shared by every bot"""
+    def __init__(self):
+        self.moves = 0
+        self.games = 0
+        self.errors = 0
+        self.rtts = []
+
+
+class Bot(asyncio.Protocol):
+    """One simulated player"""
+    def __init__(self, size, win_length, games, stats, rng, done):
+        self.size = size
+        self.win_length = win_length
+        self.games = games
+        self.stats = stats
+        self.rng = rng
+        self.done = done
+        self.buffer = bytearray()
+        self.transport = None
+        self.board = None
+        self.mark = None
+        self.played = 0
+        self.seq = 0
+        self.sent = 0
+
+    def connection_made(self, transport):
+        self.transport = transport
+        transport.write(encode(protocol.JOIN, self.size, self.win_length))
+
+    def data_received(self, data):
+        self.buffer += data
+        for message in protocol.decode(self.buffer):
+            kind = message[0]
+            if kind == protocol.MOVED:
+                self.moved(*message[1:])
+            elif kind == protocol.START:
+                self.board = Board(message[3], message[4])
+                self.mark = message[2]
+                self.maybe_move()
+            elif kind == protocol.END:
+                self.ended(message[1])
+            elif kind == protocol.ERROR:
+                self.stats.errors += 1
+
+    def moved(self, mark, row, col, seq):
+        if mark == self.mark and seq == self.seq:
+            self.stats.rtts.append(time.perf_counter() - self.sent)
+            self.stats.moves += 1
+        self.board.play(row, col)
+        self.maybe_move()
+
+    def maybe_move(self):
+        board = self.board
+        if board.turn != self.mark or board.winner is not None or board.is_full():
+            return
+        row, col = self.rng.choice(board.legal_moves())
+        self.seq += 1
+        self.sent = time.perf_counter()
+        self.transport.write(encode(protocol.MOVE, row, col, self.seq))
+
+    def ended(self, result):
+        if result == protocol.OPPONENT_LEFT:
+            self.stats.errors += 1
+            self.finish()
+            return
+        self.played += 1
+        if self.mark == 0:
+            self.stats.games += 1  # counted once per match
+        if self.played < self.games:
+            self.transport.write(encode(protocol.REMATCH))
+        else:
+            self.finish()
+
+    def finish(self):
+        if not self.done.done():
+            self.done.set_result(None)
+
+    def connection_lost(self, exc):
+        self.finish()
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a sorted list"""
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+def raise_file_limit(needed):
+    """Lift the soft open-file limit toward the hard limit if it is too low"""
+    try:
+        import resource
+    except ImportError:
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft != resource.RLIM_INFINITY and soft < needed:
+        target = needed if hard == resource.RLIM_INFINITY else min(needed, hard)
+        resource.setrlimit(resource.RLIMIT_NOFILE, (target, hard))
+
+
+def start_server():
+    """Run server.py in a subprocess on a free port; returns (process, port)"""
+    server = os.path.join(os.path.dirname(os.path.abspath(__file__)), "server.py")
+    process = subprocess.Popen([sys.executable, server, "--port", "0"],
+                               stdout=subprocess.PIPE, text=True)
+    line = process.stdout.readline()
+    if not line.startswith("serving on"):
+        process.kill()
+        raise RuntimeError(f"server failed to start: {line!r}")
+    return process, int(line.rsplit(":", 1)[1])
+
+
+async def run(host, port, matches, games, size, win_length, batch, seed):
+    """Play every match; returns (stats, connect seconds, total seconds)"""
+    loop = asyncio.get_running_loop()
+    stats = Stats()
+    rng = random.Random(seed)
+    finished = []
+
+    start = time.perf_counter()
+    for first in range(0, matches * 2, batch):
+        connects = []
+        for _ in range(min(batch, matches * 2 - first)):
+            done = loop.create_future()
+            finished.append(done)
+            bot = lambda done=done: Bot(size, win_length, games, stats, rng, done)
+            connects.append(loop.create_connection(bot, host, port))
+        await asyncio.gather(*connects)
+    connected = time.perf_counter() - start
+
+    await asyncio.gather(*finished)
+    elapsed = time.perf_counter() - start
+    return stats, connected, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tic Tac Toe server load generator")
+    parser.add_argument("--matches", type=int, default=1000)
+    parser.add_argument("--games", type=int, default=5, help="games per match")
+    parser.add_argument("--size", type=int, default=3)
+    parser.add_argument("--win", type=int, default=3)
+    parser.add_argument("--batch", type=int, default=250, help="connections opened at once")
+    parser.add_argument("--connect", metavar="HOST:PORT", help="use a running server")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    # Two sockets per match here, and as many again in a local server
+    raise_file_limit(args.matches * 4 + 256)
+
+    process = None
+    if args.connect:
+        host, _, port = args.connect.rpartition(":")
+        host, port = host or "127.0.0.1", int(port)
+    else:
+        process, port = start_server()
+        host = "127.0.0.1"
+
+    try:
+        stats, connected, elapsed = asyncio.run(
+            run(host, port, args.matches, args.games, args.size, args.win, args.batch, args.seed))
+    finally:
+        if process:
+            process.terminate()
+            process.wait()
+
+    rtts = sorted(stats.rtts)
+    print(f"{args.matches:,} matches ({args.matches * 2:,} connections, opened in {connected:.2f} s) "
+          f"on {args.size}x{args.size}, {args.win} in a row")
+    print(f"{stats.games:,} games, {stats.moves:,} moves in {elapsed:.2f} s: "
+          f"{stats.moves / elapsed:,.0f} moves/s, {stats.games / elapsed:,.0f} games/s")
+    print("round trip: " + ", ".join(f"p{int(q * 100)} {percentile(rtts, q) * 1000:.2f} ms"
+                                     for q in (0.5, 0.95, 0.99)) +
+          f", max {(rtts[-1] if rtts else 0) * 1000:.2f} ms")
+    print(f"{stats.errors} errors")
+
+
+if __name__ == "__main__":
+    main()
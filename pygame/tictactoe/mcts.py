@@ -0,0 +1,367 @@
+"""
+Tic Tac Toe Monte Carlo tree search player
+UCT search with random rollouts, for boards too big for ai.py to search deeply.
+
+Positions are flat bytearrays (0 empty, 1 X, 2 O, index row * size + col)
+so a rollout copies the board with one slice and checks each move for a win
+by walking the four lines through it. Rollouts play uniformly random moves
+to the end of the game; the tree only expands cells next to existing stones
+on boards bigger than 5x5, which keeps its branching factor small.
+
+Root parallelization: each worker process searches the same position with
+its own tree and random seed for the same budget, and the visit counts of
+the root moves are summed. The most visited move is played. Immediate wins,
+and blocks of the opponent's immediate wins, are played without searching.
+
+Usage in a game:
+    ai = MCTSAI(15, 5, time_budget=1.0, workers=4)
+    row, col = ai.choose_move(board)
+    print(ai.last_stats)
+    ai.close()
+"""
+
+import math
+import multiprocessing
+import random
+import time
+
+EXPLORATION = math.sqrt(2)
+NEAR_RADIUS = 1      # tree moves on big boards: cells this close to a stone
+FULL_WIDTH_SIZE = 5  # boards up to this size consider every empty cell
+CLOCK_CHECK = 16     # playouts between deadline checks
+
+
+class MCTSStats:
+    """Counters for one choose_move call"""
+    def __init__(self, workers=1):
+        self.workers = workers
+        self.playouts = 0
+        self.worker_rates = []  # playouts/s of each worker
+        self.visits = 0
+        self.win_rate = 0.0
+        self.elapsed = 0.0
+        self.forced = False
+
+    @property
+    def playouts_per_second(self):
+        return self.playouts / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def per_core(self):
+        """Mean playouts/s of one worker"""
+        return sum(self.worker_rates) / len(self.worker_rates) if self.worker_rates else 0.0
+
+    def as_dict(self):
+        return {
+            "workers": self.workers,
+            "playouts": self.playouts,
+            "elapsed": self.elapsed,
+            "playouts_per_second": self.playouts_per_second,
+            "per_core": self.per_core,
+            "visits": self.visits,
+            "win_rate": self.win_rate,
+        }
+
+    def __str__(self):
+        if self.forced:
+            return "forced move"
+        return (f"{self.playouts:,} playouts on {self.workers} worker(s) in {self.elapsed * 1000:.0f} ms "
+                f"({self.playouts_per_second:,.0f}/s, {self.per_core:,.0f}/s per core), "
+                f"best move {self.visits} visits, {self.win_rate:.0%} wins")
+
+
+# ---------------------------
+# Array Board
+# ---------------------------
+class Geometry:
+    """Per-cell lookup tables for one board size and win length"""
+    def __init__(self, size, win_length):
+        self.size = size
+        self.win_length = win_length
+        self.cells = size * size
+        # rays[cell] = for each line direction, the cells walking away from
+        # cell on either side, at most win_length - 1 of them
+        self.rays = []
+        for row in range(size):
+            for col in range(size):
+                rays = []
+                for d_row, d_col in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                    sides = []
+                    for sign in (1, -1):
+                        side = []
+                        for step in range(1, win_length):
+                            r, c = row + sign * step * d_row, col + sign * step * d_col
+                            if not (0 <= r < size and 0 <= c < size):
+                                break
+                            side.append(r * size + c)
+                        sides.append(tuple(side))
+                    rays.append(tuple(sides))
+                self.rays.append(tuple(rays))
+
+        if size <= FULL_WIDTH_SIZE:
+            self.near = None
+        else:
+            self.near = [tuple(r * size + c
+                               for r in range(max(0, row - NEAR_RADIUS), min(size, row + NEAR_RADIUS + 1))
+                               for c in range(max(0, col - NEAR_RADIUS), min(size, col + NEAR_RADIUS + 1))
+                               if (r, c) != (row, col))
+                         for row in range(size) for col in range(size)]
+
+    def wins(self, cells, cell, mark):
+        """True if the mark just placed at cell completes a line"""
+        need = self.win_length
+        for forward, backward in self.rays[cell]:
+            count = 1
+            for other in forward:
+                if cells[other] != mark:
+                    break
+                count += 1
+            for other in backward:
+                if cells[other] != mark:
+                    break
+                count += 1
+            if count >= need:
+                return True
+        return False
+
+    def frontier(self, cells):
+        """Cells the tree considers in a position"""
+        empties = {cell for cell in range(self.cells) if not cells[cell]}
+        if self.near is None:
+            return empties
+        near = {cell for cell in empties if any(cells[other] for other in self.near[cell])}
+        if near:
+            return near
+        return {self.cells // 2} if len(empties) == self.cells else empties
+
+    def next_frontier(self, frontier, cells, cell):
+        """frontier after cell is played (cells already includes the move)"""
+        if self.near is None:
+            return frontier - {cell}
+        return (frontier - {cell}) | {other for other in self.near[cell] if not cells[other]}
+
+
+def board_cells(board):
+    """Flat bytearray of a Board: 0 empty, 1 for players[0], 2 for players[1]"""
+    cells = bytearray(board.size * board.size)
+    for row in range(board.size):
+        for col in range(board.size):
+            bit = 1 << board.index(row, col)
+            if board.bits[0] & bit:
+                cells[row * board.size + col] = 1
+            elif board.bits[1] & bit:
+                cells[row * board.size + col] = 2
+    return cells
+
+
+# ---------------------------
+# Search
+# ---------------------------
+class Node:
+    """A position in the tree, reached by move, scored for the side that played it"""
+    __slots__ = ("move", "parent", "children", "untried", "frontier", "visits", "wins", "mark", "terminal")
+
+    def __init__(self, move, parent, mark, frontier, terminal):
+        self.move = move
+        self.parent = parent
+        self.children = []
+        self.frontier = frontier
+        self.untried = [] if terminal else sorted(frontier)
+        self.visits = 0
+        self.wins = 0.0
+        self.mark = mark          # who played move
+        self.terminal = terminal  # 0 ongoing, else 1 / 2 winner or 3 draw
+
+    def select(self):
+        """Child with the best UCT score"""
+        log_visits = math.log(self.visits)
+        best, best_score = None, -1.0
+        for child in self.children:
+            score = child.wins / child.visits + EXPLORATION * math.sqrt(log_visits / child.visits)
+            if score > best_score:
+                best, best_score = child, score
+        return best
+
+
+def rollout(geometry, cells, empties, mark, rng):
+    """Play random moves to the end; returns the winning mark or 0 for a draw"""
+    cells = cells[:]
+    empties = empties[:]
+    wins = geometry.wins
+    random_index = rng.randrange
+    while empties:
+        i = random_index(len(empties))
+        cell = empties[i]
+        empties[i] = empties[-1]
+        empties.pop()
+        cells[cell] = mark
+        if wins(cells, cell, mark):
+            return mark
+        mark = 3 - mark
+    return 0
+
+
+def search(size, win_length, cells, mark, time_budget, playouts, seed, stop=None):
+    """One tree's search from a position; returns ({move: (visits, wins)}, playouts, seconds)
+
+    mark is the side to move (1 or 2). Runs until time_budget seconds or
+    playouts playouts, whichever comes first (either may be None), or until
+    stop (a threading.Event) is set.
+    """
+    geometry = Geometry(size, win_length)
+    rng = random.Random(seed)
+    root = Node(None, None, 3 - mark, geometry.frontier(cells), 0)
+    root_cells = bytearray(cells)
+    root_empties = [cell for cell in range(geometry.cells) if not cells[cell]]
+    limit = playouts or float("inf")
+    start = time.perf_counter()
+    deadline = start + time_budget if time_budget else float("inf")
+
+    done = 0
+    while done < limit:
+        if done % CLOCK_CHECK == 0 and (time.perf_counter() > deadline or stop and stop.is_set()):
+            break
+        node = root
+        cells = root_cells[:]
+        played = set()
+
+        # Selection
+        while not node.untried and node.children:
+            node = node.select()
+            cells[node.move] = node.mark
+            played.add(node.move)
+
+        # Expansion
+        if node.untried:
+            move = node.untried.pop(rng.randrange(len(node.untried)))
+            child_mark = 3 - node.mark
+            cells[move] = child_mark
+            played.add(move)
+            if geometry.wins(cells, move, child_mark):
+                terminal = child_mark
+            elif len(played) == len(root_empties):
+                terminal = 3
+            else:
+                terminal = 0
+            child = Node(move, node, child_mark, geometry.next_frontier(node.frontier, cells, move), terminal)
+            node.children.append(child)
+            node = child
+
+        # Simulation
+        if node.terminal:
+            winner = node.terminal if node.terminal != 3 else 0
+        else:
+            empties = [cell for cell in root_empties if cell not in played]
+            winner = rollout(geometry, cells, empties, 3 - node.mark, rng)
+
+        # Backpropagation
+        while node is not None:
+            node.visits += 1
+            if winner == node.mark:
+                node.wins += 1.0
+            elif winner == 0:
+                node.wins += 0.5
+            node = node.parent
+        done += 1
+
+    elapsed = time.perf_counter() - start
+    return {child.move: (child.visits, child.wins) for child in root.children}, done, elapsed
+
+
+def search_task(task):
+    """Pool entry point: search(*task)"""
+    return search(*task)
+
+
+class MCTSAI:
+    """Root-parallel UCT player for Board positions"""
+    def __init__(self, size, win_length=None, time_budget=1.0, playouts=None, workers=1, seed=0):
+        self.size = size
+        self.win_length = min(win_length or size, size)
+        self.time_budget = time_budget
+        self.playouts = playouts
+        self.workers = workers
+        self.seed = seed
+        self.geometry = Geometry(size, self.win_length)
+        self.pool = None
+        self.moves = 0
+        self.last_stats = MCTSStats(workers)
+
+    def close(self):
+        """Shut down the worker processes"""
+        if self.pool is not None:
+            self.pool.terminate()
+            self.pool.join()
+            self.pool = None
+
+    def choose_move(self, board, time_budget=None, playouts=None, progress=None, stop=None):
+        """Best (row, col) for the side to move; stats go to last_stats
+
+        time_budget is per move in seconds; playouts caps the playouts of
+        each worker. Each defaults to the value given at construction.
+        progress(move, playouts, win rate) is called with the result (the
+        win rate is None for a forced move), and setting stop (a
+        threading.Event) ends a single-worker search early; pool workers
+        always run to their budget.
+        """
+        if board.size != self.size:
+            raise ValueError(f"AI is set up for {self.size}x{self.size}, board is {board.size}x{board.size}")
+        budget = self.time_budget if time_budget is None else time_budget
+        playouts = self.playouts if playouts is None else playouts
+        stats = MCTSStats(self.workers)
+        self.last_stats = stats
+        start = time.perf_counter()
+
+        cells = board_cells(board)
+        mark = board.turn + 1
+        forced = self.forced_move(cells, mark)
+        if forced is not None:
+            stats.forced = True
+            stats.elapsed = time.perf_counter() - start
+            if progress:
+                progress(divmod(forced, self.size), 0, None)
+            return divmod(forced, self.size)
+
+        self.moves += 1
+        tasks = [(self.size, self.win_length, bytes(cells), mark, budget, playouts,
+                  self.seed * 1000003 + self.moves * 1009 + worker)
+                 for worker in range(self.workers)]
+        if self.workers == 1:
+            results = [search(*tasks[0], stop=stop)]
+        else:
+            if self.pool is None:
+                self.pool = multiprocessing.Pool(self.workers)
+            results = self.pool.map(search_task, tasks)
+
+        totals = {}
+        for children, done, elapsed in results:
+            stats.playouts += done
+            stats.worker_rates.append(done / elapsed if elapsed > 0 else 0.0)
+            for move, (visits, wins) in children.items():
+                merged = totals.setdefault(move, [0, 0.0])
+                merged[0] += visits
+                merged[1] += wins
+        stats.elapsed = time.perf_counter() - start
+
+        if not totals:
+            best = min(self.geometry.frontier(cells))
+        else:
+            best = max(totals, key=lambda move: (totals[move][0], totals[move][1]))
+            stats.visits, wins = totals[best]
+            stats.win_rate = wins / stats.visits
+        if progress:
+            progress(divmod(best, self.size), stats.playouts, stats.win_rate)
+        return divmod(best, self.size)
+
+    def forced_move(self, cells, mark):
+        """A winning cell for mark, else one that blocks the opponent's win, else None"""
+        geometry = self.geometry
+        frontier = sorted(geometry.frontier(cells))
+        for player in (mark, 3 - mark):
+            for cell in frontier:
+                cells[cell] = player
+                won = geometry.wins(cells, cell, player)
+                cells[cell] = 0
+                if won:
+                    return cell
+        return None
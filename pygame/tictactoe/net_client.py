@@ -0,0 +1,80 @@
+"""
+Tic Tac Toe network client
+A non-blocking connection to server.py for a game loop to poll once a frame.
+
+The socket never blocks the frame: sends are queued and flushed as the
+socket accepts them, and poll() returns whatever complete messages have
+arrived since the last call.
+"""
+
+import socket
+
+import protocol
+from protocol import encode
+
+
+class NetworkClient:
+    """One connection to a match server"""
+    def __init__(self, host, port, timeout=5.0):
+        self.sock = socket.create_connection((host, port), timeout=timeout)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.sock.setblocking(False)
+        self.inbox = bytearray()
+        self.outbox = bytearray()
+        self.seq = 0
+        self.connected = True
+
+    def send(self, data):
+        self.outbox += data
+        self.flush()
+
+    def flush(self):
+        """Write as much of the queued output as the socket takes"""
+        while self.outbox and self.connected:
+            try:
+                sent = self.sock.send(self.outbox)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError:
+                self.close()
+                return
+            del self.outbox[:sent]
+
+    def join(self, size, win_length):
+        self.send(encode(protocol.JOIN, size, win_length))
+
+    def send_move(self, row, col):
+        """Ask to play (row, col); returns the sequence number MOVED echoes"""
+        self.seq = (self.seq + 1) & 0xFFFFFFFF
+        self.send(encode(protocol.MOVE, row, col, self.seq))
+        return self.seq
+
+    def send_rematch(self):
+        self.send(encode(protocol.REMATCH))
+
+    def poll(self):
+        """Messages received since the last call, as decoded tuples"""
+        if not self.connected:
+            return []
+        self.flush()
+        while True:
+            try:
+                data = self.sock.recv(65536)
+            except (BlockingIOError, InterruptedError):
+                break
+            except OSError:
+                data = b""
+            if not data:
+                self.close()
+                break
+            self.inbox += data
+        try:
+            return protocol.decode(self.inbox)
+        except ValueError:
+            self.close()
+            return []
+
+    def close(self):
+        if self.connected:
+            self.connected = False
+            self.sock.close()
@@ -0,0 +1,243 @@
+"""
+Tic Tac Toe perfect-play table
+Every reachable 3x3 position with its game-theoretic value and best move.
+
+A position is indexed by its base-3 number, sum(cell * 3**i) over the nine
+cells (0 empty, 1 X, 2 O), so the table is a flat array of 3**9 = 19,683
+bytes: the low nibble is the best move (0-8, or 15 for none) and the high
+nibble the value for the side to move (LOSS, DRAW or WIN; 0 marks an
+unreachable index). Among equally valued moves the best one wins fastest
+or loses slowest.
+
+The table is generated by enumerating every position reachable from the
+empty board under the rules of tictactoe.py (check_winner, is_board_full)
+and solving them bottom up; --validate checks every entry against the
+independent negamax search in ai.py. PerfectTable memory-maps the file, and
+choose_move turns a Board's two bitboards into the index with two list
+lookups, so a computer move is one table read.
+
+Usage:
+    python perfect_table.py [--output perfect3.bin] [--validate]
+"""
+
+import argparse
+import mmap
+import os
+import struct
+import time
+
+HEADER = struct.Struct("<4sII")  # magic, version, entries
+MAGIC = b"TTT3"
+VERSION = 1
+CELLS = 9
+ENTRIES = 3 ** CELLS
+NO_MOVE = 15
+LOSS, DRAW, WIN = 1, 2, 3
+VALUE_NAMES = {LOSS: "loss", DRAW: "draw", WIN: "win"}
+
+TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "perfect3.bin")
+
+# Board bitboards use a row stride of 4 (one padding column), so 12 bits
+# cover a 3x3 board; BIT_WEIGHTS[bits] is the base-3 weight of those cells
+BIT_WEIGHTS = [sum(3 ** (row * 3 + col) for row in range(3) for col in range(3)
+                   if bits >> (row * 4 + col) & 1)
+               for bits in range(1 << 12)]
+
+
+# ---------------------------
+# Generation
+# ---------------------------
+def position_index(board):
+    """Base-3 index of a list of nine " ", "X", "O" cells"""
+    index = 0
+    for i, space in enumerate(board):
+        if space != " ":
+            index += (1 if space == "X" else 2) * 3 ** i
+    return index
+
+
+def generate():
+    """The table as a bytearray, and how many positions are reachable"""
+    from tictactoe import check_winner, is_board_full
+
+    table = bytearray(ENTRIES)
+    scores = {}  # index -> score for the side to move: +(10 - plies) for a win, 0 draw
+
+    def solve(board, player, plies):
+        index = position_index(board)
+        if index in scores:
+            return scores[index]
+        opponent = "O" if player == "X" else "X"
+        if check_winner(board, opponent):
+            score, move = -(10 - plies), NO_MOVE
+        elif is_board_full(board):
+            score, move = 0, NO_MOVE
+        else:
+            score, move = None, NO_MOVE
+            for cell in range(CELLS):
+                if board[cell] != " ":
+                    continue
+                board[cell] = player
+                child = -solve(board, opponent, plies + 1)
+                board[cell] = " "
+                if score is None or child > score:
+                    score, move = child, cell
+        value = WIN if score > 0 else LOSS if score < 0 else DRAW
+        table[index] = value << 4 | move
+        scores[index] = score
+        return score
+
+    solve([" "] * CELLS, "X", 0)
+    return table, len(scores)
+
+
+def write_table(path, table):
+    """Write the header and table, replacing path atomically"""
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(table)))
+        f.write(table)
+    os.replace(tmp, path)
+
+
+# ---------------------------
+# Lookup
+# ---------------------------
+class TableStats:
+    """What the last choose_move found"""
+    def __init__(self, value=None):
+        self.value = value
+
+    def __str__(self):
+        return f"table lookup, {VALUE_NAMES.get(self.value, 'unknown')} for the mover"
+
+
+class PerfectTable:
+    """Memory-mapped perfect-play table; plays 3x3 Board positions"""
+    def __init__(self, path=TABLE_PATH):
+        if not os.path.exists(path):
+            table, _ = generate()
+            write_table(path, table)
+        with open(path, "rb") as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, entries = HEADER.unpack_from(self.map)
+        if magic != MAGIC or version != VERSION or entries != ENTRIES:
+            self.map.close()
+            raise ValueError(f"{path} is not a version {VERSION} perfect-play table")
+        self.table = memoryview(self.map)[HEADER.size:HEADER.size + ENTRIES]
+        self.size = 3
+        self.last_stats = TableStats()
+
+    def close(self):
+        self.table.release()
+        self.map.close()
+
+    def lookup(self, index):
+        """(value, move) of a base-3 position index; move is None at the end"""
+        entry = self.table[index]
+        move = entry & 0x0F
+        return entry >> 4, None if move == NO_MOVE else move
+
+    def board_index(self, board):
+        """Base-3 index of a 3x3 Board from its bitboards"""
+        return BIT_WEIGHTS[board.bits[0]] + 2 * BIT_WEIGHTS[board.bits[1]]
+
+    def choose_move(self, board, time_budget=None, progress=None, stop=None):
+        """Best (row, col) for the side to move, by table lookup
+
+        The arguments a search takes are accepted and ignored, except that
+        progress(move, 9, value) is called with the answer.
+        """
+        if board.size != 3 or board.win_length != 3:
+            raise ValueError(f"the table covers 3x3 boards, not {board.size}x{board.size}")
+        value, move = self.lookup(self.board_index(board))
+        if not value or move is None:
+            raise ValueError("the position is finished or unreachable")
+        self.last_stats = TableStats(value)
+        if progress:
+            progress(divmod(move, 3), CELLS, value)
+        return divmod(move, 3)
+
+
+# ---------------------------
+# Validation
+# ---------------------------
+def validate(table):
+    """Check every reachable entry against negamax; returns the mismatches"""
+    from ai import NegamaxAI
+    from board import Board
+    from tictactoe import check_winner, is_board_full
+
+    search = NegamaxAI(3, time_budget=None)
+    errors = []
+    for index in range(ENTRIES):
+        entry = table[index]
+        if not entry:
+            continue
+        value, move = entry >> 4, entry & 0x0F
+        cells = [index // 3 ** i % 3 for i in range(CELLS)]
+
+        if move == NO_MOVE:
+            spaces = [" XO"[cell] for cell in cells]
+            if not (check_winner(spaces, "X") or check_winner(spaces, "O") or is_board_full(spaces)):
+                errors.append((index, "no move in an unfinished position"))
+            continue
+
+        # Replay the position; with no line on the board any order is legal
+        board = Board(3)
+        xs = [i for i in range(CELLS) if cells[i] == 1]
+        os_ = [i for i in range(CELLS) if cells[i] == 2]
+        for turn in range(len(xs) + len(os_)):
+            board.play(*divmod((xs if turn % 2 == 0 else os_)[turn // 2], 3))
+
+        search.choose_move(board)
+        score = search.last_stats.score
+        expected = WIN if score > 0 else LOSS if score < 0 else DRAW
+        if expected != value:
+            errors.append((index, f"value {VALUE_NAMES[value]}, search says {VALUE_NAMES[expected]}"))
+            continue
+        if cells[move]:
+            errors.append((index, f"best move {move} is taken"))
+            continue
+        # The stored move must keep the value: a win stays a win, and so on
+        if board.play(*divmod(move, 3)):
+            achieved = WIN
+        elif board.is_full():
+            achieved = DRAW
+        else:
+            search.choose_move(board)
+            reply = search.last_stats.score
+            achieved = LOSS if reply > 0 else WIN if reply < 0 else DRAW
+        if achieved != value:
+            errors.append((index, f"best move {move} only reaches a {VALUE_NAMES[achieved]}"))
+    return errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate the 3x3 perfect-play table")
+    parser.add_argument("--output", default=TABLE_PATH)
+    parser.add_argument("--validate", action="store_true", help="check every entry with negamax")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    table, positions = generate()
+    write_table(args.output, table)
+    print(f"{positions:,} reachable positions solved in {time.perf_counter() - start:.2f} s, "
+          f"wrote {args.output} ({HEADER.size + len(table):,} bytes)")
+    values = [table[i] >> 4 for i in range(ENTRIES) if table[i]]
+    print("values for the side to move: " +
+          ", ".join(f"{values.count(v):,} {VALUE_NAMES[v]}" for v in (WIN, DRAW, LOSS)))
+
+    if args.validate:
+        start = time.perf_counter()
+        errors = validate(table)
+        for index, problem in errors[:20]:
+            print(f"position {index}: {problem}")
+        print(f"validated {len(values):,} positions against negamax in "
+              f"{time.perf_counter() - start:.1f} s: {len(errors)} mismatches")
+        if errors:
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Tic Tac Toe network protocol
+Fixed-size binary messages shared by server.py, loadtest.py and the
+network client of tictactoe_modern.py.
+
+The first byte of every message is its type, and the type fixes the size,
+so messages need no length prefix. Multi-byte fields are little endian.
+
+Client -> server
+    JOIN      size u8, win_length u8         wait for an opponent on that board
+    MOVE      row u8, col u8, seq u32        play a move; seq comes back in MOVED
+    REMATCH                                  ready for the next game of the match
+
+Server -> client
+    START     match u32, mark u8, size u8, win_length u8
+                                             a game begins; mark 0 is X, 1 is O
+    MOVED     mark u8, row u8, col u8, seq u32
+                                             a move was accepted, sent to both
+    ERROR     code u8, seq u32               a message was rejected
+    END       result u8, x u16, o u16, draws u16
+                                             the game is over; match scores
+"""
+
+import struct
+
+# Message types
+JOIN = 0x01
+MOVE = 0x02
+REMATCH = 0x03
+START = 0x81
+MOVED = 0x82
+ERROR = 0x83
+END = 0x84
+
+MESSAGES = {
+    JOIN: struct.Struct("<BBB"),
+    MOVE: struct.Struct("<BBBI"),
+    REMATCH: struct.Struct("<B"),
+    START: struct.Struct("<BIBBB"),
+    MOVED: struct.Struct("<BBBBI"),
+    ERROR: struct.Struct("<BBI"),
+    END: struct.Struct("<BBHHH"),
+}
+
+# ERROR codes
+NOT_IN_MATCH = 1
+NOT_YOUR_TURN = 2
+ILLEGAL_MOVE = 3
+GAME_OVER = 4
+BAD_MESSAGE = 5
+BAD_BOARD = 6
+
+# END results: the winner's mark, or one of these
+DRAW = 2
+OPPONENT_LEFT = 3
+
+MIN_SIZE = 3
+MAX_SIZE = 19
+
+
+def encode(kind, *fields):
+    """One message as bytes"""
+    return MESSAGES[kind].pack(kind, *fields)
+
+
+def decode(buffer):
+    """Split complete messages off the front of a bytearray
+
+    Returns a list of field tuples (type first) and removes them from the
+    buffer; a trailing partial message is left for the next call. Raises
+    ValueError on an unknown message type.
+    """
+    messages = []
+    offset = 0
+    end = len(buffer)
+    while offset < end:
+        message = MESSAGES.get(buffer[offset])
+        if message is None:
+            raise ValueError(f"unknown message type {buffer[offset]:#x}")
+        if offset + message.size > end:
+            break
+        messages.append(message.unpack_from(buffer, offset))
+        offset += message.size
+    del buffer[:offset]
+    return messages
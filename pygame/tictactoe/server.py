@@ -0,0 +1,231 @@
+"""
+Tic Tac Toe match server
+Hosts head-to-head matches over TCP with the binary protocol in protocol.py.
+
+Players send JOIN with a board size and are paired with the next player
+waiting for the same board. Each match holds a Board engine, so moves are
+validated and wins and draws detected with the same rules as the local
+games, and keeps a scores dict across the games of the match. After a game
+ends both players send REMATCH to start the next one.
+
+Connections are asyncio Protocols that decode messages straight out of
+their receive buffer; per-connection and per-match state lives in small
+__slots__ objects so a single process can hold many thousands of matches.
+
+Usage:
+    python server.py [--host 127.0.0.1] [--port 8765] [--stats 5]
+"""
+
+import argparse
+import asyncio
+import itertools
+import time
+
+import protocol
+from board import Board
+from protocol import encode
+
+
+class Player:
+    """One connection and the match it is in"""
+    __slots__ = ("transport", "match", "mark", "board_key", "rematch")
+
+    def __init__(self, transport):
+        self.transport = transport
+        self.match = None
+        self.mark = None
+        self.board_key = None
+        self.rematch = False
+
+    def send(self, data):
+        self.transport.write(data)
+
+
+class Match:
+    """Two players, their board and the running score"""
+    __slots__ = ("match_id", "board", "players", "scores", "over")
+
+    def __init__(self, match_id, board, players):
+        self.match_id = match_id
+        self.board = board
+        self.players = players
+        self.scores = {'X': 0, 'O': 0, 'Draw': 0}
+        self.over = False
+
+    def broadcast(self, data):
+        for player in self.players:
+            player.send(data)
+
+    def start(self):
+        self.board.reset()
+        self.over = False
+        size, win_length = self.board.size, self.board.win_length
+        for mark, player in enumerate(self.players):
+            player.rematch = False
+            player.send(encode(protocol.START, self.match_id, mark, size, win_length))
+
+
+class GameServer:
+    """Matchmaking and move handling, independent of the transport"""
+    def __init__(self):
+        self.waiting = {}  # (size, win_length) -> Player waiting for an opponent
+        self.matches = {}
+        self.match_ids = itertools.count(1)
+        self.moves = 0
+        self.games = 0
+
+    def handle(self, player, message):
+        kind = message[0]
+        if kind == protocol.MOVE:
+            self.move(player, *message[1:])
+        elif kind == protocol.JOIN:
+            self.join(player, *message[1:])
+        elif kind == protocol.REMATCH:
+            self.rematch(player)
+        else:
+            player.send(encode(protocol.ERROR, protocol.BAD_MESSAGE, 0))
+
+    def join(self, player, size, win_length):
+        if player.match is not None or player.board_key is not None:
+            player.send(encode(protocol.ERROR, protocol.BAD_MESSAGE, 0))
+            return
+        if not (protocol.MIN_SIZE <= size <= protocol.MAX_SIZE and 3 <= win_length <= size):
+            player.send(encode(protocol.ERROR, protocol.BAD_BOARD, 0))
+            return
+
+        key = (size, win_length)
+        opponent = self.waiting.pop(key, None)
+        if opponent is None:
+            player.board_key = key
+            self.waiting[key] = player
+            return
+
+        opponent.board_key = None
+        match = Match(next(self.match_ids), Board(size, win_length), (opponent, player))
+        for mark, member in enumerate(match.players):
+            member.match = match
+            member.mark = mark
+        self.matches[match.match_id] = match
+        match.start()
+
+    def move(self, player, row, col, seq):
+        match = player.match
+        if match is None:
+            player.send(encode(protocol.ERROR, protocol.NOT_IN_MATCH, seq))
+            return
+        if match.over:
+            player.send(encode(protocol.ERROR, protocol.GAME_OVER, seq))
+            return
+        board = match.board
+        if board.turn != player.mark:
+            player.send(encode(protocol.ERROR, protocol.NOT_YOUR_TURN, seq))
+            return
+        try:
+            won = board.play(row, col)
+        except ValueError:
+            player.send(encode(protocol.ERROR, protocol.ILLEGAL_MOVE, seq))
+            return
+
+        self.moves += 1
+        match.broadcast(encode(protocol.MOVED, player.mark, row, col, seq))
+        if won:
+            match.scores[board.players[player.mark]] += 1
+            self.finish(match, player.mark)
+        elif board.is_full():
+            match.scores['Draw'] += 1
+            self.finish(match, protocol.DRAW)
+
+    def finish(self, match, result):
+        match.over = True
+        self.games += 1
+        scores = match.scores
+        match.broadcast(encode(protocol.END, result, scores['X'], scores['O'], scores['Draw']))
+
+    def rematch(self, player):
+        match = player.match
+        if match is None or not match.over:
+            player.send(encode(protocol.ERROR, protocol.BAD_MESSAGE, 0))
+            return
+        player.rematch = True
+        if all(member.rematch for member in match.players):
+            match.start()
+
+    def leave(self, player):
+        if player.board_key is not None:
+            if self.waiting.get(player.board_key) is player:
+                del self.waiting[player.board_key]
+            player.board_key = None
+        match = player.match
+        if match is None:
+            return
+        self.matches.pop(match.match_id, None)
+        scores = match.scores
+        for member in match.players:
+            member.match = None
+            if member is not player:
+                member.send(encode(protocol.END, protocol.OPPONENT_LEFT,
+                                   scores['X'], scores['O'], scores['Draw']))
+
+
+class ServerProtocol(asyncio.Protocol):
+    """Feeds one connection's messages to the GameServer"""
+    def __init__(self, server):
+        self.server = server
+        self.buffer = bytearray()
+        self.player = None
+
+    def connection_made(self, transport):
+        self.player = Player(transport)
+
+    def data_received(self, data):
+        self.buffer += data
+        try:
+            messages = protocol.decode(self.buffer)
+        except ValueError:
+            self.player.transport.close()
+            return
+        for message in messages:
+            self.server.handle(self.player, message)
+
+    def connection_lost(self, exc):
+        self.server.leave(self.player)
+
+
+async def serve(host="127.0.0.1", port=8765, stats_interval=0, ready=None):
+    """Run a server until cancelled; ready(port) is called once listening"""
+    server = GameServer()
+    loop = asyncio.get_running_loop()
+    listener = await loop.create_server(lambda: ServerProtocol(server), host, port, backlog=4096)
+    bound_port = listener.sockets[0].getsockname()[1]
+    print(f"serving on {host}:{bound_port}", flush=True)
+    if ready:
+        ready(bound_port)
+
+    async with listener:
+        if not stats_interval:
+            await listener.serve_forever()
+        last_moves = 0
+        last_time = time.perf_counter()
+        while True:
+            await asyncio.sleep(stats_interval)
+            now = time.perf_counter()
+            rate = (server.moves - last_moves) / (now - last_time)
+            print(f"{len(server.matches)} matches, {len(server.waiting)} waiting, "
+                  f"{server.games} games, {rate:,.0f} moves/s", flush=True)
+            last_moves, last_time = server.moves, now
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tic Tac Toe match server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--stats", type=float, default=0, help="print stats every N seconds")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.stats))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
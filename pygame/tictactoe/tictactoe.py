@@ -1,8 +1,29 @@
 """
 Tic Tac Toe Game
-A simple two-player Tic Tac Toe game in Python
+A simple Tic Tac Toe game in Python, for two players or against the computer
+
+Streaming mode adjudicates recorded games without playing them:
+    python tictactoe.py --stream games.txt > results.txt
+    python tictactoe.py --stream - < games.txt
+Each input line is one game, its moves as the digits 1-9 used at the
+prompt (spaces and commas are ignored). Each output line is
+"<winner> <plies> <illegal>": X, O, D for a draw or - for an unfinished
+game; how many legal moves were played; and the 1-based index of the
+first illegal move (a taken square, a bad character, or any move after
+the game ended), or 0. Totals go to stderr.
 """
 
+import argparse
+import sys
+import time
+
+from board import Board, winning_lines
+from perfect_table import PerfectTable
+
+# Every winning line as a bitmask over the 9 board positions
+WIN_MASKS = [sum(1 << i for i in line) for line in winning_lines(3)]
+
+
 def print_board(board):
     """Display the current game board"""
     print("\n")
@@ -15,18 +36,9 @@ def print_board(board):
 
 
 def check_winner(board, player):
-    """Check if the specified player has won"""
-    # All possible winning combinations
-    win_conditions = [
-        [0, 1, 2], [3, 4, 5], [6, 7, 8],  # Rows
-        [0, 3, 6], [1, 4, 7], [2, 5, 8],  # Columns
-        [0, 4, 8], [2, 4, 6]              # Diagonals
-    ]
-    
-    for condition in win_conditions:
-        if all(board[i] == player for i in condition):
-            return True
-    return False
+    """Check if the specified player has won anywhere on the board"""
+    marks = sum(1 << i for i, space in enumerate(board) if space == player)
+    return any(marks & mask == mask for mask in WIN_MASKS)
 
 
 def is_board_full(board):
@@ -34,6 +46,76 @@ def is_board_full(board):
     return all(space != " " for space in board)
 
 
+# ---------------------------
+# Streaming
+# ---------------------------
+# HAS_LINE[marks] is True if the 9-bit set of one player's marks holds a line;
+# it is check_winner evaluated once for every possible set of marks
+HAS_LINE = [check_winner(["X" if marks >> i & 1 else " " for i in range(9)], "X")
+            for marks in range(512)]
+SQUARE_BITS = {str(i + 1): 1 << i for i in range(9)}
+SEPARATORS = str.maketrans("", "", " \t,\r\n")
+FULL = (1 << 9) - 1
+
+
+def read_games(stream):
+    """Move strings of the non-blank lines of a text stream"""
+    for line in stream:
+        moves = line.translate(SEPARATORS)
+        if moves:
+            yield moves
+
+
+def adjudicate(moves):
+    """(winner, plies, illegal index) of one game's move string"""
+    marks = [0, 0]
+    taken = 0
+    winner = "-"
+    for ply, square in enumerate(moves):
+        bit = SQUARE_BITS.get(square)
+        if bit is None or taken & bit or winner != "-":
+            return winner, ply, ply + 1
+        player = ply & 1
+        marks[player] |= bit
+        taken |= bit
+        if HAS_LINE[marks[player]]:
+            winner = "XO"[player]
+        elif taken == FULL:
+            winner = "D"
+    return winner, len(moves), 0
+
+
+def stream_results(games):
+    """Adjudicate a stream of move strings; yields (winner, plies, illegal)"""
+    for moves in games:
+        yield adjudicate(moves)
+
+
+def run_stream(source, output=sys.stdout, chunk=8192):
+    """Adjudicate every game in source and write one result line per game"""
+    counts = {"X": 0, "O": 0, "D": 0, "-": 0}
+    illegal_games = 0
+    games = 0
+    start = time.perf_counter()
+    lines = []
+    for winner, plies, illegal in stream_results(read_games(source)):
+        counts[winner] += 1
+        illegal_games += illegal != 0
+        lines.append(f"{winner} {plies} {illegal}\n")
+        if len(lines) >= chunk:
+            output.writelines(lines)
+            games += len(lines)
+            lines = []
+    output.writelines(lines)
+    games += len(lines)
+    elapsed = time.perf_counter() - start
+    rate = games / elapsed * 60 if elapsed > 0 else 0.0
+    print(f"{games:,} games: X {counts['X']:,}, O {counts['O']:,}, draws {counts['D']:,}, "
+          f"unfinished {counts['-']:,}, {illegal_games:,} with an illegal move "
+          f"({elapsed:.2f} s, {rate:,.0f} games/min)", file=sys.stderr)
+    return counts
+
+
 def get_player_move(board, player):
     """Get and validate player input"""
     while True:
@@ -57,10 +139,11 @@ def get_player_move(board, player):
             exit()
 
 
-def play_game():
-    """Main game loop"""
+def play_game(ai=None, ai_player=None):
+    """Main game loop; ai plays ai_player's moves when given"""
     # Initialize the board
     board = [" " for _ in range(9)]
+    state = Board(3)  # incremental win detection for the moves played
     current_player = "X"
     
     print("=" * 30)
@@ -78,17 +161,22 @@ def play_game():
         print_board(board)
         
         # Get player move
-        move = get_player_move(board, current_player)
+        if current_player == ai_player:
+            row, col = ai.choose_move(state)
+            move = row * 3 + col
+            print(f"Computer plays {move + 1} ({ai.last_stats})")
+        else:
+            move = get_player_move(board, current_player)
         board[move] = current_player
         
-        # Check for winner
-        if check_winner(board, current_player):
+        # Check for winner (only the lines through this move)
+        if state.play(move // 3, move % 3):
             print_board(board)
             print(f"🎉 Congratulations! Player {current_player} wins! 🎉")
             break
         
         # Check for draw
-        if is_board_full(board):
+        if state.is_full():
             print_board(board)
             print("It's a draw! Well played both players!")
             break
@@ -99,8 +187,23 @@ def play_game():
 
 def main():
     """Main function to handle game replay"""
+    parser = argparse.ArgumentParser(description="Tic Tac Toe")
+    parser.add_argument("--stream", metavar="PATH", type=argparse.FileType("r"),
+                        help="adjudicate one game per line from PATH ('-' for stdin) instead of playing")
+    args = parser.parse_args()
+    if args.stream:
+        # argparse opened it, or reported a path it could not open
+        with args.stream as source:
+            run_stream(source)
+        return
+
+    ai = PerfectTable()  # solved 3x3: every computer move is one lookup
     while True:
-        play_game()
+        opponent = input("Play against the computer? (yes/no): ").lower()
+        if opponent in ["yes", "y"]:
+            play_game(ai, "O")
+        else:
+            play_game()
         
         # Ask if players want to play again
         play_again = input("\nWould you like to play again? (yes/no): ").lower()
@@ -6,26 +6,54 @@ Features: Matrix effects, glitch animations, binary rain, neon glow, terminal ae
 Controls:
 - Mouse Click: Place mark
 - SPACE: Restart game
+- A: Toggle the computer opponent (plays O)
 - Q: Quit game
+
+Network play: python tictactoe_modern.py --connect HOST:PORT joins a match
+on a server.py server; SPACE or the restart button then asks for a rematch.
 """
 
 import pygame
+import argparse
+import os
 import sys
 import math
 import random
 
+import numpy as np
+
+# Shared helpers live in pygame/common
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "common"))
+
+import profiler
+import protocol
+from ai import NegamaxAI
+from ai_service import AIService, FrameWatch
+from board import PLAYERS, Board, winning_lines
+from compositor import Compositor, shift_rows
+from game_loop import GameLoop
+from glow_cache import GlowCache, flatten_layers
+from mcts import MCTSAI
+from net_client import NetworkClient
+from perfect_table import PerfectTable
+from quality import QualityGovernor
+from replay import AI, QUALITY, Recorder, digest
+from text_cache import TextCache
+
 # Initialize pygame
 pygame.init()
 
 # Constants
 WIDTH, HEIGHT = 600, 700
 GRID_SIZE = 3
+WIN_LENGTH = 3  # marks in a row needed to win
 CELL_SIZE = 180
 GRID_OFFSET_X = 30
 GRID_OFFSET_Y = 130
 LINE_WIDTH = 5
 MARK_SIZE = 60
 FPS = 60
+TICK_RATE = 60  # fixed simulation ticks per second; animation steps are per tick
 
 # Colors - Cyberpunk/Hacker Theme
 BG_COLOR = (10, 10, 20)  # Almost black
@@ -41,6 +69,20 @@ BUTTON_HOVER_COLOR = (40, 100, 120)
 PARTICLE_COLORS = [(0, 255, 100), (0, 255, 255), (255, 0, 255), (255, 255, 0)]
 BINARY_COLOR = (0, 200, 100)  # Matrix green
 SCANLINE_COLOR = (0, 255, 170, 20)  # Transparent cyan
+BINARY_DIGITS = 30
+BINARY_ALPHAS = (50, 70, 90, 110, 130, 150)  # pre-rendered alpha levels
+SCANLINE_SPACING = 4
+
+# Visual quality tiers, lowest first; the governor drops a tier when frames
+# run over budget. "high" is the full effect set.
+QUALITY_TIERS = [
+    {"name": "low", "glow": 0, "particles": 20, "particle_glow": False,
+     "binary_digits": 0, "scanline_spacing": 0, "glitch": 0.0},
+    {"name": "medium", "glow": 1, "particles": 40, "particle_glow": False,
+     "binary_digits": 15, "scanline_spacing": 8, "glitch": 0.5},
+    {"name": "high", "glow": 3, "particles": 100, "particle_glow": True,
+     "binary_digits": BINARY_DIGITS, "scanline_spacing": SCANLINE_SPACING, "glitch": 1.0},
+]
 
 # Fonts (using monospace for that terminal feel)
 try:
@@ -58,51 +100,257 @@ except:
     BINARY_FONT = pygame.font.Font(None, 16)
     HINT_FONT = pygame.font.Font(None, 20)
 
+# Every label goes through one cache so steady-state frames never rasterize
+TEXT_CACHE = TextCache(capacity=512)
 
-class BinaryDigit:
-    """Falling binary digits for matrix effect"""
-    def __init__(self):
-        self.x = random.randint(0, WIDTH)
-        self.y = random.randint(-HEIGHT, 0)
-        self.speed = random.uniform(1, 3)
-        self.value = random.choice(['0', '1'])
-        self.alpha = random.randint(50, 150)
+# Neon shapes are baked once into glow sprites
+GLOW_CACHE = GlowCache(max_bytes=16 * 1024 * 1024)
+SCALE_STEPS = 20  # mark scales are quantized to 1/20 steps
+MARK_WIDTH = 8
+AI_TIME_BUDGET = 0.5  # seconds per computer move on boards too big to solve
+NEGAMAX_MAX_SIZE = 4  # bigger boards are played by MCTS on every core
+
+
+def bounce_scale(t):
+    """Elastic bounce used when a new mark appears"""
+    return t if t < 0.5 else 1.0 - 0.2 * math.sin((t - 0.5) * 10)
+
+
+def pulse_color(color, pulse):
+    """Brighten or dim a color by pulse, clamped to 0-255"""
+    return tuple(int(min(255, max(0, channel + pulse))) for channel in color)
+
+
+def build_x_sprite(scale, color, glow=3):
+    """Bake an X and its glow layers (three at full quality) into one sprite"""
+    size = MARK_SIZE * scale
+    offset = int(size + 20)
+
+    def layer(width):
+        def draw(surface):
+            pygame.draw.line(surface, (255, 255, 255),
+                             (offset - size, offset - size), (offset + size, offset + size), width)
+            pygame.draw.line(surface, (255, 255, 255),
+                             (offset + size, offset - size), (offset - size, offset + size), width)
+        return draw
+
+    layers = [(80 - level * 25, layer(MARK_WIDTH + level * 4)) for level in range(glow)]
+    layers.append((255, layer(MARK_WIDTH)))
+    sprite = flatten_layers((offset * 2 + 1, offset * 2 + 1), color, layers)
+    return sprite, (-offset, -offset)
+
+
+def build_o_sprite(scale, color, glow=3):
+    """Bake an O and its glow layers (three at full quality) into one sprite"""
+    radius = int(MARK_SIZE * scale)
+    offset = radius + 20
+
+    def layer(ring_radius, width):
+        def draw(surface):
+            pygame.draw.circle(surface, (255, 255, 255), (offset, offset), ring_radius, width)
+        return draw
+
+    layers = [(80 - level * 25, layer(radius + level * 2, MARK_WIDTH + level * 4)) for level in range(glow)]
+    layers.append((255, layer(radius, MARK_WIDTH)))
+    sprite = flatten_layers((offset * 2, offset * 2), color, layers)
+    return sprite, (-offset, -offset)
+
+
+def build_grid_line_sprite(vertical, color, glow=3):
+    """Bake one grid line and its glow strips into one sprite"""
+    length = CELL_SIZE * GRID_SIZE
+    pad = LINE_WIDTH  # room for the main line on either side of its axis
+
+    def strip(offset):
+        def draw(surface):
+            start = pad - offset + LINE_WIDTH // 2
+            if vertical:
+                surface.fill((255, 255, 255), (start, pad, LINE_WIDTH + offset * 2, length))
+            else:
+                surface.fill((255, 255, 255), (pad, start, length, LINE_WIDTH + offset * 2))
+        return draw
+
+    def main_line(surface):
+        if vertical:
+            pygame.draw.line(surface, (255, 255, 255), (pad, pad), (pad, pad + length), LINE_WIDTH)
+        else:
+            pygame.draw.line(surface, (255, 255, 255), (pad, pad), (pad + length, pad), LINE_WIDTH)
+
+    layers = [(100 - offset * 30, strip(offset)) for offset in range(glow)]
+    layers.append((255, main_line))
+    thickness = pad * 2 + LINE_WIDTH + 4
+    size = (thickness, length + pad * 2) if vertical else (length + pad * 2, thickness)
+    return flatten_layers(size, color, layers), (-pad, -pad)
+
+
+def build_hover_sprite(size=(CELL_SIZE, CELL_SIZE)):
+    """Translucent cell (or button) highlight"""
+    sprite = pygame.Surface(size)
+    sprite.fill(O_COLOR)
+    sprite.set_alpha(30)
+    return sprite, (0, 0)
+
+
+WIN_LINE_WIDTH = 12
+WIN_LINE_PAD = (WIN_LINE_WIDTH + 3 * 6) // 2 + 2  # widest glow layer plus slack
+
+
+def winning_line_endpoints(winning_line):
+    """Screen coordinates of the start and end of a winning line
+
+    winning_line is the ((row, col), (row, col)) pair of end cells reported
+    by the board engine; the line overshoots both cell centers.
+    """
+    (start_row, start_col), (end_row, end_col) = winning_line
+    d_row = (end_row > start_row) - (end_row < start_row)
+    d_col = (end_col > start_col) - (end_col < start_col)
+    overshoot = CELL_SIZE // 2 - 20
+
+    start_x = GRID_OFFSET_X + start_col * CELL_SIZE + CELL_SIZE // 2 - d_col * overshoot
+    start_y = GRID_OFFSET_Y + start_row * CELL_SIZE + CELL_SIZE // 2 - d_row * overshoot
+    end_x = GRID_OFFSET_X + end_col * CELL_SIZE + CELL_SIZE // 2 + d_col * overshoot
+    end_y = GRID_OFFSET_Y + end_row * CELL_SIZE + CELL_SIZE // 2 + d_row * overshoot
+    return (start_x, start_y), (end_x, end_y)
+
+
+def build_winning_line_sprite(winning_line, color, glow=3):
+    """Bake a full winning line and its glow into a tight bounding-box sprite"""
+    (start_x, start_y), (end_x, end_y) = winning_line_endpoints(winning_line)
+    left = min(start_x, end_x) - WIN_LINE_PAD
+    top = min(start_y, end_y) - WIN_LINE_PAD
+    size = (abs(end_x - start_x) + WIN_LINE_PAD * 2, abs(end_y - start_y) + WIN_LINE_PAD * 2)
+    start = (start_x - left, start_y - top)
+    end = (end_x - left, end_y - top)
+
+    def layer(width):
+        def draw(surface):
+            pygame.draw.line(surface, (255, 255, 255), start, end, width)
+        return draw
+
+    # glow layers only; the main line covers a level-0 layer exactly
+    layers = [(100 - level * 25, layer(WIN_LINE_WIDTH + level * 6)) for level in range(1, glow + 1)]
+    layers.append((255, layer(WIN_LINE_WIDTH)))
+    return flatten_layers(size, color, layers), (left, top)
+
+
+def make_ai():
+    """Computer player for the configured board"""
+    if GRID_SIZE == 3 and WIN_LENGTH == 3:
+        return PerfectTable()
+    if GRID_SIZE <= NEGAMAX_MAX_SIZE:
+        return NegamaxAI(GRID_SIZE, WIN_LENGTH, time_budget=AI_TIME_BUDGET)
+    return MCTSAI(GRID_SIZE, WIN_LENGTH, time_budget=AI_TIME_BUDGET, workers=os.cpu_count() or 1)
+
+
+def reveal_span(start, current, end, pad_end=False):
+    """Visible range on one axis of a partly drawn winning line
+
+    The line's thickness is padded on the start side and across the line.
+    Past the current end point it is only padded when asked: thick diagonal
+    lines are widened horizontally, so their x range gets pad_end while the
+    y range clips the part of the line still to be drawn.
+    """
+    end_pad = WIN_LINE_PAD if pad_end else 0
+    if start == end:
+        return start - WIN_LINE_PAD, end + WIN_LINE_PAD
+    if start < end:
+        return start - WIN_LINE_PAD, current + end_pad
+    return current - end_pad, start + WIN_LINE_PAD
+
+
+def all_winning_lines():
+    """Every winning line on the board as engine-style end cell pairs"""
+    return [(divmod(line[0], GRID_SIZE), divmod(line[-1], GRID_SIZE))
+            for line in winning_lines(GRID_SIZE, WIN_LENGTH)]
+
+
+class BinaryRain:
+    """Falling binary digits for matrix effect
+
+    The digit field is stored as NumPy arrays and moved in one vectorized
+    step. Each digit is a blit of one of two glyphs pre-rendered at a few
+    alpha levels, so thousands of digits cost no font rendering.
+    """
+    def __init__(self, count=BINARY_DIGITS, seed=None):
+        self.rng = np.random.default_rng(seed)
+        self.sprites = [TEXT_CACHE.render(BINARY_FONT, value, True, BINARY_COLOR, alpha)
+                        for value in '01' for alpha in BINARY_ALPHAS]
+        self.x = np.zeros(0)
+        self.y = np.zeros(0)
+        self.speed = np.zeros(0)
+        self.glyph = np.zeros(0, dtype=np.int64)
+        self.resize(count)
+
+    def __len__(self):
+        return len(self.x)
+
+    def resize(self, count):
+        """Grow or shrink the digit field to count digits"""
+        current = len(self.x)
+        if count <= current:
+            self.x = self.x[:count]
+            self.y = self.y[:count]
+            self.speed = self.speed[:count]
+            self.glyph = self.glyph[:count]
+            return
+
+        new = count - current
+        self.x = np.concatenate([self.x, self.rng.integers(0, WIDTH + 1, new).astype(np.float64)])
+        self.y = np.concatenate([self.y, self.rng.integers(-HEIGHT, 1, new).astype(np.float64)])
+        self.speed = np.concatenate([self.speed, self.rng.uniform(1, 3, new)])
+        self.glyph = np.concatenate([self.glyph, self.rng.integers(0, len(self.sprites), new)])
 
     def update(self):
         self.y += self.speed
-        if self.y > HEIGHT:
-            self.y = random.randint(-50, 0)
-            self.x = random.randint(0, WIDTH)
-            self.value = random.choice(['0', '1'])
-
-    def draw(self, screen):
-        text = BINARY_FONT.render(self.value, True, BINARY_COLOR)
-        text.set_alpha(self.alpha)
-        screen.blit(text, (self.x, self.y))
+        fallen = np.flatnonzero(self.y > HEIGHT)
+        if len(fallen):
+            # Respawn at the top with a new column and digit, keeping alpha
+            levels = len(BINARY_ALPHAS)
+            self.y[fallen] = self.rng.integers(-50, 1, len(fallen))
+            self.x[fallen] = self.rng.integers(0, WIDTH + 1, len(fallen))
+            self.glyph[fallen] = (self.rng.integers(0, 2, len(fallen)) * levels
+                                  + self.glyph[fallen] % levels)
+
+    def draw(self, screen, blend=1.0):
+        """Draw the digits blend of the way from their last tick to this one"""
+        y = self.y - self.speed * (1 - blend) if blend < 1 else self.y
+        sprites = map(self.sprites.__getitem__, self.glyph.tolist())
+        positions = zip(self.x.astype(np.int32).tolist(), y.astype(np.int32).tolist())
+        screen.blits(zip(sprites, positions), doreturn=False)
+
+
+def build_scanline_overlay(spacing=SCANLINE_SPACING):
+    """One tall overlay holding every scanline, scrolled instead of redrawn"""
+    if not spacing:
+        return None
+    overlay = pygame.Surface((WIDTH, HEIGHT + spacing), pygame.SRCALPHA)
+    for y in range(0, HEIGHT + spacing, spacing):
+        overlay.fill(SCANLINE_COLOR, (0, y, WIDTH, 2))
+    return overlay
 
 
 class Particle:
     """Particle effect for celebrations"""
-    def __init__(self, x, y, particle_type='explosion'):
+    def __init__(self, x, y, particle_type='explosion', rng=random):
         self.x = x
         self.y = y
         self.particle_type = particle_type
 
         if particle_type == 'explosion':
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(2, 8)
+            angle = rng.uniform(0, 2 * math.pi)
+            speed = rng.uniform(2, 8)
             self.vx = math.cos(angle) * speed
             self.vy = math.sin(angle) * speed
             self.gravity = 0.2
         else:  # sparkle
-            self.vx = random.uniform(-2, 2)
-            self.vy = random.uniform(-5, -1)
+            self.vx = rng.uniform(-2, 2)
+            self.vy = rng.uniform(-5, -1)
             self.gravity = 0.1
 
-        self.lifetime = random.randint(40, 80)
+        self.lifetime = rng.randint(40, 80)
         self.age = 0
-        self.color = random.choice(PARTICLE_COLORS)
-        self.size = random.randint(3, 7)
+        self.color = rng.choice(PARTICLE_COLORS)
+        self.size = rng.randint(3, 7)
 
     def update(self):
         self.vy += self.gravity
@@ -110,9 +358,12 @@ class Particle:
         self.y += self.vy
         self.age += 1
 
-    def draw(self, screen):
+    def draw(self, screen, glow=True, blend=1.0):
+        """Draw the particle blend of the way from its last tick to this one"""
+        x = int(self.x - self.vx * (1 - blend))
+        y = int(self.y - self.vy * (1 - blend))
         alpha = 255 * (1 - self.age / self.lifetime)
-        if alpha > 0:
+        if alpha > 0 and glow:
             # Draw glow effect
             glow_size = self.size + 4
             glow_surface = pygame.Surface((glow_size * 2, glow_size * 2))
@@ -121,10 +372,11 @@ class Particle:
             glow_alpha = int(alpha // 3)
             pygame.draw.circle(glow_surface, self.color, (glow_size, glow_size), glow_size)
             glow_surface.set_alpha(glow_alpha)
-            screen.blit(glow_surface, (int(self.x) - glow_size, int(self.y) - glow_size))
+            screen.blit(glow_surface, (x - glow_size, y - glow_size))
 
+        if alpha > 0:
             # Draw particle
-            pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), self.size)
+            pygame.draw.circle(screen, self.color, (x, y), self.size)
 
     def is_dead(self):
         return self.age >= self.lifetime
@@ -136,6 +388,7 @@ class GlitchEffect:
         self.active = False
         self.duration = 0
         self.max_duration = 20
+        self.intensity = 1.0  # scales how often the glitch fires
 
     def trigger(self):
         self.active = True
@@ -149,24 +402,28 @@ class GlitchEffect:
                 self.duration = 0
 
     def apply(self, screen):
-        if self.active and random.random() < 0.3:
+        if self.active and random.random() < 0.3 * self.intensity:
             # Random horizontal shift
             offset = random.randint(-10, 10)
             y = random.randint(0, HEIGHT - 50)
             height = random.randint(5, 30)
 
-            # Create a copy of the strip and shift it
-            strip = screen.subsurface((0, y, WIDTH, min(height, HEIGHT - y))).copy()
-            screen.blit(strip, (offset, y))
+            # Shift the strip's pixel rows in place
+            shift_rows(screen, y, height, offset)
 
 
 class TicTacToe:
     """Main game class"""
-    def __init__(self):
-        self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    def __init__(self, seed=None, network=None, quality="auto", record=None, replay=None):
+        self.display = pygame.display.set_mode((WIDTH, HEIGHT))
         pygame.display.set_caption("[ NERD-TAC-TOE v2.0 ] - CYBERPUNK EDITION")
+        # The scene is drawn to the compositor's offscreen canvas; glitch and
+        # screen shake are applied when it is presented
+        self.compositor = Compositor(self.display, BG_COLOR)
+        self.screen = self.compositor.canvas
         self.clock = pygame.time.Clock()
         self.board = [['' for _ in range(GRID_SIZE)] for _ in range(GRID_SIZE)]
+        self.core = Board(GRID_SIZE, WIN_LENGTH)  # rules engine behind self.board
         self.current_player = 'X'
         self.game_over = False
         self.winner = None
@@ -177,18 +434,100 @@ class TicTacToe:
         self.particles = []
         self.scores = {'X': 0, 'O': 0, 'Draw': 0}
         self.winning_line_animation = 0
+        self.ai = make_ai()
+        self.ai_service = AIService(self.ai)  # searches off the render thread
+        self.think_frames = FrameWatch()
+        self.ai_player = None  # mark the computer plays, or None for two players
+        self.network = network  # NetworkClient when playing on a server
+        self.network_mark = None  # our mark in the network match, once it starts
+        if network:
+            network.join(GRID_SIZE, WIN_LENGTH)
+
+        # Everything random in the simulation comes from the seed, so a
+        # recording of the inputs replays to the same state. Purely visual
+        # randomness (title glitch, shake offsets) stays on the random module.
+        if seed is None and record:
+            seed = random.SystemRandom().getrandbits(63)
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.ticks = 0
+        self.replay = replay  # Replay feeding recorded input instead of the event queue
+        self.recorder = None
+        if record:
+            self.recorder = Recorder(record, seed, TICK_RATE, {"game": "tictactoe", "quality": quality})
 
         # New nerdy effects
-        self.binary_digits = [BinaryDigit() for _ in range(30)]
+        self.binary_rain = BinaryRain(BINARY_DIGITS, seed)
+        self.scanline_overlay = None  # built by apply_quality
+        self.game_over_overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
         self.glitch = GlitchEffect()
+        self.compositor.add_effect(self.glitch.apply)
         self.grid_pulse = 0
         self.screen_shake = 0
+        self.shaking = False  # screen shake ran this tick
         self.title_glitch_timer = 0
         self.scanline_offset = 0
 
+        # "auto" starts at the top tier and steps down if frames run long;
+        # naming a tier pins it. The governor applies the first tier now.
+        names = [tier["name"] for tier in QUALITY_TIERS]
+        self.governor = QualityGovernor(QUALITY_TIERS, FPS, "tictactoe",
+                                        tier=None if quality == "auto" else names.index(quality),
+                                        apply=self.apply_quality,
+                                        adaptive=quality == "auto" and not replay)
+        # Bake the starting tier's sprites up front; after a tier change the
+        # draw methods bake the new tier's sprites lazily as they need them
+        self.warm_up_glow_cache()
+
+        # Game speed follows TICK_RATE, not the frame rate;
+        # loop.simulate(ticks) runs the game with no drawing. On a still
+        # screen the loop sleeps until input arrives.
+        self.woken_by = None  # event that ended an idle wait, handled first
+        self.loop = GameLoop(self.update, self.render, TICK_RATE, pace=self.pace,
+                             idle=self.is_idle, wait=self.wait_for_input)
+
+    def apply_quality(self, settings):
+        """Switch the effects to a quality tier's settings"""
+        self.quality = settings
+        self.binary_rain.resize(settings["binary_digits"])
+        self.scanline_overlay = build_scanline_overlay(settings["scanline_spacing"])
+        self.scanline_offset = 0
+        self.glitch.intensity = settings["glitch"]
+        if self.recorder:
+            self.recorder.note(self.ticks, QUALITY, QUALITY_TIERS.index(settings))
+
+    def warm_up_glow_cache(self):
+        """Pre-render every glow sprite a normal game will ask for"""
+        glow = self.quality["glow"]
+        scales = {SCALE_STEPS}
+        t = 0.0
+        while True:
+            t = min(1.0, t + 0.12)
+            scales.add(round(bounce_scale(t) * SCALE_STEPS))
+            if t >= 1.0:
+                break
+        for step in scales:
+            GLOW_CACHE.get(('x', step, X_COLOR, glow), build_x_sprite, step / SCALE_STEPS, X_COLOR, glow)
+            GLOW_CACHE.get(('o', step, O_COLOR, glow), build_o_sprite, step / SCALE_STEPS, O_COLOR, glow)
+
+        for pulse in range(-20, 21):
+            color = pulse_color(GRID_COLOR, pulse)
+            GLOW_CACHE.get(('vline', 0, color, glow), build_grid_line_sprite, True, color, glow)
+            GLOW_CACHE.get(('hline', 0, color, glow), build_grid_line_sprite, False, color, glow)
+        GLOW_CACHE.get(('hover', 0, O_COLOR), build_hover_sprite)
+        GLOW_CACHE.get(('button', 0, O_COLOR), build_hover_sprite, (250, 60))
+        # Large boards have too many possible lines; those are baked on demand
+        lines = all_winning_lines()
+        if len(lines) <= 32:
+            for line in lines:
+                GLOW_CACHE.get(('win', line, WIN_LINE_COLOR, glow), build_winning_line_sprite,
+                               line, WIN_LINE_COLOR, glow)
+
     def reset_board(self):
         """Reset the game board"""
         self.board = [['' for _ in range(GRID_SIZE)] for _ in range(GRID_SIZE)]
+        self.core.reset()
+        self.ai_service.cancel()
         self.current_player = 'X'
         self.game_over = False
         self.winner = None
@@ -198,6 +537,7 @@ class TicTacToe:
         self.particles = []
         self.winning_line_animation = 0
         self.screen_shake = 0
+        self.shaking = False
         self.glitch.active = False
 
     def get_cell_from_mouse(self, pos):
@@ -214,13 +554,14 @@ class TicTacToe:
         """Make a move on the board"""
         if self.board[row][col] == '' and not self.game_over:
             self.board[row][col] = self.current_player
+            self.core.play(row, col)
             self.marks_animation[(row, col)] = 0  # Start animation for this mark
 
             # Spawn sparkle particles
             center_x = GRID_OFFSET_X + col * CELL_SIZE + CELL_SIZE // 2
             center_y = GRID_OFFSET_Y + row * CELL_SIZE + CELL_SIZE // 2
-            for _ in range(10):
-                self.particles.append(Particle(center_x, center_y, 'sparkle'))
+            for _ in range(self.quality["particles"] // 10):
+                self.particles.append(Particle(center_x, center_y, 'sparkle', self.rng))
 
             # Check for winner
             if self.check_winner():
@@ -239,58 +580,35 @@ class TicTacToe:
                 self.current_player = 'O' if self.current_player == 'X' else 'X'
 
     def check_winner(self):
-        """Check if there's a winner"""
-        # Check rows
-        for row in range(GRID_SIZE):
-            if (self.board[row][0] == self.board[row][1] == self.board[row][2] != ''):
-                self.winning_line = ('row', row)
-                return True
-
-        # Check columns
-        for col in range(GRID_SIZE):
-            if (self.board[0][col] == self.board[1][col] == self.board[2][col] != ''):
-                self.winning_line = ('col', col)
-                return True
-
-        # Check diagonals
-        if (self.board[0][0] == self.board[1][1] == self.board[2][2] != ''):
-            self.winning_line = ('diag', 0)
-            return True
-        if (self.board[0][2] == self.board[1][1] == self.board[2][0] != ''):
-            self.winning_line = ('diag', 1)
+        """Check if the last move won; only lines through it are examined"""
+        if self.core.winner is not None:
+            self.winning_line = self.core.winning_line
             return True
-
         return False
 
     def is_board_full(self):
         """Check if board is full"""
-        return all(self.board[row][col] != '' for row in range(GRID_SIZE) for col in range(GRID_SIZE))
+        return self.core.is_full()
 
     def spawn_celebration_particles(self):
         """Create celebration particles"""
-        center_x = GRID_OFFSET_X + CELL_SIZE * 1.5
-        center_y = GRID_OFFSET_Y + CELL_SIZE * 1.5
-        for _ in range(100):
-            self.particles.append(Particle(center_x, center_y, 'explosion'))
+        center_x = GRID_OFFSET_X + CELL_SIZE * GRID_SIZE / 2
+        center_y = GRID_OFFSET_Y + CELL_SIZE * GRID_SIZE / 2
+        for _ in range(self.quality["particles"]):
+            self.particles.append(Particle(center_x, center_y, 'explosion', self.rng))
 
-    def draw_background_effects(self):
+    def draw_background_effects(self, blend=1.0):
         """Draw nerdy background effects"""
         # Binary rain
-        for digit in self.binary_digits:
-            digit.update()
-            digit.draw(self.screen)
+        self.binary_rain.draw(self.screen, blend)
 
         # Scanlines
-        self.scanline_offset = (self.scanline_offset + 1) % 4
-        for y in range(0, HEIGHT, 4):
-            scanline = pygame.Surface((WIDTH, 2), pygame.SRCALPHA)
-            scanline.fill(SCANLINE_COLOR)
-            self.screen.blit(scanline, (0, y + self.scanline_offset))
+        if self.scanline_overlay is not None:
+            self.screen.blit(self.scanline_overlay, (0, self.scanline_offset))
 
     def draw_grid(self):
         """Draw the game grid with pulse effect"""
         # Pulse animation
-        self.grid_pulse = (self.grid_pulse + 0.05) % (2 * math.pi)
         pulse = int(20 * math.sin(self.grid_pulse))
 
         # Draw cells with hover effect
@@ -302,46 +620,27 @@ class TicTacToe:
                 # Hover effect with glow
                 if self.hover_cell == (row, col) and self.board[row][col] == '' and not self.game_over:
                     # Outer glow
-                    glow_surface = pygame.Surface((CELL_SIZE, CELL_SIZE))
-                    glow_surface.fill(O_COLOR)
-                    glow_surface.set_alpha(30)
+                    glow_surface, _ = GLOW_CACHE.get(('hover', 0, O_COLOR), build_hover_sprite)
                     self.screen.blit(glow_surface, (x, y))
                     # Inner highlight
                     pygame.draw.rect(self.screen, HOVER_COLOR, (x, y, CELL_SIZE, CELL_SIZE))
 
-        # Draw grid lines with glow
-        grid_color_pulsed = [
-            int(min(255, max(0, GRID_COLOR[0] + pulse))),
-            int(min(255, max(0, GRID_COLOR[1] + pulse))),
-            int(min(255, max(0, GRID_COLOR[2] + pulse)))
-        ]
+        # Draw grid lines with glow (one cached sprite per line and pulse color)
+        grid_color_pulsed = pulse_color(GRID_COLOR, pulse)
+        glow = self.quality["glow"]
+        vline, (dx, dy) = GLOW_CACHE.get(('vline', 0, grid_color_pulsed, glow),
+                                         build_grid_line_sprite, True, grid_color_pulsed, glow)
+        hline, (hx, hy) = GLOW_CACHE.get(('hline', 0, grid_color_pulsed, glow),
+                                         build_grid_line_sprite, False, grid_color_pulsed, glow)
 
         for i in range(GRID_SIZE + 1):
             # Vertical lines
             x = GRID_OFFSET_X + i * CELL_SIZE
-            # Glow effect
-            for offset in range(3):
-                alpha = 100 - offset * 30
-                glow_surface = pygame.Surface((LINE_WIDTH + offset * 2, CELL_SIZE * GRID_SIZE))
-                glow_surface.fill(grid_color_pulsed)
-                glow_surface.set_alpha(alpha)
-                self.screen.blit(glow_surface, (x - offset + LINE_WIDTH // 2, GRID_OFFSET_Y))
-            # Main line
-            pygame.draw.line(self.screen, grid_color_pulsed, (x, GRID_OFFSET_Y),
-                           (x, GRID_OFFSET_Y + CELL_SIZE * GRID_SIZE), LINE_WIDTH)
+            self.screen.blit(vline, (x + dx, GRID_OFFSET_Y + dy))
 
             # Horizontal lines
             y = GRID_OFFSET_Y + i * CELL_SIZE
-            # Glow effect
-            for offset in range(3):
-                alpha = 100 - offset * 30
-                glow_surface = pygame.Surface((CELL_SIZE * GRID_SIZE, LINE_WIDTH + offset * 2))
-                glow_surface.fill(grid_color_pulsed)
-                glow_surface.set_alpha(alpha)
-                self.screen.blit(glow_surface, (GRID_OFFSET_X, y - offset + LINE_WIDTH // 2))
-            # Main line
-            pygame.draw.line(self.screen, grid_color_pulsed, (GRID_OFFSET_X, y),
-                           (GRID_OFFSET_X + CELL_SIZE * GRID_SIZE, y), LINE_WIDTH)
+            self.screen.blit(hline, (GRID_OFFSET_X + hx, y + hy))
 
     def draw_marks(self):
         """Draw X's and O's with animation and glow"""
@@ -354,10 +653,8 @@ class TicTacToe:
 
                     # Animate new marks with bounce
                     if (row, col) in self.marks_animation:
-                        t = min(1.0, self.marks_animation[(row, col)] + 0.12)
-                        self.marks_animation[(row, col)] = t
                         # Elastic bounce effect
-                        scale = t if t < 0.5 else 1.0 - 0.2 * math.sin((t - 0.5) * 10)
+                        scale = bounce_scale(self.marks_animation[(row, col)])
                     else:
                         scale = 1.0
 
@@ -368,156 +665,100 @@ class TicTacToe:
 
     def draw_x(self, x, y, scale=1.0):
         """Draw an X with neon glow effect"""
-        size = MARK_SIZE * scale
-        color = X_COLOR
-        width = 8
-
-        # Glow layers
-        for glow_level in range(3):
-            glow_width = width + glow_level * 4
-            glow_alpha = 80 - glow_level * 25
-            glow_surface = pygame.Surface((int(size * 2 + 40), int(size * 2 + 40)))
-            glow_surface.fill((0, 0, 0))
-            glow_surface.set_colorkey((0, 0, 0))
-            offset = int(size + 20)
-            pygame.draw.line(glow_surface, color,
-                           (offset - size, offset - size), (offset + size, offset + size), glow_width)
-            pygame.draw.line(glow_surface, color,
-                           (offset + size, offset - size), (offset - size, offset + size), glow_width)
-            glow_surface.set_alpha(glow_alpha)
-            self.screen.blit(glow_surface, (int(x - size - 20), int(y - size - 20)))
-
-        # Main X
-        pygame.draw.line(self.screen, color, (x - size, y - size), (x + size, y + size), width)
-        pygame.draw.line(self.screen, color, (x + size, y - size), (x - size, y + size), width)
+        step = round(scale * SCALE_STEPS)
+        glow = self.quality["glow"]
+        sprite, (dx, dy) = GLOW_CACHE.get(('x', step, X_COLOR, glow), build_x_sprite,
+                                          step / SCALE_STEPS, X_COLOR, glow)
+        self.screen.blit(sprite, (int(x) + dx, int(y) + dy))
 
     def draw_o(self, x, y, scale=1.0):
         """Draw an O with neon glow effect"""
-        radius = int(MARK_SIZE * scale)
-        color = O_COLOR
-        width = 8
-
-        # Glow layers
-        for glow_level in range(3):
-            glow_width = width + glow_level * 4
-            glow_alpha = 80 - glow_level * 25
-            glow_surface = pygame.Surface((radius * 2 + 40, radius * 2 + 40))
-            glow_surface.fill((0, 0, 0))
-            glow_surface.set_colorkey((0, 0, 0))
-            pygame.draw.circle(glow_surface, color,
-                             (radius + 20, radius + 20), radius + glow_level * 2, glow_width)
-            glow_surface.set_alpha(glow_alpha)
-            self.screen.blit(glow_surface, (int(x - radius - 20), int(y - radius - 20)))
-
-        # Main O
-        pygame.draw.circle(self.screen, color, (int(x), int(y)), radius, width)
+        step = round(scale * SCALE_STEPS)
+        glow = self.quality["glow"]
+        sprite, (dx, dy) = GLOW_CACHE.get(('o', step, O_COLOR, glow), build_o_sprite,
+                                          step / SCALE_STEPS, O_COLOR, glow)
+        self.screen.blit(sprite, (int(x) + dx, int(y) + dy))
 
     def draw_winning_line(self):
         """Draw the winning line with animation and glow"""
-        if self.winning_line and self.winning_line_animation < 1.0:
-            self.winning_line_animation = min(1.0, self.winning_line_animation + 0.08)
-
         if self.winning_line:
-            line_type, index = self.winning_line
-            width = 12
-
-            if line_type == 'row':
-                start_x = GRID_OFFSET_X + 20
-                start_y = GRID_OFFSET_Y + index * CELL_SIZE + CELL_SIZE // 2
-                end_x = GRID_OFFSET_X + CELL_SIZE * GRID_SIZE - 20
-                end_y = start_y
-            elif line_type == 'col':
-                start_x = GRID_OFFSET_X + index * CELL_SIZE + CELL_SIZE // 2
-                start_y = GRID_OFFSET_Y + 20
-                end_x = start_x
-                end_y = GRID_OFFSET_Y + CELL_SIZE * GRID_SIZE - 20
-            elif line_type == 'diag':
-                if index == 0:
-                    start_x = GRID_OFFSET_X + 20
-                    start_y = GRID_OFFSET_Y + 20
-                    end_x = GRID_OFFSET_X + CELL_SIZE * GRID_SIZE - 20
-                    end_y = GRID_OFFSET_Y + CELL_SIZE * GRID_SIZE - 20
-                else:
-                    start_x = GRID_OFFSET_X + CELL_SIZE * GRID_SIZE - 20
-                    start_y = GRID_OFFSET_Y + 20
-                    end_x = GRID_OFFSET_X + 20
-                    end_y = GRID_OFFSET_Y + CELL_SIZE * GRID_SIZE - 20
-
-            # Animated line drawing
+            glow = self.quality["glow"]
+            sprite, (left, top) = GLOW_CACHE.get(('win', self.winning_line, WIN_LINE_COLOR, glow),
+                                                 build_winning_line_sprite, self.winning_line,
+                                                 WIN_LINE_COLOR, glow)
+            (start_x, start_y), (end_x, end_y) = winning_line_endpoints(self.winning_line)
+
+            # Animated line drawing: reveal the cached sprite from the start
+            # point up to the current end point
             current_end_x = start_x + (end_x - start_x) * self.winning_line_animation
             current_end_y = start_y + (end_y - start_y) * self.winning_line_animation
-
-            # Draw glow
-            for glow in range(4):
-                glow_width = width + glow * 6
-                glow_alpha = 100 - glow * 25
-                glow_surface = pygame.Surface((WIDTH, HEIGHT))
-                glow_surface.fill((0, 0, 0))
-                glow_surface.set_colorkey((0, 0, 0))
-                pygame.draw.line(glow_surface, WIN_LINE_COLOR,
-                               (start_x, start_y), (current_end_x, current_end_y), glow_width)
-                glow_surface.set_alpha(glow_alpha)
-                self.screen.blit(glow_surface, (0, 0))
-
-            # Main line
-            pygame.draw.line(self.screen, WIN_LINE_COLOR, (start_x, start_y),
-                           (current_end_x, current_end_y), width)
+            x0, x1 = reveal_span(start_x, current_end_x, end_x, start_y != end_y)
+            y0, y1 = reveal_span(start_y, current_end_y, end_y)
+            reveal = pygame.Rect(int(x0) - left, int(y0) - top, int(x1) - int(x0) + 1, int(y1) - int(y0) + 1)
+            reveal = reveal.clip(sprite.get_rect())
+            self.screen.blit(sprite, (left + reveal.x, top + reveal.y), reveal)
 
     def draw_ui(self):
         """Draw UI elements with glitch effects"""
         # Title with random glitch
-        self.title_glitch_timer += 1
-        if random.random() < 0.02:  # Random glitch
+        if random.random() < 0.02 * self.glitch.intensity:  # Random glitch
             title_text = "[ N3RD-T4C-T03 v2.0 ]"
         else:
             title_text = "[ NERD-TAC-TOE v2.0 ]"
 
-        title = TITLE_FONT.render(title_text, True, TEXT_COLOR)
+        title = TEXT_CACHE.render(TITLE_FONT, title_text, True, TEXT_COLOR)
         title_rect = title.get_rect(center=(WIDTH // 2, 40))
 
         # Glow effect for title
-        glow_title = TITLE_FONT.render(title_text, True, TEXT_COLOR)
-        glow_title.set_alpha(100)
+        glow_title = TEXT_CACHE.render(TITLE_FONT, title_text, True, TEXT_COLOR, 100)
         self.screen.blit(glow_title, (title_rect.x + 2, title_rect.y + 2))
         self.screen.blit(title, title_rect)
 
         # Current player indicator with hex address
-        if not self.game_over:
+        if self.network and not self.network_mark and not self.game_over:
+            waiting = TEXT_CACHE.render(SCORE_FONT, "> AWAITING OPPONENT ...", True, SECONDARY_TEXT)
+            self.screen.blit(waiting, waiting.get_rect(center=(WIDTH // 2, 90)))
+        elif not self.game_over:
             player_text = f"> PLAYER [{self.current_player}] :: 0x{hash(self.current_player) & 0xFFFF:04X}"
             player_color = X_COLOR if self.current_player == 'X' else O_COLOR
-            player_surface = SCORE_FONT.render(player_text, True, player_color)
+            player_surface = TEXT_CACHE.render(SCORE_FONT, player_text, True, player_color)
             player_rect = player_surface.get_rect(center=(WIDTH // 2, 90))
             self.screen.blit(player_surface, player_rect)
 
         # Scores with binary representation
         score_y = HEIGHT - 60
-        x_score = SCORE_FONT.render(f"[X]: {self.scores['X']:03d}", True, X_COLOR)
-        o_score = SCORE_FONT.render(f"[O]: {self.scores['O']:03d}", True, O_COLOR)
-        draw_score = SCORE_FONT.render(f"[DRAW]: {self.scores['Draw']:03d}", True, SECONDARY_TEXT)
+        x_score = TEXT_CACHE.render(SCORE_FONT, f"[X]: {self.scores['X']:03d}", True, X_COLOR)
+        o_score = TEXT_CACHE.render(SCORE_FONT, f"[O]: {self.scores['O']:03d}", True, O_COLOR)
+        draw_score = TEXT_CACHE.render(SCORE_FONT, f"[DRAW]: {self.scores['Draw']:03d}", True, SECONDARY_TEXT)
 
         self.screen.blit(x_score, (40, score_y))
         self.screen.blit(o_score, (240, score_y))
         self.screen.blit(draw_score, (420, score_y))
 
         # Keyboard hints
-        hint1 = HINT_FONT.render("[SPACE] = RESTART", True, SECONDARY_TEXT)
-        hint2 = HINT_FONT.render("[Q] = QUIT", True, SECONDARY_TEXT)
+        hint1 = TEXT_CACHE.render(HINT_FONT, "[SPACE] = RESTART", True, SECONDARY_TEXT)
+        hint2 = TEXT_CACHE.render(HINT_FONT, "[Q] = QUIT", True, SECONDARY_TEXT)
+        ai_state = "ON" if self.ai_player else "OFF"
+        hint3 = TEXT_CACHE.render(HINT_FONT, f"[A] = AI {ai_state}", True, SECONDARY_TEXT)
         self.screen.blit(hint1, (10, HEIGHT - 25))
         self.screen.blit(hint2, (WIDTH - 130, HEIGHT - 25))
+        self.screen.blit(hint3, hint3.get_rect(midtop=(WIDTH // 2, HEIGHT - 25)))
 
     def draw_game_over(self):
         """Draw game over screen with animations"""
         if self.game_over:
             # Pulsing overlay
             pulse = (math.sin(self.animation_progress) + 1) / 2
-            overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-            overlay.fill((*BG_COLOR, int(200 + pulse * 50)))
-            self.screen.blit(overlay, (0, 0))
+            self.game_over_overlay.fill((*BG_COLOR, int(200 + pulse * 50)))
+            self.screen.blit(self.game_over_overlay, (0, 0))
 
             # Winner text with glitch
             if self.winner == 'Draw':
                 text = ">>> SYSTEM DEADLOCK <<<"
                 color = SECONDARY_TEXT
+            elif self.winner == 'Disconnected':
+                text = ">>> CONNECTION LOST <<<"
+                color = SECONDARY_TEXT
             else:
                 text = f">>> PLAYER [{self.winner}] WINS <<<"
                 color = X_COLOR if self.winner == 'X' else O_COLOR
@@ -525,14 +766,13 @@ class TicTacToe:
             # Animated typing effect
             self.animation_progress += 0.1
 
-            winner_surface = WINNER_FONT.render(text, True, color)
+            winner_surface = TEXT_CACHE.render(WINNER_FONT, text, True, color)
             winner_rect = winner_surface.get_rect(center=(WIDTH // 2, HEIGHT // 2 - 50))
 
             # Glow
             for i in range(3):
                 glow_alpha = 50 - i * 15
-                glow = WINNER_FONT.render(text, True, color)
-                glow.set_alpha(glow_alpha)
+                glow = TEXT_CACHE.render(WINNER_FONT, text, True, color, glow_alpha)
                 self.screen.blit(glow, (winner_rect.x + i, winner_rect.y + i))
 
             self.screen.blit(winner_surface, winner_rect)
@@ -544,15 +784,13 @@ class TicTacToe:
 
             # Button glow on hover
             if button_rect.collidepoint(mouse_pos):
-                glow_surf = pygame.Surface((250, 60))
-                glow_surf.fill(O_COLOR)
-                glow_surf.set_alpha(30)
+                glow_surf, _ = GLOW_CACHE.get(('button', 0, O_COLOR), build_hover_sprite, (250, 60))
                 self.screen.blit(glow_surf, (WIDTH // 2 - 125, HEIGHT // 2 + 15))
 
             pygame.draw.rect(self.screen, button_color, button_rect, border_radius=10)
             pygame.draw.rect(self.screen, TEXT_COLOR, button_rect, 2, border_radius=10)
 
-            button_text = BUTTON_FONT.render("[ RESTART ]", True, TEXT_COLOR)
+            button_text = TEXT_CACHE.render(BUTTON_FONT, "[ RESTART ]", True, TEXT_COLOR)
             button_text_rect = button_text.get_rect(center=button_rect.center)
             self.screen.blit(button_text, button_text_rect)
 
@@ -560,94 +798,284 @@ class TicTacToe:
         return None
 
     def update_particles(self):
-        """Update and draw particles"""
+        """Move particles one tick and drop the dead ones"""
         for particle in self.particles[:]:
             particle.update()
-            particle.draw(self.screen)
             if particle.is_dead():
                 self.particles.remove(particle)
 
-    def apply_screen_shake(self):
-        """Apply screen shake effect"""
-        if self.screen_shake > 0:
+    def draw_particles(self, blend=1.0):
+        """Draw particles"""
+        glow = self.quality["particle_glow"]
+        for particle in self.particles:
+            particle.draw(self.screen, glow, blend)
+
+    def animate(self):
+        """Advance every animation by one tick"""
+        self.binary_rain.update()
+        if self.scanline_overlay is not None:
+            self.scanline_offset = (self.scanline_offset + 1) % self.quality["scanline_spacing"]
+        self.grid_pulse = (self.grid_pulse + 0.05) % (2 * math.pi)
+        for cell, t in self.marks_animation.items():
+            self.marks_animation[cell] = min(1.0, t + 0.12)
+        if self.winning_line and self.winning_line_animation < 1.0:
+            self.winning_line_animation = min(1.0, self.winning_line_animation + 0.08)
+        self.update_particles()
+        self.title_glitch_timer += 1
+        self.glitch.update()
+        self.shaking = self.screen_shake > 0
+        if self.shaking:
             self.screen_shake -= 1
+
+    def apply_screen_shake(self):
+        """Camera offset for the screen shake"""
+        if self.shaking:
             offset_x = random.randint(-self.screen_shake, self.screen_shake)
             offset_y = random.randint(-self.screen_shake, self.screen_shake)
             return offset_x, offset_y
         return 0, 0
 
-    def run(self):
-        """Main game loop"""
+    def poll_network(self):
+        """Apply what the server sent since the last frame"""
+        if not self.network:
+            return
+        for message in self.network.poll():
+            kind = message[0]
+            if kind == protocol.START:
+                self.reset_board()
+                self.network_mark = PLAYERS[message[2]]
+            elif kind == protocol.MOVED:
+                _, mark, row, col, _ = message
+                if PLAYERS[mark] == self.current_player:
+                    self.make_move(row, col)
+            elif kind == protocol.END:
+                _, result, x, o, draws = message
+                self.scores = {'X': x, 'O': o, 'Draw': draws}
+                if result == protocol.OPPONENT_LEFT:
+                    self.connection_lost()
+        if not self.network.connected and self.winner != 'Disconnected':
+            self.connection_lost()
+
+    def connection_lost(self):
+        """End the network match; the next restart is a local game"""
+        self.network.close()
+        self.network_mark = None
+        self.game_over = True
+        self.winner = 'Disconnected'
+
+    def restart(self):
+        """SPACE or the restart button: a rematch on the server, else a new local game"""
+        if self.network and self.network.connected:
+            if self.game_over:
+                self.network.send_rematch()
+            return
+        self.network = None
+        self.reset_board()
+
+    def play_ai_move(self):
+        """Start the computer's search on its turn and play the move once it is ready"""
+        if self.game_over or self.network or self.current_player != self.ai_player:
+            return
+        if self.replay:
+            # Search time varies from run to run; replay the recorded moves
+            for row, col, _ in self.replay.notes(self.ticks, AI):
+                self.make_move(row, col)
+            return
+        move = self.ai_service.poll()
+        if move is not None:
+            if self.recorder:
+                self.recorder.note(self.ticks, AI, *move)
+            self.make_move(*move)
+        elif not self.ai_service.thinking:
+            self.ai_service.request(self.core, AI_TIME_BUDGET)
+
+    def draw_scene(self, blend=1.0):
+        """Draw one frame of the scene to the offscreen canvas"""
+        self.screen.fill(BG_COLOR)
+
+        # Background effects
+        self.draw_background_effects(blend)
+
+        # Main game
+        self.draw_grid()
+        self.draw_marks()
+        self.draw_winning_line()
+        self.draw_particles(blend)
+        self.draw_ui()
+        self.draw_game_over()
+
+    def handle_events(self):
+        """Handle queued input; returns False when the player quits"""
         running = True
+        for event in self.input_events():
+            if event.type == pygame.QUIT:
+                running = False
 
-        while running:
-            self.clock.tick(FPS)
-
-            # Event handling
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_q:
+                    # Q to quit
                     running = False
+                elif event.key == pygame.K_SPACE:
+                    # SPACE to restart
+                    self.restart()
+                elif event.key == pygame.K_a and not self.network:
+                    # A to toggle the computer opponent
+                    self.ai_player = None if self.ai_player else 'O'
+                    self.ai_service.cancel()
+
+            elif event.type == pygame.MOUSEMOTION:
+                self.hover_cell = self.get_cell_from_mouse(event.pos)
+
+            elif event.type == pygame.MOUSEBUTTONDOWN:
+                if self.game_over:
+                    # Check if play again button was clicked
+                    button_rect = pygame.Rect(WIDTH // 2 - 120, HEIGHT // 2 + 20, 240, 50)
+                    if button_rect.collidepoint(event.pos):
+                        self.restart()
+                else:
+                    cell = self.get_cell_from_mouse(event.pos)
+                    if cell and self.network:
+                        # The server echoes accepted moves back as MOVED
+                        row, col = cell
+                        if self.current_player == self.network_mark and self.board[row][col] == '':
+                            self.network.send_move(row, col)
+                    elif cell and self.current_player != self.ai_player:
+                        row, col = cell
+                        self.make_move(row, col)
+        return running
+
+    def input_events(self):
+        """This tick's input: from the replay, or the event queue (recorded if recording)"""
+        if self.replay:
+            return self.replay.events(self.ticks)
+        events = pygame.event.get()
+        if self.woken_by:
+            events.insert(0, self.woken_by)
+            self.woken_by = None
+        if self.recorder:
+            self.recorder.events(self.ticks, events)
+        return events
 
-                elif event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_q:
-                        # Q to quit
-                        running = False
-                    elif event.key == pygame.K_SPACE:
-                        # SPACE to restart
-                        self.reset_board()
-
-                elif event.type == pygame.MOUSEMOTION:
-                    self.hover_cell = self.get_cell_from_mouse(event.pos)
-
-                elif event.type == pygame.MOUSEBUTTONDOWN:
-                    if self.game_over:
-                        # Check if play again button was clicked
-                        button_rect = pygame.Rect(WIDTH // 2 - 120, HEIGHT // 2 + 20, 240, 50)
-                        if button_rect.collidepoint(event.pos):
-                            self.reset_board()
-                    else:
-                        cell = self.get_cell_from_mouse(event.pos)
-                        if cell:
-                            row, col = cell
-                            self.make_move(row, col)
-
-            # Drawing
-            self.screen.fill(BG_COLOR)
-
-            # Background effects
-            self.draw_background_effects()
-
-            # Main game
-            self.draw_grid()
-            self.draw_marks()
-            self.draw_winning_line()
-            self.update_particles()
-            self.draw_ui()
-
-            play_again_button = self.draw_game_over()
-
-            # Apply glitch effect
-            self.glitch.update()
-            self.glitch.apply(self.screen)
-
-            # Screen shake
-            shake_x, shake_y = self.apply_screen_shake()
-            if shake_x != 0 or shake_y != 0:
-                # Create a copy and shift it
-                temp_surf = self.screen.copy()
-                self.screen.fill(BG_COLOR)
-                self.screen.blit(temp_surf, (shake_x, shake_y))
-
-            pygame.display.flip()
-
+    def update(self):
+        """Run one simulation tick: input, network, computer move, animations"""
+        if self.replay:
+            for tier, _, _ in self.replay.notes(self.ticks, QUALITY):
+                self.apply_quality(QUALITY_TIERS[tier])
+        running = self.handle_events()
+        self.poll_network()
+        self.play_ai_move()
+        self.animate()
+        self.ticks += 1
+        return running
+
+    def state_digest(self):
+        """Hash of the whole simulation state; equal after a faithful replay"""
+        rain = self.binary_rain
+        particles = [(p.x, p.y, p.vx, p.vy, p.age, p.lifetime, p.color, p.size) for p in self.particles]
+        return digest(
+            self.ticks, self.board, self.scores, self.current_player, self.game_over, self.winner,
+            self.winning_line, self.hover_cell, self.marks_animation, self.winning_line_animation,
+            self.ai_player, self.grid_pulse, self.scanline_offset, self.screen_shake, self.shaking,
+            self.title_glitch_timer, self.glitch.active, self.glitch.duration, self.quality["name"],
+            particles, self.rng.getstate(), rain.x.tobytes(), rain.y.tobytes(), rain.speed.tobytes(),
+            rain.glyph.tobytes(), rain.rng.bit_generator.state,
+        )
+
+    def render(self, blend=1.0):
+        """Draw and present the scene, blend of a tick past the last update"""
+        self.think_frames.tick(self.ai_service.thinking)
+        self.draw_scene(blend)
+
+        # Glitch runs as a post effect; screen shake is a camera offset
+        self.compositor.present(self.apply_screen_shake())
+
+    def step(self):
+        """Run one tick and draw it"""
+        running = self.update()
+        self.render()
+        return running
+
+    def is_idle(self):
+        """True when only the ambient effects are moving
+
+        Nothing the player is waiting on may be in flight: mark and line
+        animations, particles, shake, glitch, a computer move or a network
+        match. Binary rain, grid pulse and scanlines pause while idle.
+        """
+        return (not self.particles and not self.glitch.active and not self.shaking
+                and not self.screen_shake and not self.network
+                and all(t >= 1.0 for t in self.marks_animation.values())
+                and (not self.winning_line or self.winning_line_animation >= 1.0)
+                and not self.ai_service.thinking
+                and (self.game_over or self.current_player != self.ai_player))
+
+    def wait_for_input(self, timeout_ms):
+        """Block until an event arrives or timeout_ms passes; True for an event"""
+        event = pygame.event.wait(timeout_ms)
+        # Restart the frame clock so the sleep is not counted as frame work
+        self.clock.tick()
+        if event.type == pygame.NOEVENT:
+            return False
+        self.woken_by = event
+        return True
+
+    def pace(self):
+        """Cap the frame rate and feed the quality governor"""
+        self.clock.tick(FPS)
+        self.governor.update(self.clock.get_rawtime())
+
+    def run(self, stats=False):
+        """Main game loop; stats prints the session's diagnostics to stderr"""
+        self.loop.run()
+
+        self.ai_service.close()
+        if self.recorder:
+            self.recorder.close(self.ticks, self.state_digest())
+        if stats:
+            if self.think_frames.frames:
+                print(self.think_frames, file=sys.stderr)
+            print(self.governor.summary(), file=sys.stderr)
+            print(f"loop: {self.loop}", file=sys.stderr)
+            if self.recorder:
+                print(f"recorded {self.recorder.records} records over {self.ticks} ticks, seed {self.seed}",
+                      file=sys.stderr)
         pygame.quit()
         sys.exit()
 
 
 def main():
     """Main entry point"""
-    game = TicTacToe()
-    game.run()
+    parser = argparse.ArgumentParser(description="Cyberpunk Tic Tac Toe")
+    parser.add_argument("--connect", metavar="HOST:PORT", help="play a match on a server.py server")
+    parser.add_argument("--quality", default="auto",
+                        choices=["auto"] + [tier["name"] for tier in QUALITY_TIERS],
+                        help="effects tier; auto adapts to the frame rate")
+    parser.add_argument("--seed", type=int, help="seed for the effects (random if omitted)")
+    parser.add_argument("--record", metavar="PATH", help="record the session for common/replay.py")
+    parser.add_argument("--stats", action="store_true",
+                        help="print frame, quality and loop diagnostics to stderr on exit")
+    profiler.add_arguments(parser)
+    args = parser.parse_args()
+    if args.record and args.connect:
+        parser.error("network matches cannot be recorded")
+
+    network = None
+    if args.connect:
+        host, _, port = args.connect.rpartition(":")
+        try:
+            network = NetworkClient(host or "127.0.0.1", int(port))
+        except (OSError, ValueError) as exc:
+            # An unreachable server, or a missing or non-numeric port
+            parser.error(f"cannot connect to {args.connect}: {exc}")
+    # Instrument the classes before the game binds their methods
+    frame_profiler = profiler.from_args(args, TicTacToe, Compositor, GameLoop)
+    game = TicTacToe(seed=args.seed, network=network, quality=args.quality, record=args.record)
+    if frame_profiler:
+        frame_profiler.attach(game.compositor)
+    try:
+        game.run(stats=args.stats)
+    finally:
+        profiler.finish(frame_profiler, args)
 
 
 if __name__ == "__main__":